@@ -3,37 +3,130 @@
 
 import sys
 import os
+import json
+import atexit
+import queue
+import threading
 from pathlib import Path
-import hashlib
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+
+from tqdm import tqdm
 
 sys.path.append('src')
-from ocr import OCRProcessor
+from ocr import OCRProcessor, OCRQueue, HASH_ALGO, compute_file_hash
 from cli import ReceiptProcessor
 
-def get_file_hash(file_path: Path) -> str:
-    """Generate hash for file to detect duplicates."""
-    with open(file_path, 'rb') as f:
-        return hashlib.md5(f.read()).hexdigest()
+SOURCE_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg'}
+PREVIEW_COUNT = 10
+HASH_WORKERS = int(os.environ.get('HASH_WORKERS', os.cpu_count() or 4))
+HASH_INDEX_PATH = Path(os.environ.get(
+    'HASH_INDEX_PATH', Path.home() / '.cache' / 'receipts-ocr' / 'hash_index.json'
+))
+
+# abs_path -> [st_size, st_mtime_ns, {algo: digest}]; entries go stale
+# automatically when size or mtime change, so unchanged files are never re-read
+# between runs.
+_hash_index = {}
+_hash_index_dirty = False
+
+
+def load_hash_index(index_path: Path = HASH_INDEX_PATH) -> None:
+    """Load the persistent hash index and register it to be saved on exit."""
+    global _hash_index
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            _hash_index = json.load(f)
+    except (OSError, ValueError):
+        _hash_index = {}
+    atexit.register(save_hash_index, index_path)
+
+
+def save_hash_index(index_path: Path = HASH_INDEX_PATH) -> None:
+    """Write the hash index back to disk if any entries were added."""
+    if not _hash_index_dirty:
+        return
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_hash_index, f)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        print(f"⚠️  Could not save hash index: {e}")
+
+
+def get_file_hash(file_path: Path, algo: str = HASH_ALGO, st: os.stat_result = None) -> str:
+    """Generate hash for file to detect duplicates.
+
+    Reads the file in fixed-size chunks so large PDFs are never held in memory,
+    and reuses the cached digest when path, size and mtime are unchanged.
+    Pass `st` when the caller already has the file's stat result.
+    """
+    global _hash_index_dirty
+    key = str(Path(file_path).absolute())
+    if st is None:
+        st = os.stat(file_path)
+    cached = _hash_index.get(key)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        digests = cached[2] if isinstance(cached[2], dict) else {'md5': cached[2]}
+        if algo in digests:
+            return digests[algo]
+    else:
+        digests = {}
+
+    digest = compute_file_hash(file_path, algo)
+
+    digests[algo] = digest
+    _hash_index[key] = [st.st_size, st.st_mtime_ns, digests]
+    _hash_index_dirty = True
+    return digest
+
+def iter_source_files(root):
+    """Yield a DirEntry for every receipt file under root in a single recursive walk.
+
+    Extensions are matched case-insensitively, replacing the separate
+    *.pdf / *.PDF / ... rglob passes. DirEntry caches its stat result, so
+    callers get size/mtime/inode without another lookup by path.
+    """
+    pending = [root]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.rsplit('.', 1)[-1].lower() in SOURCE_EXTENSIONS and entry.is_file():
+                        yield entry
+        except OSError as e:
+            print(f"⚠️  Could not read directory: {e}")
 
 def find_missing_ocr_files(source_dirs, ocr_dir):
-    """Find PDF/image files that haven't been OCR'd yet."""
+    """Find PDF/image files that haven't been OCR'd yet.
+
+    Yields (file_path, content hash) pairs as they are found, so the OCR stage
+    can name its JSON output without reading and hashing the file again.
+    """
     # Get all existing OCR JSON files
     ocr_dir = Path(ocr_dir)
     existing_hashes = set()
     
-    for json_file in ocr_dir.glob('*.json'):
-        # Extract hash from filename (format: filename_hash.json)
-        parts = json_file.stem.split('_')
-        if parts:
-            hash_part = parts[-1]
-            if len(hash_part) == 32:  # MD5 hash length
-                existing_hashes.add(hash_part)
+    if ocr_dir.is_dir():
+        with os.scandir(ocr_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith('.json'):
+                    continue
+                # Extract hash from filename (format: filename_hash.json)
+                hash_part = name[name.rfind('_') + 1:-5]
+                if len(hash_part) == 32:  # MD5 hash length
+                    existing_hashes.add(hash_part)
     
     print(f"Found {len(existing_hashes)} existing OCR JSON files")
     
     # Find all PDF and image files in source directories
-    missing_files = []
-    patterns = ['*.pdf', '*.PDF', '*.png', '*.PNG', '*.jpg', '*.JPG', '*.jpeg', '*.JPEG']
+    candidates = []
     
     for source_dir in source_dirs:
         source_path = Path(source_dir)
@@ -41,16 +134,141 @@ def find_missing_ocr_files(source_dirs, ocr_dir):
             print(f"⚠️  Source directory not found: {source_dir}")
             continue
             
-        for pattern in patterns:
-            # Search in directory and all subdirectories
-            for file_path in source_path.rglob(pattern):
-                file_hash = get_file_hash(file_path)
-                if file_hash not in existing_hashes:
-                    missing_files.append(file_path)
+        # Single walk over the directory and all subdirectories
+        candidates.extend(iter_source_files(source_path))
+    
+    # The same file can be reached more than once (overlapping source dirs,
+    # hard links) - read and hash each underlying file only once
+    unique_files = {}
+    for entry in candidates:
+        st = entry.stat()
+        unique_files.setdefault((st.st_dev, st.st_ino), (Path(entry.path), st))
+    
+    # Hash in parallel - hashlib releases the GIL, so threads overlap reads and
+    # hashing. Results are consumed lazily in walk order, so a caller that only
+    # needs the first few missing files doesn't wait for the whole scan.
+    executor = ThreadPoolExecutor(max_workers=HASH_WORKERS)
+    queued_hashes = set()
+    duplicates = 0
+    try:
+        hashes = executor.map(lambda item: get_file_hash(item[0], HASH_ALGO, item[1]), unique_files.values())
+        for (file_path, st), file_hash in zip(unique_files.values(), hashes):
+            if file_hash in existing_hashes:
+                continue
+            if HASH_ALGO != 'md5' and get_file_hash(file_path, 'md5', st) in existing_hashes:
+                # Results written before the switch are named by MD5
+                continue
+            
+            # Keep one copy per missing content hash - duplicate copies of a receipt
+            # would otherwise be OCR'd (and later counted) once per copy
+            if file_hash in queued_hashes:
+                duplicates += 1
+                continue
+            queued_hashes.add(file_hash)
+            yield file_path, file_hash
+    finally:
+        # Stop hashing the rest if the caller stopped early
+        executor.shutdown(wait=False, cancel_futures=True)
     
-    return missing_files
+    if duplicates:
+        print(f"Skipping {duplicates} duplicate copies of missing files")
+
+def process_files_pipelined(ocr_processor, files, output_dir, queue_size=8, verbose=False):
+    """OCR files through a render -> OCR -> write pipeline.
+    
+    A producer thread renders PDFs/images into page arrays, the calling thread
+    hands them to an OCRQueue (whose single thread runs YomiToku page by
+    page), and a writer thread waits on each file's result and saves
+    the JSON. Stages are connected by bounded queues; None marks the end of a
+    stream. Progress is shown with a tqdm bar; failures are always reported,
+    per-file successes only when verbose. `files` holds the (file_path,
+    content hash) pairs from find_missing_ocr_files, so files are not hashed
+    a second time.
+    
+    Returns:
+        (processed, failed) counts
+    """
+    render_q = queue.Queue(maxsize=queue_size)
+    write_q = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    counts = {'processed': 0, 'failed': 0}
+    total = len(files)
+    
+    def put(q, item):
+        # Bounded put that gives up once the pipeline is shutting down
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+    
+    def render_stage():
+        for i, (file_path, file_hash) in enumerate(files):
+            if stop.is_set():
+                break
+            try:
+                if file_path.suffix.lower() == '.pdf':
+                    images = ocr_processor.render_pdf(file_path)
+                else:
+                    # Image file
+                    images = [ocr_processor.load_image(file_path)]
+                put(render_q, (i, file_path, file_hash, images, None))
+            except Exception as e:
+                put(render_q, (i, file_path, None, None, e))
+        put(render_q, None)
+    
+    def write_stage():
+        progress = tqdm(total=total, desc="OCR", unit="file")
+        while True:
+            item = write_q.get()
+            if item is None:
+                break
+            i, file_path, file_hash, future, error = item
+            if error is None:
+                try:
+                    ocr_result = ocr_processor.build_result(file_path, file_hash, future.result())
+                    json_path = ocr_processor.get_json_path(file_path, output_dir, file_hash)
+                    ocr_processor.save_result(json_path, ocr_result)
+                except Exception as e:
+                    error = e
+            if error is None:
+                if verbose:
+                    tqdm.write(f"✅ [{i+1}/{total}] {file_path.name} - Confidence: {ocr_result['confidence']:.2f}")
+                counts['processed'] += 1
+            else:
+                tqdm.write(f"❌ [{i+1}/{total}] Failed: {file_path.name}: {error}")
+                counts['failed'] += 1
+            progress.update(1)
+        progress.close()
+    
+    renderer = threading.Thread(target=render_stage, name="ocr-render", daemon=True)
+    writer = threading.Thread(target=write_stage, name="ocr-write", daemon=True)
+    renderer.start()
+    writer.start()
+    
+    try:
+        with OCRQueue(ocr_processor) as ocr_queue:
+            while True:
+                item = render_q.get()
+                if item is None:
+                    break
+                i, file_path, file_hash, images, error = item
+                future = ocr_queue.submit(images) if error is None else None
+                write_q.put((i, file_path, file_hash, future, error))
+    finally:
+        write_q.put(None)
+        writer.join()
+        stop.set()
+        renderer.join(timeout=1)
+    
+    return counts['processed'], counts['failed']
 
 def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--verbose', action='store_true', help='Report every processed file, not just failures')
+    args = arg_parser.parse_args()
+    
     # Configure paths
     source_dirs = [
         "/Users/alejpascual/Downloads/3. March 2025",
@@ -66,26 +284,32 @@ def main():
     print(f"Source directories: {source_dirs}")
     print()
     
-    # Find missing files
-    missing_files = find_missing_ocr_files(source_dirs, ocr_dir)
+    # Find missing files (reusing hashes from previous runs where possible)
+    load_hash_index()
+    missing_iter = find_missing_ocr_files(source_dirs, ocr_dir)
     
-    if not missing_files:
+    # Preview only needs the first few - the scan continues after confirmation
+    preview = list(islice(missing_iter, PREVIEW_COUNT + 1))
+    if not preview:
         print("✅ All files have been OCR'd!")
         return
     
-    print(f"❌ Found {len(missing_files)} files missing OCR:")
-    for i, file_path in enumerate(missing_files[:10]):  # Show first 10
+    print(f"❌ Found files missing OCR:")
+    for i, (file_path, _) in enumerate(preview[:PREVIEW_COUNT]):  # Show first 10
         print(f"  {i+1}. {file_path}")
-    if len(missing_files) > 10:
-        print(f"  ... and {len(missing_files) - 10} more")
+    if len(preview) > PREVIEW_COUNT:
+        print(f"  ... and more (scan continues after confirmation)")
     
     # Ask user if they want to process
     print()
-    response = input(f"Process {len(missing_files)} missing files? [y/N]: ")
+    response = input(f"Process missing files? [y/N]: ")
     if response.lower() != 'y':
+        missing_iter.close()
         print("Cancelled.")
         return
     
+    missing_files = list(chain(preview, missing_iter))
+    
     # Process missing files
     print(f"\n=== Processing {len(missing_files)} Missing Files ===")
     
@@ -94,25 +318,7 @@ def main():
     ocr_output_dir = Path(ocr_dir)
     ocr_output_dir.mkdir(parents=True, exist_ok=True)
     
-    processed = 0
-    failed = 0
-    
-    for i, file_path in enumerate(missing_files):
-        try:
-            print(f"\n[{i+1}/{len(missing_files)}] Processing: {file_path.name}")
-            
-            if file_path.suffix.lower() == '.pdf':
-                ocr_result = ocr_processor.extract_text_from_pdf(file_path, ocr_output_dir)
-            else:
-                # Image file
-                ocr_result = ocr_processor.extract_text_from_image(file_path, ocr_output_dir)
-            
-            print(f"✅ Success - Confidence: {ocr_result['confidence']:.2f}")
-            processed += 1
-            
-        except Exception as e:
-            print(f"❌ Failed: {e}")
-            failed += 1
+    processed, failed = process_files_pipelined(ocr_processor, missing_files, ocr_output_dir, verbose=args.verbose)
     
     print(f"\n{'='*50}")
     print(f"Processing complete!")
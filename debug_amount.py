@@ -3,10 +3,12 @@
 
 import sys
 sys.path.append('.')
-from src.parse import JapaneseReceiptParser
+from src.parse import KeywordMatcher, get_parser
+
+YEN_UTF8 = '¥'.encode('utf-8')
 
 def main():
-    parser = JapaneseReceiptParser()
+    parser = get_parser()
 
     text = """¥0
 ¥6,160
@@ -64,14 +66,18 @@ Itt lis siu.1 1 1 14:
     print()
     print('DEBUG: Lines with amounts...')
 
+    # Check avoid keywords with one precompiled scan per line
+    avoid_matcher = KeywordMatcher(['内消費税', '消費税', '税額', '税金', '内消費費税等'])
+    
     lines = text.split('\n')
+    # '\n' never occurs inside a multi-byte UTF-8 sequence, so byte lines align with str lines
+    has_yen = bytes(YEN_UTF8 in line_b for line_b in text.encode('utf-8').split(b'\n'))
     for i, line in enumerate(lines):
-        if '¥560' in line or '¥6,160' in line or '¥6160' in line or '¥6 160' in line:
+        if has_yen[i] and ('¥560' in line or '¥6,160' in line or '¥6160' in line or '¥6 160' in line):
             print(f'Line {i+1}: "{line.strip()}"')
             
             # Check if this line has avoid keywords
-            avoid_keywords = ['内消費税', '消費税', '税額', '税金', '内消費費税等']
-            has_avoid = any(kw in line for kw in avoid_keywords)
+            has_avoid = avoid_matcher.search(line)
             if has_avoid:
                 print(f'  -> HAS AVOID KEYWORD!')
 
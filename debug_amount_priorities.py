@@ -4,9 +4,25 @@ import sys
 import os
 sys.path.insert(0, '/Users/alejpascual/Coding/Current/receipts-ocr/src')
 
-from parse import JapaneseReceiptParser
+from parse import KeywordMatcher, get_parser
 import logging
 
+def build_keyword_index(parser):
+    """One matcher over avoid + total keywords, plus each keyword's kinds."""
+    kw_kind = {}
+    for kind, keywords in (('avoid', parser.avoid_keywords), ('total', parser.total_keywords)):
+        for kw in keywords:
+            kw_kind.setdefault(kw, set()).add(kind)
+    return KeywordMatcher(kw_kind), kw_kind
+
+def classify_line_keywords(line, kw_matcher, kw_kind, parser):
+    """Scan a line once and split the hits into avoid/total lists (in list order)."""
+    found = kw_matcher.findall(line)
+    return {
+        'avoid': sorted((kw for kw in found if 'avoid' in kw_kind[kw]), key=parser.avoid_keywords.index),
+        'total': sorted((kw for kw in found if 'total' in kw_kind[kw]), key=parser.total_keywords.index),
+    }
+
 def debug_amount_priorities():
     """Debug the exact priority calculation for ¥230 vs ¥250."""
     
@@ -50,9 +66,13 @@ def debug_amount_priorities():
 
     print("=== DETAILED PRIORITY ANALYSIS ===")
     
-    parser = JapaneseReceiptParser()
+    parser = get_parser()
     lines = text.split('\n')
     
+    # Single keyword pass per analysed line
+    kw_matcher, kw_kind = build_keyword_index(parser)
+    line_keywords = {i: classify_line_keywords(lines[i], kw_matcher, kw_kind, parser) for i in (8, 9, 10)}
+    
     # Let's manually trace the key lines
     print("Key lines analysis:")
     print(f"Line 8: '{lines[8]}' - contains お預り金額")
@@ -65,23 +85,23 @@ def debug_amount_priorities():
     print(f"\nAvoid keyword analysis:")
     
     # Line 8 (お預り金額)
-    avoid_found_line8 = [kw for kw in parser.avoid_keywords if kw in lines[8]]
+    avoid_found_line8 = line_keywords[8]['avoid']
     print(f"Line 8 '{lines[8]}' avoid keywords: {avoid_found_line8}")
     
     # Line 9 (¥250)  
-    avoid_found_line9 = [kw for kw in parser.avoid_keywords if kw in lines[9]]
+    avoid_found_line9 = line_keywords[9]['avoid']
     print(f"Line 9 '{lines[9]}' avoid keywords: {avoid_found_line9}")
     
     # Line 10 (合計)
-    avoid_found_line10 = [kw for kw in parser.avoid_keywords if kw in lines[10]]
+    avoid_found_line10 = line_keywords[10]['avoid']
     print(f"Line 10 '{lines[10]}' avoid keywords: {avoid_found_line10}")
     
     # Total keywords
     print(f"\nTotal keyword analysis:")
-    total_found_line8 = [kw for kw in parser.total_keywords if kw in lines[8]]
+    total_found_line8 = line_keywords[8]['total']
     print(f"Line 8 '{lines[8]}' total keywords: {total_found_line8}")
     
-    total_found_line10 = [kw for kw in parser.total_keywords if kw in lines[10]]
+    total_found_line10 = line_keywords[10]['total']
     print(f"Line 10 '{lines[10]}' total keywords: {total_found_line10}")
     
     print(f"\n=== Expected Logic ===")
@@ -2,16 +2,22 @@
 """Debug amount selection for the specific receipts that had wrong amounts."""
 
 import sys
-import json
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
+
 sys.path.append('src')
-from parse import JapaneseReceiptParser
+from parse import get_parser
+
+@lru_cache(maxsize=4096)
+def parse_amount_cached(text):
+    """Parse the amount once per distinct OCR text."""
+    return get_parser().parse_amount(text)
 
 def debug_specific_amount_issues():
     """Debug the specific receipts with known amount selection issues."""
     
-    parser = JapaneseReceiptParser()
     ocr_dir = Path("/Users/alejpascual/Downloads/receipts-output/ocr_json")
     
     problem_cases = [
@@ -53,14 +59,14 @@ def debug_specific_amount_issues():
             print(f"\n📄 Analyzing: {ocr_file.name}")
             
             try:
-                with open(ocr_file, 'r', encoding='utf-8') as f:
-                    ocr_data = json.load(f)
+                ocr_data = orjson.loads(ocr_file.read_bytes())
                 
                 text = ocr_data['full_text']
+                lines = text.split('\n')
                 
                 # Show full OCR text to understand what amounts are available
                 print(f"\n📝 Full OCR text:")
-                for i, line in enumerate(text.split('\n'), 1):
+                for i, line in enumerate(lines, 1):
                     if line.strip():
                         print(f"  {i:2d}: {line.strip()}")
                 
@@ -69,7 +75,7 @@ def debug_specific_amount_issues():
                 import logging
                 logging.getLogger().setLevel(logging.DEBUG)
                 
-                amount = parser.parse_amount(text)
+                amount = parse_amount_cached(text)
                 print(f"Final selected amount: ¥{amount}")
                 
                 # Check if expected amount exists in text
@@ -77,7 +83,7 @@ def debug_specific_amount_issues():
                 if expected_str in text:
                     print(f"✅ Expected amount ¥{case['expected']} IS in the text")
                     # Find which lines contain it
-                    for i, line in enumerate(text.split('\n'), 1):
+                    for i, line in enumerate(lines, 1):
                         if expected_str in line:
                             print(f"    Line {i}: {line.strip()}")
                 else:
@@ -3,15 +3,19 @@
 
 import sys
 sys.path.append('.')
+import re
 import logging
+from bisect import bisect_right
 
 # Enable DEBUG logging to see the internal logic
 logging.basicConfig(level=logging.DEBUG)
 
-from src.parse import JapaneseReceiptParser
+from src.parse import get_parser
+
+YEN_RE = re.compile(r'¥\s?([\d ,]+)')
 
 def main():
-    parser = JapaneseReceiptParser()
+    parser = get_parser()
 
     text = """¥0
 ¥6,160
@@ -65,28 +69,30 @@ Itt lis siu.1 1 1 14:
     # Let me manually step through what the parser should be doing
     lines = text.split('\n')
     
+    # One regex pass over the whole text; map each ¥ match to its line via bisect
+    newline_offsets = [i for i, c in enumerate(text) if c == '\n']
+    yen_line_idxs = {bisect_right(newline_offsets, m.start()) for m in YEN_RE.finditer(text)}
+    
     print(f'Total lines: {len(lines)}')
     print()
     
     # Look for total keywords and what amounts are near them
     for line_idx, line in enumerate(lines):
-        for keyword in parser.total_keywords:
-            if keyword in line:
-                print(f'Found keyword "{keyword}" in line {line_idx+1}: "{line.strip()}"')
-                
-                # Check nearby lines for amounts
-                for offset in [-1, 0, 1]:
-                    check_idx = line_idx + offset
-                    if 0 <= check_idx < len(lines):
-                        check_line = lines[check_idx]
-                        if '¥' in check_line:
-                            print(f'  Near line {check_idx+1} ({offset:+d}): "{check_line.strip()}"')
-                            
-                            # Check for avoid keywords
-                            has_avoid = any(avoid_kw in check_line for avoid_kw in parser.avoid_keywords)
-                            if has_avoid:
-                                print(f'    -> HAS AVOID KEYWORD!')
-                print()
+        for keyword in parser.total_matcher.findall(line):
+            print(f'Found keyword "{keyword}" in line {line_idx+1}: "{line.strip()}"')
+            
+            # Check nearby lines for amounts
+            for offset in [-1, 0, 1]:
+                check_idx = line_idx + offset
+                if 0 <= check_idx < len(lines):
+                    check_line = lines[check_idx]
+                    if check_idx in yen_line_idxs:
+                        print(f'  Near line {check_idx+1} ({offset:+d}): "{check_line.strip()}"')
+                        
+                        # Check for avoid keywords
+                        if parser.avoid_matcher.search(check_line):
+                            print(f'    -> HAS AVOID KEYWORD!')
+            print()
 
     print('Now running the actual parser...')
     amount = parser.parse_amount(text)
@@ -4,7 +4,7 @@ import sys
 import os
 sys.path.insert(0, '/Users/alejpascual/Coding/Current/receipts-ocr/src')
 
-from parse import JapaneseReceiptParser
+from parse import get_parser
 import logging
 
 # Enable debug logging
@@ -55,7 +55,7 @@ def debug_detailed_postal():
     print(text)
     print("\n=== PARSING ANALYSIS ===")
     
-    parser = JapaneseReceiptParser()
+    parser = get_parser()
     
     # Show which keywords are in avoid list  
     print(f"AVOID KEYWORDS: {parser.avoid_keywords}")
@@ -68,19 +68,13 @@ def debug_detailed_postal():
             print(f"\nLine {i}: '{line.strip()}'")
             
             # Check for avoid keywords
-            avoid_found = []
-            for avoid_kw in parser.avoid_keywords:
-                if avoid_kw in line:
-                    avoid_found.append(avoid_kw)
+            avoid_found = parser.avoid_matcher.findall(line)
             
             if avoid_found:
                 print(f"  AVOID KEYWORDS FOUND: {avoid_found}")
             
             # Check for total keywords
-            total_found = []
-            for total_kw in parser.total_keywords:
-                if total_kw in line:
-                    total_found.append(total_kw)
+            total_found = parser.total_matcher.findall(line)
             
             if total_found:
                 print(f"  TOTAL KEYWORDS FOUND: {total_found}")
@@ -8,10 +8,10 @@ import logging
 # Enable DEBUG logging
 logging.basicConfig(level=logging.DEBUG)
 
-from src.parse import JapaneseReceiptParser
+from src.parse import get_parser
 
 def main():
-    parser = JapaneseReceiptParser()
+    parser = get_parser()
     
     text = """2名
 山本
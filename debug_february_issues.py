@@ -2,18 +2,25 @@
 """Debug the specific February receipts that were incorrectly parsed."""
 
 import sys
-import json
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
+
 sys.path.append('src')
-from parse import JapaneseReceiptParser
-from classify import CategoryClassifier
+from parse import get_parser
+from classify import get_classifier
+
+@lru_cache(maxsize=4096)
+def parse_receipt_fields(text):
+    """Parse date, amount and vendor once per distinct OCR text."""
+    parser = get_parser()
+    return parser.parse_date(text), parser.parse_amount(text), parser.parse_vendor(text)
 
 def debug_specific_receipts():
     """Debug the receipts that were incorrectly parsed based on user feedback."""
     
-    parser = JapaneseReceiptParser()
-    classifier = CategoryClassifier('rules/categories.yml')
+    classifier = get_classifier('rules/categories.yml')
     
     # Look for the OCR files that correspond to the corrected receipts
     ocr_dir = Path("/Users/alejpascual/Downloads/receipts-output/ocr_json")
@@ -44,15 +51,12 @@ def debug_specific_receipts():
             print(f"\n📄 Processing: {ocr_file.name}")
             
             try:
-                with open(ocr_file, 'r', encoding='utf-8') as f:
-                    ocr_data = json.load(f)
+                ocr_data = orjson.loads(ocr_file.read_bytes())
                 
                 text = ocr_data['full_text']
                 
                 # Parse the receipt
-                date = parser.parse_date(text)
-                amount = parser.parse_amount(text)
-                vendor = parser.parse_vendor(text)
+                date, amount, vendor = parse_receipt_fields(text)
                 category, category_confidence = classifier.classify(vendor, "", text)
                 
                 print(f"  📅 Parsed date: {date}")
@@ -78,7 +82,7 @@ def debug_specific_receipts():
 def test_new_classifications():
     """Test the new category classifications we added."""
     
-    classifier = CategoryClassifier('rules/categories.yml')
+    classifier = get_classifier('rules/categories.yml')
     
     test_cases = [
         ("Railway VPS hosting service", "railway vps monthly subscription"),
@@ -2,19 +2,25 @@
 
 import sys
 import os
-import json
+from functools import lru_cache
 from pathlib import Path
 
 sys.path.insert(0, '/Users/alejpascual/Coding/Current/receipts-ocr/src')
 
-from parse import JapaneseReceiptParser
-from classify import CategoryClassifier
+from parse import get_parser
+from classify import get_classifier
+from ocr_json import load_ocr_json, read_full_text
+
+@lru_cache(maxsize=4096)
+def parse_receipt_fields(text):
+    """Parse date, amount and vendor once per distinct OCR text."""
+    parser = get_parser()
+    return parser.parse_date(text), parser.parse_amount(text), parser.parse_vendor(text)
 
 def debug_missing_invoices():
     """Debug why certain invoices are missing from March processing."""
     
-    parser = JapaneseReceiptParser()
-    classifier = CategoryClassifier('/Users/alejpascual/Coding/Current/receipts-ocr/rules/categories.yml')
+    classifier = get_classifier('/Users/alejpascual/Coding/Current/receipts-ocr/rules/categories.yml')
     
     # Test files that should be included but are missing
     missing_files = [
@@ -37,15 +43,13 @@ def debug_missing_invoices():
         print(f"\n=== DEBUGGING {filename} ===")
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                ocr_data = json.load(f)
-            
-            text = ocr_data['full_text']
+            # Only full_text is needed - avoid parsing the pages section
+            text = read_full_text(filepath)
+            if text is None:
+                text = load_ocr_json(filepath)['full_text']
             
             # Test parsing
-            date = parser.parse_date(text)
-            amount = parser.parse_amount(text)
-            vendor = parser.parse_vendor(text)
+            date, amount, vendor = parse_receipt_fields(text)
             category, category_confidence = classifier.classify(vendor, "", text)
             
             print(f"DATE: {date}")
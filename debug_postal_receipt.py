@@ -4,8 +4,8 @@ import sys
 import os
 sys.path.insert(0, '/Users/alejpascual/Coding/Current/receipts-ocr/src')
 
-from parse import JapaneseReceiptParser
-import json
+from parse import get_parser
+from ocr_json import load_ocr_json, read_full_text
 
 def debug_postal_receipt():
     """Debug the postal receipt ¥230 vs ¥250 issue."""
@@ -35,15 +35,16 @@ def debug_postal_receipt():
     
     print(f"Found potential postal receipt files: {postal_files}")
     
-    parser = JapaneseReceiptParser()
+    parser = get_parser()
     
     for filename in postal_files[:3]:  # Check first 3 files
         filepath = os.path.join(ocr_dir, filename)
         print(f"\n=== DEBUGGING {filename} ===")
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Fast path: pull just full_text without parsing the whole file
+            text = read_full_text(filepath)
+            data = load_ocr_json(filepath) if text is None else {'full_text': text}
             
             # Extract text
             text = ""
@@ -82,19 +83,13 @@ def debug_postal_receipt():
                     print(f"Line {i}: {line.strip()}")
                     
                     # Check if this line has avoid keywords
-                    avoid_found = []
-                    for avoid_kw in parser.avoid_keywords:
-                        if avoid_kw in line:
-                            avoid_found.append(avoid_kw)
+                    avoid_found = parser.avoid_matcher.findall(line)
                     
                     if avoid_found:
                         print(f"  AVOID KEYWORDS: {avoid_found}")
                     
                     # Check if this line has total keywords
-                    total_found = []
-                    for total_kw in parser.total_keywords:
-                        if total_kw in line:
-                            total_found.append(total_kw)
+                    total_found = parser.total_matcher.findall(line)
                     
                     if total_found:
                         print(f"  TOTAL KEYWORDS: {total_found}")
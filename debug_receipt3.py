@@ -3,10 +3,10 @@
 
 import sys
 sys.path.append('.')
-from src.parse import JapaneseReceiptParser
+from src.parse import get_parser, TOTAL_MATCHER, AVOID_MATCHER
 
 def main():
-    parser = JapaneseReceiptParser()
+    parser = get_parser()
     
     text = """2名
 山本
@@ -48,15 +48,14 @@ TEL : 03-6304-0710
     print('=== DEBUGGING RECEIPT 3 AMOUNT SELECTION ===')
     
     # Check for total keywords
-    lines = text.split('\n')
+    lines = text.splitlines()
     print(f'Total lines: {len(lines)}')
     print()
     
     print('Lines with total keywords:')
     for i, line in enumerate(lines):
-        for keyword in parser.total_keywords:
-            if keyword in line:
-                print(f'Line {i+1}: "{line.strip()}" (keyword: {keyword})')
+        for keyword in TOTAL_MATCHER.findall(line):
+            print(f'Line {i+1}: "{line.strip()}" (keyword: {keyword})')
     print()
     
     print('All amount occurrences:')
@@ -64,9 +63,8 @@ TEL : 03-6304-0710
         if '¥3,564' in line or '¥1,408' in line or '¥3,554' in line:
             print(f'Line {i+1}: "{line.strip()}"')
             # Check if this line has avoid keywords
-            has_avoid = any(kw in line for kw in parser.avoid_keywords)
-            if has_avoid:
-                avoid_keywords = [kw for kw in parser.avoid_keywords if kw in line]
+            avoid_keywords = AVOID_MATCHER.findall(line)
+            if avoid_keywords:
                 print(f'  -> HAS AVOID KEYWORDS: {avoid_keywords}')
     print()
     
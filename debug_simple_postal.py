@@ -2,9 +2,27 @@
 
 import sys
 import os
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
 sys.path.insert(0, '/Users/alejpascual/Coding/Current/receipts-ocr/src')
 
-from parse import JapaneseReceiptParser
+from parse import get_parser
+
+# Candidate priority by total keyword and position relative to it
+KEYWORD_PRIORITY = {
+    '合計': {'previous': 6000, 'current': 5000, 'next': 4000},
+}
+DEFAULT_PRIORITY = {'previous': 1000, 'current': 1000, 'next': 1000}
+
+@lru_cache(maxsize=4096)
+def extract_amounts_cached(line):
+    """Extract amounts once per distinct line (receipts repeat lines like ¥110)."""
+    return tuple(get_parser()._extract_amounts_from_line(line))
+
+def lines_with_keywords(text, line_starts, matcher):
+    """Indices of lines containing any of the matcher's keywords, in one sweep over text."""
+    return {bisect_right(line_starts, m.start()) - 1 for m in matcher.finditer(text)}
 
 def debug_simple_postal():
     """Simple debug to see which amount has highest priority."""
@@ -47,59 +65,66 @@ def debug_simple_postal():
 様
 領収書"""
 
-    parser = JapaneseReceiptParser()
+    parser = get_parser()
     
     # Parse manually to get all candidates
-    lines = text.split('\n')
+    lines = text.splitlines()
     amount_candidates = []
     
+    # Tag keyword lines once; the loops below only do set lookups
+    line_starts = [0]
+    for line in lines[:-1]:
+        line_starts.append(line_starts[-1] + len(line) + 1)
+    total_lines = lines_with_keywords(text, line_starts, parser.total_matcher)
+    avoid_lines = lines_with_keywords(text, line_starts, parser.avoid_matcher)
+    
+    # The same (amount, line) pair is revisited for each keyword hit nearby
+    @lru_cache(maxsize=None)
+    def is_tax_amount(amount, line_idx):
+        return parser._is_tax_amount(amount, lines[line_idx], lines, line_idx)
+    
     # Simulate the parsing logic to get candidates
-    for line_idx, line in enumerate(lines):
+    for line_idx in sorted(total_lines):
+        line = lines[line_idx]
         # Look for amounts near total keywords
-        for keyword in parser.total_keywords:
-            if keyword in line:
-                # Search in current line and adjacent lines
-                search_lines = []
-                search_lines.append((line, line_idx, 'current'))
-                if line_idx > 0:
-                    search_lines.append((lines[line_idx - 1], line_idx - 1, 'previous'))
-                if line_idx < len(lines) - 1:
-                    search_lines.append((lines[line_idx + 1], line_idx + 1, 'next'))
+        for keyword in parser.total_matcher.findall(line):
+            # Search in current line and adjacent lines
+            search_lines = []
+            search_lines.append((line, line_idx, 'current'))
+            if line_idx > 0:
+                search_lines.append((lines[line_idx - 1], line_idx - 1, 'previous'))
+            if line_idx < len(lines) - 1:
+                search_lines.append((lines[line_idx + 1], line_idx + 1, 'next'))
+            
+            for search_line, search_idx, position in search_lines:
+                # Check for avoid keywords once per line; the penalty is the same for every amount on it
+                line_has_avoid_keyword = search_idx in avoid_lines
+                prev_line_has_avoid_keyword = search_idx > 0 and (search_idx - 1) in avoid_lines
                 
-                for search_line, search_idx, position in search_lines:
-                    amounts = parser._extract_amounts_from_line(search_line)
-                    for amount, confidence in amounts:
-                        # Skip if tax amount
-                        if parser._is_tax_amount(amount, search_line, lines, search_idx):
-                            continue
-                        
-                        # Calculate priority similar to actual parser
-                        if keyword == '合計':
-                            if position == 'previous':
-                                keyword_priority = 6000
-                            elif position == 'current':
-                                keyword_priority = 5000
-                            else:
-                                keyword_priority = 4000
-                        else:
-                            keyword_priority = 1000
-                        
-                        # Check for avoid keywords and apply penalties
-                        line_has_avoid_keyword = any(avoid_kw in search_line for avoid_kw in parser.avoid_keywords)
-                        prev_line_has_avoid_keyword = False
-                        if search_idx > 0:
-                            prev_line = lines[search_idx - 1]
-                            prev_line_has_avoid_keyword = any(avoid_kw in prev_line for avoid_kw in parser.avoid_keywords)
-                        
-                        if line_has_avoid_keyword:
-                            keyword_priority -= 50
-                        elif prev_line_has_avoid_keyword:
-                            keyword_priority -= 180
-                        
-                        amount_candidates.append((amount, keyword_priority + confidence, search_line, f"keyword:{keyword}, position:{position}"))
+                amounts = extract_amounts_cached(search_line)
+                for amount, confidence in amounts:
+                    # Skip if tax amount
+                    if is_tax_amount(amount, search_idx):
+                        continue
+                    
+                    # Calculate priority similar to actual parser
+                    keyword_priority = KEYWORD_PRIORITY.get(keyword, DEFAULT_PRIORITY)[position]
+                    
+                    # Apply avoid keyword penalties
+                    if line_has_avoid_keyword:
+                        keyword_priority -= 50
+                    elif prev_line_has_avoid_keyword:
+                        keyword_priority -= 180
+                    
+                    amount_candidates.append((keyword_priority + confidence, amount, search_line, f"keyword:{keyword}, position:{position}"))
     
-    # Also add frequency-based candidates
-    frequency = {230: 4, 250: 4}  # Both appear 4 times
+    # Also add frequency-based candidates, counting non-tax amounts like the parser does
+    frequency = Counter(
+        amount
+        for line_idx, line in enumerate(lines)
+        for amount, _ in extract_amounts_cached(line)
+        if not is_tax_amount(amount, line_idx)
+    )
     
     # Add frequency candidates with penalties
     for amount in [230, 250]:
@@ -111,21 +136,21 @@ def debug_simple_postal():
         if amount == 250:
             frequency_priority -= 180  # penalty for avoid keyword in previous line
         
-        amount_candidates.append((amount, frequency_priority, line_containing_amount, "frequency"))
+        amount_candidates.append((frequency_priority, amount, line_containing_amount, "frequency"))
     
     print("=== ALL AMOUNT CANDIDATES ===")
-    sorted_candidates = sorted(amount_candidates, key=lambda x: x[1], reverse=True)
-    for amount, priority, line, source in sorted_candidates:
-        if amount in [230, 250]:  # Only show the amounts we care about
-            print(f"¥{amount}: priority {priority} from {source} in line '{line.strip()}'")
+    # Candidates are (priority, amount, line, source) so plain tuple ordering ranks them
+    shown_candidates = sorted((c for c in amount_candidates if c[1] in (230, 250)), reverse=True)  # Only show the amounts we care about
+    for priority, amount, line, source in shown_candidates:
+        print(f"¥{amount}: priority {priority} from {source} in line '{line.strip()}'")
     
     print(f"\n=== WINNER ===")
-    if sorted_candidates:
-        winner = sorted_candidates[0]
-        print(f"Highest priority: ¥{winner[0]} with priority {winner[1]}")
-        if winner[0] == 230:
+    if amount_candidates:
+        winner_priority, winner_amount, _, _ = max(amount_candidates)
+        print(f"Highest priority: ¥{winner_amount} with priority {winner_priority}")
+        if winner_amount == 230:
             print("✅ SUCCESS: ¥230 (合計) should win!")
-        elif winner[0] == 250:
+        elif winner_amount == 250:
             print("❌ ERROR: ¥250 (お預り金額) is still winning")
 
 if __name__ == "__main__":
@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 """Debug the three amount parsing issues."""
 
+import re
 import sys
 sys.path.append('.')
-from src.parse import JapaneseReceiptParser
+from src.parse import get_parser
+
+# Either currency marker, found in one scan per line
+YEN_RE = re.compile('[¥円]')
 
 def main():
-    parser = JapaneseReceiptParser()
+    parser = get_parser()
 
     # Issue 1: 2025-06-14 13-46.pdf - should be ¥570, getting ¥51
     text1 = """GR266325
@@ -128,10 +132,10 @@ TEL : 03-6304-0710
         print()
         
         # Show all amounts found in text for analysis
-        lines = text.split('\n')
+        lines = text.splitlines()
         amounts_found = []
         for i, line in enumerate(lines):
-            if '¥' in line or '円' in line:
+            if YEN_RE.search(line):
                 amounts_found.append(f"Line {i+1}: '{line.strip()}'")
         
         if amounts_found:
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""Pack cached OCR JSON files into a single file for regenerate_month.py --pack."""
+import sys
+import os
+import argparse
+import logging
+
+sys.path.append('src')
+from ocr_json import pack_ocr_dir
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('pack_path', nargs='?', default='ocr_pack.jsonl',
+                            help='Output pack file (default: ocr_pack.jsonl)')
+    args = arg_parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    
+    # Same OCR_DIR convention as the regenerate scripts; re-run after new OCR results
+    ocr_dir = os.environ.get('OCR_DIR', './ocr_json')
+    
+    count = pack_ocr_dir(ocr_dir, args.pack_path)
+    print(f"✅ Packed {count} OCR files from {ocr_dir} into {args.pack_path}")
+
+
+if __name__ == "__main__":
+    main()
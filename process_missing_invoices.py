@@ -6,12 +6,12 @@ import os
 from pathlib import Path
 
 sys.path.append('src')
-from ocr import OCRProcessor
+from ocr import extract_text_parallel
+
+# Each worker loads its own models; rasterization overlaps with inference
+OCR_WORKERS = int(os.environ.get('OCR_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
 
 def main():
-    # Initialize OCR processor
-    ocr_processor = OCRProcessor(device="mps", lite=False)
-    
     # Output directory for OCR JSON files
     output_dir = Path(os.environ.get('OCR_DIR', '/Users/alejpascual/Downloads/receipts-output/ocr_json'))
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -30,22 +30,26 @@ def main():
     processed = 0
     failed = 0
     
+    pdf_paths = []
     for file_path in missing_files:
         pdf_path = Path(file_path)
         if pdf_path.exists():
-            try:
-                print(f"\nProcessing: {pdf_path}")
-                ocr_result = ocr_processor.extract_text_from_pdf(pdf_path, output_dir)
-                print(f"✅ Successfully processed: {pdf_path.name}")
-                print(f"   - Confidence: {ocr_result['confidence']:.2f}")
-                print(f"   - Text preview: {ocr_result['full_text'][:100]}...")
-                processed += 1
-            except Exception as e:
-                print(f"❌ Failed to process {pdf_path}: {e}")
-                failed += 1
+            pdf_paths.append(pdf_path)
         else:
             print(f"⚠️  File not found: {pdf_path}")
     
+    results = extract_text_parallel(pdf_paths, output_dir, workers=OCR_WORKERS, device="mps", lite=False)
+    for pdf_path, ocr_result in results:
+        print(f"\nProcessing: {pdf_path}")
+        if isinstance(ocr_result, Exception):
+            print(f"❌ Failed to process {pdf_path}: {ocr_result}")
+            failed += 1
+            continue
+        print(f"✅ Successfully processed: {pdf_path.name}")
+        print(f"   - Confidence: {ocr_result['confidence']:.2f}")
+        print(f"   - Text preview: {ocr_result['full_text'][:100]}...")
+        processed += 1
+    
     print(f"\n{'='*50}")
     print(f"Processing complete!")
     print(f"✅ Processed: {processed}")
@@ -2,6 +2,7 @@
 """Process missing July 2024 OCR files that were not processed initially."""
 
 import sys
+import os
 import json
 import logging
 from pathlib import Path
@@ -10,7 +11,7 @@ from datetime import datetime
 # Add src to path
 sys.path.append('src')
 
-from ocr import OCRProcessor
+from ocr import extract_text_parallel
 
 # Set up logging
 logging.basicConfig(
@@ -19,6 +20,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Each worker loads its own models; rasterization overlaps with inference
+OCR_WORKERS = int(os.environ.get('OCR_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+
+def iter_july_json_names(ocr_output):
+    """Names of July 2024 OCR JSON files, from a single directory scan."""
+    with os.scandir(ocr_output) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith('2024-07') and name.endswith('.json'):
+                yield name
+
 def main():
     # Paths
     july_folder = Path('/Users/alejpascual/Downloads/7. July 2024')
@@ -26,16 +38,16 @@ def main():
     
     # Get all source files
     source_files = []
-    for f in july_folder.iterdir():
-        if f.is_file() and f.suffix.lower() == '.pdf':
-            source_files.append(f)
+    with os.scandir(july_folder) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.lower().endswith('.pdf'):
+                source_files.append(Path(entry.path))
     
     # Get existing JSON files (to avoid reprocessing)
     existing_jsons = set()
-    for f in ocr_output.glob('2024-07*.json'):
+    for name in iter_july_json_names(ocr_output):
         # Remove hash suffix to get base name
-        base_name = '_'.join(f.stem.split('_')[:-1])
-        existing_jsons.add(base_name)
+        existing_jsons.add(name[:-len('.json')].rpartition('_')[0])
     
     # Find missing files
     missing_files = []
@@ -51,39 +63,31 @@ def main():
         print('✅ All files already processed!')
         return
     
-    # Initialize OCR processor
-    print('Initializing OCR processor...')
-    try:
-        ocr_processor = OCRProcessor(device="mps")  # Use Metal Performance Shaders on Mac
-    except Exception as e:
-        print(f'Failed to initialize OCR: {e}')
-        print('Trying with CPU...')
-        ocr_processor = OCRProcessor(device="cpu")
+    # Initialize OCR processors (Metal Performance Shaders on Mac, CPU if that fails)
+    print(f'Initializing {OCR_WORKERS} OCR worker(s)...')
     
     # Process missing files
     print(f'\\nProcessing {len(missing_files)} missing files...')
     success_count = 0
     error_count = 0
     
-    for i, pdf_file in enumerate(missing_files, 1):
-        try:
-            print(f'[{i}/{len(missing_files)}] Processing {pdf_file.name}...')
-            
-            # Process with OCR
-            result = ocr_processor.extract_text_from_pdf(pdf_file, ocr_output)
-            
-            # Quick validation
-            if result.get('full_text', '').strip():
-                success_count += 1
-                print(f'  ✅ Success - extracted {len(result["full_text"])} characters')
-            else:
-                error_count += 1
-                print(f'  ⚠️  No text extracted')
-                
-        except Exception as e:
+    results = extract_text_parallel(missing_files, ocr_output, workers=OCR_WORKERS,
+                                    device="mps", fallback_device="cpu")
+    for i, (pdf_file, result) in enumerate(results, 1):
+        print(f'[{i}/{len(missing_files)}] Processing {pdf_file.name}...')
+        
+        if isinstance(result, Exception):
             error_count += 1
-            print(f'  ❌ Error: {e}')
+            print(f'  ❌ Error: {result}')
             continue
+        
+        # Quick validation
+        if result.get('full_text', '').strip():
+            success_count += 1
+            print(f'  ✅ Success - extracted {len(result["full_text"])} characters')
+        else:
+            error_count += 1
+            print(f'  ⚠️  No text extracted')
     
     print(f'\\n=== OCR PROCESSING COMPLETE ===')
     print(f'✅ Successfully processed: {success_count} files')
@@ -91,7 +95,7 @@ def main():
     print(f'📊 Success rate: {success_count/(success_count+error_count)*100:.1f}%')
     
     # Now verify total JSON files
-    total_jsons = len(list(ocr_output.glob('2024-07*.json')))
+    total_jsons = sum(1 for _ in iter_july_json_names(ocr_output))
     print(f'\\n📁 Total July 2024 JSON files now: {total_jsons}')
     print(f'🎯 Target was: {len(source_files)} (all source files)')
 
@@ -84,10 +84,12 @@ def main():
     ocr_dir_path = os.getenv('OCR_DIR', 'batch-results/ocr_json')
     ocr_dir = Path(ocr_dir_path)
     
-    all_json_files = list(ocr_dir.glob('*.json'))
+    # One directory scan, sorted by name, serves both the count and the loop
+    # (plain path strings - open() takes them directly)
+    all_json_files = sorted(e.path for e in os.scandir(ocr_dir) if e.name.endswith('.json'))
     print(f"Processing {len(all_json_files)} OCR files...")
     
-    for json_file in sorted(all_json_files):
+    for json_file in all_json_files:
         try:
             with open(json_file) as f:
                 data = json.load(f)
@@ -110,10 +112,8 @@ def main():
             # Extract clean file name from JSON file path BEFORE creating review queue
             original_file_name = Path(json_file).stem
             # Remove the hash suffix (everything after last underscore)
-            if '_' in original_file_name:
-                clean_file_path = '_'.join(original_file_name.split('_')[:-1]) + '.pdf'
-            else:
-                clean_file_path = original_file_name + '.pdf'
+            base, sep, _ = original_file_name.rpartition('_')
+            clean_file_path = (base if sep else original_file_name) + '.pdf'
             
             # Only process April 2025 receipts
             if not is_april_2025_receipt(date):
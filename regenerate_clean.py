@@ -2,11 +2,15 @@
 """Regenerate Excel with clean descriptions from existing OCR JSON files."""
 
 import sys
-import json
 import os
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import calendar
 from datetime import datetime
-from collections import Counter
+
+import numpy as np
+import orjson
 
 # Add src to path
 sys.path.append('src')
@@ -15,6 +19,44 @@ from parse import JapaneseReceiptParser
 from classify import CategoryClassifier
 from export import ExcelExporter
 from review import ReviewQueue
+from parse_cache import ParseCache, cache_version, parse_fields
+from ocr_json import has_empty_full_text
+
+
+def _valid_dates(date_strs):
+    """Dates from the YYYY-MM-DD strings that parse, skipping the rest."""
+    dates = []
+    for date_str in date_strs:
+        try:
+            dates.append(datetime.strptime(date_str, '%Y-%m-%d').date())
+        except ValueError:
+            continue
+    return dates
+
+
+def read_ocr_bytes(path):
+    """Read an OCR JSON file for the worker pool; errors are returned, not raised."""
+    try:
+        with open(path, 'rb') as f:
+            return path, f.read()
+    except OSError as e:
+        return path, e
+
+
+def iter_ocr_bytes(paths, workers=8, read_ahead=64):
+    """
+    Yield (path, bytes | OSError) in order while later files are read in threads.
+    
+    At most `read_ahead` files are held in memory at once.
+    """
+    window = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path in paths:
+            window.append(pool.submit(read_ocr_bytes, path))
+            if len(window) >= read_ahead:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
 
 
 def determine_month_year_from_transactions(transactions):
@@ -30,62 +72,73 @@ def determine_month_year_from_transactions(transactions):
     if not transactions:
         return "Unknown Period"
     
-    # Extract month/year from valid dates
-    month_years = []
-    for transaction in transactions:
-        date_str = transaction.get('date')
-        if date_str:
-            try:
-                # Parse ISO date format (YYYY-MM-DD)
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                month_year = date_obj.strftime('%B %Y')  # e.g., "August 2024"
-                month_years.append(month_year)
-            except ValueError:
-                continue
+    # Parse all ISO dates (YYYY-MM-DD) in one vectorized call
+    date_strs = [t['date'] for t in transactions if t.get('date')]
+    try:
+        days = np.array(date_strs, dtype='datetime64[D]')
+    except ValueError:
+        # A malformed date somewhere - drop the bad ones individually
+        days = np.array(_valid_dates(date_strs), dtype='datetime64[D]')
+    months = days.astype('datetime64[M]')
     
-    if not month_years:
+    if months.size == 0:
         return "Unknown Period"
     
     # Find most common month/year
-    month_year_counts = Counter(month_years)
-    most_common = month_year_counts.most_common(1)[0]
+    unique_months, counts = np.unique(months, return_counts=True)
+    top = counts.argmax()
     
     # If the most common month/year represents >50% of transactions, use it
-    if most_common[1] / len(month_years) > 0.5:
-        return most_common[0]
+    if counts[top] / months.size > 0.5:
+        year, month = str(unique_months[top]).split('-')
+        return f"{calendar.month_name[int(month)]} {year}"  # e.g., "August 2024"
     else:
         return "Mixed Months"
 
 def main():
     # Initialize components
     parser = JapaneseReceiptParser()
-    classifier = CategoryClassifier(Path('rules/categories.yml'))
+    rules_path = Path('rules/categories.yml')
+    classifier = CategoryClassifier(rules_path)
     review_queue = ReviewQueue()
     
+    # Cached categories depend on the rules too, so editing them misses old entries
+    cache = ParseCache(version=cache_version(rules_path))
+    
     # Read existing OCR results and regenerate with clean descriptions
     transactions = []
     # Use environment variable or fallback to default batch results
     ocr_dir_path = os.getenv('OCR_DIR', 'batch-results/ocr_json')
     ocr_dir = Path(ocr_dir_path)
     
-    print(f"Processing {len(list(ocr_dir.glob('*.json')))} OCR files...")
+    # One directory listing serves both the count and the loop
+    entries = [e for e in os.scandir(ocr_dir) if e.name.endswith('.json')]
+    entries.sort(key=lambda e: e.name)
+    
+    print(f"Processing {len(entries)} OCR files...")
     
-    for json_file in sorted(ocr_dir.glob('*.json')):
+    # Disk reads run ahead in threads; parsing stays on the main thread
+    read_workers = int(os.getenv('READ_WORKERS', '8'))
+    for json_file, raw in iter_ocr_bytes((e.path for e in entries), read_workers):
         try:
-            with open(json_file) as f:
-                data = json.load(f)
+            if isinstance(raw, OSError):
+                raise raw
+            # Blank OCR results are skipped without decoding them
+            if has_empty_full_text(raw):
+                continue
+            data = orjson.loads(raw)
             
             text = data.get('full_text', '')
             if not text:
                 continue
                 
-            # Parse data
-            date = parser.parse_date(text)
-            amount = parser.parse_amount(text)
-            vendor = parser.parse_vendor(text)
-            
-            # Classify category first
-            category, category_confidence = classifier.classify(vendor, "", text)
+            fields = cache.get(text)
+            if fields is None:
+                fields = parse_fields(text, parser, classifier)
+                cache.put(text, fields)
+            date, amount = fields['date'], fields['amount']
+            category, category_confidence = fields['category'], fields['category_confidence']
+            description = fields['description']
             
             # Get OCR confidence from the data
             ocr_confidence = data.get('confidence', 0.8)
@@ -93,13 +146,11 @@ def main():
             # Extract clean file name from JSON file path BEFORE creating review queue
             original_file_name = Path(json_file).stem
             # Remove the hash suffix (everything after last underscore)
-            if '_' in original_file_name:
-                clean_file_path = '_'.join(original_file_name.split('_')[:-1]) + '.pdf'
-            else:
-                clean_file_path = original_file_name + '.pdf'
+            base, sep, _ = original_file_name.rpartition('_')
+            clean_file_path = (base if sep else original_file_name) + '.pdf'
             
             # Add to review queue with CLEAN filename (this will check confidence thresholds)
-            review_queue.add_from_extraction(
+            needs_review = review_queue.add_from_extraction(
                 file_path=clean_file_path,
                 date=date,
                 amount=amount,
@@ -110,39 +161,23 @@ def main():
             )
             
             # Only add to transactions if we have valid date and amount AND it's not flagged for review
-            if date and amount:
-                # Check if this item was flagged for review
-                current_review_count = len(review_queue.items)
-                
-                # Temporarily check if this would be flagged for review
-                needs_review = review_queue.should_review(
-                    date=date,
-                    amount=amount,
-                    category=category,
-                    category_confidence=category_confidence,
-                    ocr_confidence=ocr_confidence,
-                    file_path=clean_file_path,
-                    ocr_text=text
-                )
-                
-                if not needs_review:
-                    # Generate CLEAN description using category
-                    description = parser.extract_description_context(text, vendor, amount, category)
-                    
-                    # Use the same clean filename we created above
-                    transaction = {
-                        'file_name': clean_file_path,
-                        'date': date,
-                        'amount': amount,
-                        'category': category,
-                        'description': description
-                    }
-                    transactions.append(transaction)
+            if date and amount and not needs_review:
+                # Use the same clean filename we created above
+                transaction = {
+                    'file_name': clean_file_path,
+                    'date': date,
+                    'amount': amount,
+                    'category': category,
+                    'description': description
+                }
+                transactions.append(transaction)
             
         except Exception as e:
             print(f"Error processing {json_file}: {e}")
             continue
     
+    cache.close()
+    
     # Determine month/year for filename
     month_year = determine_month_year_from_transactions(transactions)
     
@@ -68,8 +68,10 @@ def main():
     ocr_dir_path = os.getenv('OCR_DIR', 'batch-results/ocr_json')
     ocr_dir = Path(ocr_dir_path)
     
-    # Filter for February 2025 files only
-    february_files = [f for f in sorted(ocr_dir.glob('*.json')) if f.name.startswith('2025-02-')]
+    # Filter for February 2025 files only - one directory scan, filtered before sorting
+    # (plain path strings - open() takes them directly)
+    february_files = sorted(e.path for e in os.scandir(ocr_dir)
+                            if e.name.startswith('2025-02-') and e.name.endswith('.json'))
     
     print(f"Processing {len(february_files)} February 2025 OCR files...")
     
@@ -96,10 +98,8 @@ def main():
             # Extract clean file name from JSON file path BEFORE creating review queue
             original_file_name = Path(json_file).stem
             # Remove the hash suffix (everything after last underscore)
-            if '_' in original_file_name:
-                clean_file_path = '_'.join(original_file_name.split('_')[:-1]) + '.pdf'
-            else:
-                clean_file_path = original_file_name + '.pdf'
+            base, sep, _ = original_file_name.rpartition('_')
+            clean_file_path = (base if sep else original_file_name) + '.pdf'
             
             # Add to review queue with CLEAN filename (this will check confidence thresholds)
             review_queue.add_from_extraction(
@@ -2,25 +2,152 @@
 """Regenerate Excel with all January 2025 incorporation files - FIXED VERSION."""
 
 import sys
-import json
 import os
+import re
+import fnmatch
+import argparse
+import logging
 from pathlib import Path
-from datetime import datetime
-from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import orjson
 
 # Add src to path
 sys.path.append('src')
 
-from parse import JapaneseReceiptParser
-from classify import CategoryClassifier
-from export import ExcelExporter
+from parse import get_parser, parse_iso_date
+from classify import get_classifier
 from review import ReviewQueue
+from ocr_json import has_empty_full_text
+from parse_cache import ParseCache, cache_version, parse_fields
+
+RULES_PATH = Path('rules/categories.yml')
+
+logger = logging.getLogger(__name__)
+
+# Per-process components, built once by init_worker
+_parser = None
+_classifier = None
+_cache = None
+_verbose = False
+
+
+def init_worker(version, verbose=False):
+    """Load the shared parser and category rules once per worker process.
+    
+    Workers only read the parse cache; new entries go back to the main
+    process, which is the single writer.
+    """
+    global _parser, _classifier, _cache, _verbose
+    _verbose = verbose
+    _parser = get_parser()
+    _classifier = get_classifier(RULES_PATH)
+    _cache = ParseCache(version=version, read_only=True)
+
+
+def process_one(json_path):
+    """
+    Parse, classify and review-check one OCR JSON file.
+    
+    Args:
+        json_path: Path to the OCR JSON file
+        
+    Returns:
+        Tuple of (transaction dict or None, ReviewItem or None, (level, message) log records,
+        (text, fields) to add to the parse cache or None)
+    """
+    parser = _parser
+    messages = []
+    fresh = None
+    try:
+        # One read of the whole file; the pool already overlaps reads with other workers' parsing
+        raw = Path(json_path).read_bytes()
+        # Blank OCR results are skipped without decoding them
+        if has_empty_full_text(raw):
+            return None, None, messages, fresh
+        data = orjson.loads(raw)
+        
+        text = data.get('full_text', '')
+        if not text:
+            return None, None, messages, fresh
+            
+        # Parse and classify, unless an earlier run already did for this text
+        fields = _cache.get(text)
+        if fields is None:
+            fields = parse_fields(text, parser, _classifier)
+            fresh = (text, fields)
+        date, amount = fields['date'], fields['amount']
+        category, category_confidence = fields['category'], fields['category_confidence']
+        
+        # Get OCR confidence from the data
+        ocr_confidence = data.get('confidence', 0.8)
+        
+        # Extract clean file name from JSON file path BEFORE creating review queue
+        original_file_name = Path(json_path).stem
+        # Remove the hash suffix (everything after last underscore)
+        base, sep, _ = original_file_name.rpartition('_')
+        clean_file_path = (base if sep else original_file_name) + '.pdf'
+        
+        # Add to review queue with CLEAN filename (this will check confidence thresholds)
+        review_queue = ReviewQueue()
+        if review_queue.add_from_extraction(
+            file_path=clean_file_path,
+            date=date,
+            amount=amount,
+            category=category,
+            category_confidence=category_confidence,
+            ocr_confidence=ocr_confidence,
+            raw_text=text
+        ):
+            return None, review_queue.items[0], messages, fresh
+        
+        # Not flagged for review, so date and amount are both present. High-value
+        # transactions are left out of the transactions without being queued.
+        if parser.should_flag_for_high_value_review(text, amount, date, category, category_confidence):
+            return None, None, messages, fresh
+        
+        # CRITICAL: Only include January 2025 transactions
+        try:
+            year, month, _ = parse_iso_date(date)
+            if year == 2025 and month == 1:
+                # Generate CLEAN description using category
+                description = fields['description']
+                
+                # Use the same clean filename we created above
+                transaction = {
+                    'file_name': clean_file_path,
+                    'date': date,
+                    'amount': amount,
+                    'category': category,
+                    'description': description
+                }
+                if _verbose:
+                    messages.append((logging.DEBUG, f"Added: {clean_file_path} - {date} - ¥{amount} - {category}"))
+                return transaction, None, messages, fresh
+            else:
+                if _verbose:
+                    messages.append((logging.DEBUG, f"Skipped (not January 2025): {clean_file_path} - {date} - ¥{amount} - {category}"))
+        except ValueError:
+            if _verbose:
+                messages.append((logging.DEBUG, f"Skipped (invalid date): {clean_file_path} - {date} - ¥{amount} - {category}"))
+        
+    except Exception as e:
+        messages.append((logging.ERROR, f"Error processing {json_path}: {e}"))
+    
+    return None, None, messages, fresh
 
 
 def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--verbose', action='store_true', help='Log every added/skipped file, not just errors')
+    args = arg_parser.parse_args()
+    
+    # Per-file lines are logged (DEBUG with --verbose); the summary below is printed
+    logging.basicConfig(level=logging.WARNING, format='%(message)s', handlers=[logging.StreamHandler(sys.stdout)])
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+    
     # Initialize components
-    parser = JapaneseReceiptParser()
-    classifier = CategoryClassifier(Path('rules/categories.yml'))
     review_queue = ReviewQueue()
     
     # Read existing OCR results and regenerate with clean descriptions
@@ -46,115 +173,51 @@ def main():
         '2025-02-25 10-12_4c437e5f055e0e2e40cc0eebca19b867.json'  # This one too
     ]
     
+    # List the directory once; every lookup below is an in-memory match on names,
+    # and only the matches are joined into path strings for the workers
+    json_names = [e.name for e in os.scandir(ocr_dir) if e.name.endswith('.json')]
+    
     # Find files that actually exist (use partial matching since hashes might differ)
+    name_set = set(json_names)
     existing_files = []
     for target_file in january_files:
         # Try exact match first
-        exact_path = ocr_dir / target_file
-        if exact_path.exists():
-            existing_files.append(exact_path)
+        if target_file in name_set:
+            existing_files.append(os.path.join(ocr_dir, target_file))
         else:
             # Try partial matching on the base name
-            base_name = target_file.split('_')[0]
-            matches = list(ocr_dir.glob(f"{base_name}_*.json"))
-            if matches:
-                existing_files.extend(matches)
-    
-    # Also add files by pattern matching
-    pattern_files = []
-    for pattern in ['Invoice*4013*.json', '*2025-02-21 14-56*.json', '*2025-02-25 10-12*.json', 
-                   '*Screenshot*17.29*.json', '*Screenshot*17.37*.json', '*Screenshot*17.55*.json',
-                   '*monitor*.json', '*Stamp receipt*.json', '*Visa Stamp*.json', 
-                   '*houmu*.json', '*houmy*.json']:
-        pattern_files.extend(ocr_dir.glob(pattern))
+            prefix = target_file.split('_')[0] + '_'
+            existing_files.extend(os.path.join(ocr_dir, name) for name in json_names if name.startswith(prefix))
+    
+    # Also add files by pattern matching - the glob patterns compiled into one regex
+    patterns = ['Invoice*4013*.json', '*2025-02-21 14-56*.json', '*2025-02-25 10-12*.json', 
+                '*Screenshot*17.29*.json', '*Screenshot*17.37*.json', '*Screenshot*17.55*.json',
+                '*monitor*.json', '*Stamp receipt*.json', '*Visa Stamp*.json', 
+                '*houmu*.json', '*houmy*.json']
+    pattern_re = re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+    pattern_files = [os.path.join(ocr_dir, name) for name in json_names if pattern_re.match(name)]
     
     # Combine and deduplicate
     all_january_files = list(set(existing_files + pattern_files))
     
     print(f"Processing {len(all_january_files)} January 2025 incorporation OCR files...")
     
-    for json_file in all_january_files:
-        try:
-            with open(json_file) as f:
-                data = json.load(f)
-            
-            text = data.get('full_text', '')
-            if not text:
-                continue
-                
-            # Parse data
-            date = parser.parse_date(text)
-            amount = parser.parse_amount(text)
-            vendor = parser.parse_vendor(text)
-            
-            # Classify category first
-            category, category_confidence = classifier.classify(vendor, "", text)
-            
-            # Get OCR confidence from the data
-            ocr_confidence = data.get('confidence', 0.8)
-            
-            # Extract clean file name from JSON file path BEFORE creating review queue
-            original_file_name = Path(json_file).stem
-            # Remove the hash suffix (everything after last underscore)
-            if '_' in original_file_name:
-                clean_file_path = '_'.join(original_file_name.split('_')[:-1]) + '.pdf'
-            else:
-                clean_file_path = original_file_name + '.pdf'
-            
-            # Add to review queue with CLEAN filename (this will check confidence thresholds)
-            review_queue.add_from_extraction(
-                file_path=clean_file_path,
-                date=date,
-                amount=amount,
-                category=category,
-                category_confidence=category_confidence,
-                ocr_confidence=ocr_confidence,
-                raw_text=text
-            )
-            
-            # Only add to transactions if we have valid date and amount AND it's not flagged for review
-            if date and amount:
-                # Check if this item was flagged for review
-                current_review_count = len(review_queue.items)
-                
-                # Temporarily check if this would be flagged for review (including high-value check)
-                needs_review = review_queue.should_review(
-                    date=date,
-                    amount=amount,
-                    category=category,
-                    category_confidence=category_confidence,
-                    ocr_confidence=ocr_confidence,
-                    file_path=clean_file_path,
-                    ocr_text=text,
-                    parser=parser
-                )
-                
-                if not needs_review:
-                    # CRITICAL: Only include January 2025 transactions
-                    try:
-                        date_obj = datetime.strptime(date, '%Y-%m-%d')
-                        if date_obj.year == 2025 and date_obj.month == 1:
-                            # Generate CLEAN description using category
-                            description = parser.extract_description_context(text, vendor, amount, category)
-                            
-                            # Use the same clean filename we created above
-                            transaction = {
-                                'file_name': clean_file_path,
-                                'date': date,
-                                'amount': amount,
-                                'category': category,
-                                'description': description
-                            }
-                            transactions.append(transaction)
-                            print(f"Added: {clean_file_path} - {date} - ¥{amount} - {category}")
-                        else:
-                            print(f"Skipped (not January 2025): {clean_file_path} - {date} - ¥{amount} - {category}")
-                    except ValueError:
-                        print(f"Skipped (invalid date): {clean_file_path} - {date} - ¥{amount} - {category}")
-            
-        except Exception as e:
-            print(f"Error processing {json_file}: {e}")
-            continue
+    # Parsing is CPU-bound and independent per file, so spread it over processes
+    workers = int(os.getenv('PARSE_WORKERS', os.cpu_count() or 1))
+    chunksize = max(1, len(all_january_files) // (workers * 4))
+    version = cache_version(RULES_PATH)
+    cache = ParseCache(version=version)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(version, args.verbose)) as pool:
+        for transaction, review_item, messages, fresh in pool.map(process_one, all_january_files, chunksize=chunksize):
+            for level, message in messages:
+                logger.log(level, message)
+            if review_item:
+                review_queue.items.append(review_item)
+            if transaction:
+                transactions.append(transaction)
+            if fresh:
+                cache.put(*fresh)
+    cache.close()
     
     # Force filename to be January 2025
     filename = "transactions_January_2025.xlsx"
@@ -168,6 +231,7 @@ def main():
     
     # Export to new Excel with clean descriptions AND review items
     excel_path = output_dir / filename
+    from export import ExcelExporter  # openpyxl is only needed once results are ready
     exporter = ExcelExporter(excel_path)
     exporter.export_transactions(transactions, review_queue.items, include_summary=True)
     
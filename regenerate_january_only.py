@@ -2,19 +2,36 @@
 """Regenerate Excel with clean descriptions from existing OCR JSON files - January 2025 only."""
 
 import sys
-import json
 import os
+import re
+import logging
 from pathlib import Path
+import calendar
 from datetime import datetime
-from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import orjson
 
 # Add src to path
 sys.path.append('src')
 
-from parse import JapaneseReceiptParser
-from classify import CategoryClassifier
-from export import ExcelExporter
+from parse import get_parser
+from classify import get_classifier
 from review import ReviewQueue
+from ocr_json import has_empty_full_text
+from parse_cache import ParseCache, cache_version, parse_fields
+
+
+def _valid_dates(date_strs):
+    """Dates from the YYYY-MM-DD strings that parse, skipping the rest."""
+    dates = []
+    for date_str in date_strs:
+        try:
+            dates.append(datetime.strptime(date_str, '%Y-%m-%d').date())
+        except ValueError:
+            continue
+    return dates
 
 
 def determine_month_year_from_transactions(transactions):
@@ -30,36 +47,144 @@ def determine_month_year_from_transactions(transactions):
     if not transactions:
         return "Unknown Period"
     
-    # Extract month/year from valid dates
-    month_years = []
-    for transaction in transactions:
-        date_str = transaction.get('date')
-        if date_str:
-            try:
-                # Parse ISO date format (YYYY-MM-DD)
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                month_year = date_obj.strftime('%B %Y')  # e.g., "August 2024"
-                month_years.append(month_year)
-            except ValueError:
-                continue
-    
-    if not month_years:
+    # Parse all ISO dates (YYYY-MM-DD) in one vectorized call
+    date_strs = [t['date'] for t in transactions if t.get('date')]
+    try:
+        days = np.array(date_strs, dtype='datetime64[D]')
+    except ValueError:
+        # A malformed date somewhere - drop the bad ones individually
+        days = np.array(_valid_dates(date_strs), dtype='datetime64[D]')
+    months = days.astype('datetime64[M]')
+    
+    if months.size == 0:
         return "Unknown Period"
     
     # Find most common month/year
-    month_year_counts = Counter(month_years)
-    most_common = month_year_counts.most_common(1)[0]
+    unique_months, counts = np.unique(months, return_counts=True)
+    top = counts.argmax()
     
     # If the most common month/year represents >50% of transactions, use it
-    if most_common[1] / len(month_years) > 0.5:
-        return most_common[0]
+    if counts[top] / months.size > 0.5:
+        year, month = str(unique_months[top]).split('-')
+        return f"{calendar.month_name[int(month)]} {year}"  # e.g., "August 2024"
     else:
         return "Mixed Months"
 
+
+RULES_PATH = Path('rules/categories.yml')
+
+# Filter for January-related files and files from the recent incorporation batch
+JANUARY_KEYWORDS = ['2025-01-', 'Invoice(5830_4013)', 'Screenshot 2025-08-02 at 17.29', 
+                    'Screenshot 2025-08-02 at 17.37', 'Screenshot 2025-08-02 at 17.55',
+                    'invoice-monitor', 'Stamp receipt', 'Visa Stamp', 'houmu kyoku', 'houmy kyoku']
+# One alternation scans each name once instead of one substring search per keyword
+JANUARY_NAME_RE = re.compile('|'.join(map(re.escape, JANUARY_KEYWORDS)))
+
+logger = logging.getLogger(__name__)
+
+# Per-process components, built once by init_worker
+_parser = None
+_classifier = None
+_cache = None
+
+
+def init_worker(version):
+    """Load the shared parser and category rules once per worker process.
+    
+    Workers only read the parse cache; new entries go back to the main
+    process, which is the single writer.
+    """
+    global _parser, _classifier, _cache
+    _parser = get_parser()
+    _classifier = get_classifier(RULES_PATH)
+    _cache = ParseCache(version=version, read_only=True)
+
+
+def process_one(json_path):
+    """
+    Parse, classify and review-check one OCR JSON file.
+    
+    Args:
+        json_path: Path to the OCR JSON file
+        
+    Returns:
+        Tuple of (transaction dict or None, ReviewItem or None, (level, message) log records,
+        (text, fields) to add to the parse cache or None)
+    """
+    parser = _parser
+    messages = []
+    fresh = None
+    try:
+        # One read of the whole file; the pool already overlaps reads with other workers' parsing
+        raw = Path(json_path).read_bytes()
+        # Blank OCR results are skipped without decoding them
+        if has_empty_full_text(raw):
+            return None, None, messages, fresh
+        data = orjson.loads(raw)
+        
+        text = data.get('full_text', '')
+        if not text:
+            return None, None, messages, fresh
+            
+        # Parse and classify, unless an earlier run already did for this text
+        fields = _cache.get(text)
+        if fields is None:
+            fields = parse_fields(text, parser, _classifier)
+            fresh = (text, fields)
+        date, amount = fields['date'], fields['amount']
+        category, category_confidence = fields['category'], fields['category_confidence']
+        
+        # Get OCR confidence from the data
+        ocr_confidence = data.get('confidence', 0.8)
+        
+        # Extract clean file name from JSON file path BEFORE creating review queue
+        original_file_name = Path(json_path).stem
+        # Remove the hash suffix (everything after last underscore)
+        base, sep, _ = original_file_name.rpartition('_')
+        clean_file_path = (base if sep else original_file_name) + '.pdf'
+        
+        # Add to review queue with CLEAN filename (this will check confidence thresholds)
+        review_queue = ReviewQueue()
+        if review_queue.add_from_extraction(
+            file_path=clean_file_path,
+            date=date,
+            amount=amount,
+            category=category,
+            category_confidence=category_confidence,
+            ocr_confidence=ocr_confidence,
+            raw_text=text
+        ):
+            return None, review_queue.items[0], messages, fresh
+        
+        # Not flagged for review, so date and amount are both present. High-value
+        # transactions are left out of the transactions without being queued.
+        if parser.should_flag_for_high_value_review(text, amount, date, category, category_confidence):
+            return None, None, messages, fresh
+        
+        # Generate CLEAN description using category
+        description = fields['description']
+        
+        # Use the same clean filename we created above
+        transaction = {
+            'file_name': clean_file_path,
+            'date': date,
+            'amount': amount,
+            'category': category,
+            'description': description
+        }
+        return transaction, None, messages, fresh
+        
+    except Exception as e:
+        messages.append((logging.ERROR, f"Error processing {json_path}: {e}"))
+    
+    return None, None, messages, fresh
+
+
 def main():
+    # Per-file errors are logged; the summary below is printed
+    logging.basicConfig(level=logging.WARNING, format='%(message)s', handlers=[logging.StreamHandler(sys.stdout)])
+    
     # Initialize components
-    parser = JapaneseReceiptParser()
-    classifier = CategoryClassifier(Path('rules/categories.yml'))
     review_queue = ReviewQueue()
     
     # Read existing OCR results and regenerate with clean descriptions
@@ -68,94 +193,31 @@ def main():
     ocr_dir_path = os.getenv('OCR_DIR', 'batch-results/ocr_json')
     ocr_dir = Path(ocr_dir_path)
     
-    # Get all files from January 2025 incorporation processing (most recent OCR files)
-    all_files = sorted(ocr_dir.glob('*.json'), key=lambda x: x.stat().st_mtime, reverse=True)
-    
-    # Filter for January-related files and files from the recent incorporation batch
-    january_keywords = ['2025-01-', 'Invoice(5830_4013)', 'Screenshot 2025-08-02 at 17.29', 
-                       'Screenshot 2025-08-02 at 17.37', 'Screenshot 2025-08-02 at 17.55',
-                       'invoice-monitor', 'Stamp receipt', 'Visa Stamp', 'houmu kyoku', 'houmy kyoku']
-    
-    january_files = []
-    for f in all_files:
-        if any(keyword in f.name for keyword in january_keywords):
-            january_files.append(f)
+    # One directory listing; only the matching entries are stat'ed for the sort
+    entries = [e for e in os.scandir(ocr_dir)
+               if e.name.endswith('.json') and JANUARY_NAME_RE.search(e.name)]
+    # Most recent OCR files first (January 2025 incorporation processing); DirEntry caches its stat result
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    january_files = [e.path for e in entries]
     
     print(f"Processing {len(january_files)} January 2025 incorporation OCR files...")
     
-    for json_file in january_files:
-        try:
-            with open(json_file) as f:
-                data = json.load(f)
-            
-            text = data.get('full_text', '')
-            if not text:
-                continue
-                
-            # Parse data
-            date = parser.parse_date(text)
-            amount = parser.parse_amount(text)
-            vendor = parser.parse_vendor(text)
-            
-            # Classify category first
-            category, category_confidence = classifier.classify(vendor, "", text)
-            
-            # Get OCR confidence from the data
-            ocr_confidence = data.get('confidence', 0.8)
-            
-            # Extract clean file name from JSON file path BEFORE creating review queue
-            original_file_name = Path(json_file).stem
-            # Remove the hash suffix (everything after last underscore)
-            if '_' in original_file_name:
-                clean_file_path = '_'.join(original_file_name.split('_')[:-1]) + '.pdf'
-            else:
-                clean_file_path = original_file_name + '.pdf'
-            
-            # Add to review queue with CLEAN filename (this will check confidence thresholds)
-            review_queue.add_from_extraction(
-                file_path=clean_file_path,
-                date=date,
-                amount=amount,
-                category=category,
-                category_confidence=category_confidence,
-                ocr_confidence=ocr_confidence,
-                raw_text=text
-            )
-            
-            # Only add to transactions if we have valid date and amount AND it's not flagged for review
-            if date and amount:
-                # Check if this item was flagged for review
-                current_review_count = len(review_queue.items)
-                
-                # Temporarily check if this would be flagged for review (including high-value check)
-                needs_review = review_queue.should_review(
-                    date=date,
-                    amount=amount,
-                    category=category,
-                    category_confidence=category_confidence,
-                    ocr_confidence=ocr_confidence,
-                    file_path=clean_file_path,
-                    ocr_text=text,
-                    parser=parser
-                )
-                
-                if not needs_review:
-                    # Generate CLEAN description using category
-                    description = parser.extract_description_context(text, vendor, amount, category)
-                    
-                    # Use the same clean filename we created above
-                    transaction = {
-                        'file_name': clean_file_path,
-                        'date': date,
-                        'amount': amount,
-                        'category': category,
-                        'description': description
-                    }
-                    transactions.append(transaction)
-            
-        except Exception as e:
-            print(f"Error processing {json_file}: {e}")
-            continue
+    # Parsing is CPU-bound and independent per file, so spread it over processes
+    workers = int(os.getenv('PARSE_WORKERS', os.cpu_count() or 1))
+    chunksize = max(1, len(january_files) // (workers * 4))
+    version = cache_version(RULES_PATH)
+    cache = ParseCache(version=version)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(version,)) as pool:
+        for transaction, review_item, messages, fresh in pool.map(process_one, january_files, chunksize=chunksize):
+            for level, message in messages:
+                logger.log(level, message)
+            if review_item:
+                review_queue.items.append(review_item)
+            if transaction:
+                transactions.append(transaction)
+            if fresh:
+                cache.put(*fresh)
+    cache.close()
     
     # Force filename to be January 2025
     filename = "transactions_January_2025.xlsx"
@@ -165,6 +227,7 @@ def main():
     output_dir_path = os.getenv('OUTPUT_DIR', '.')
     output_dir = Path(output_dir_path)
     excel_path = output_dir / filename
+    from export import ExcelExporter  # openpyxl is only needed once results are ready
     exporter = ExcelExporter(excel_path)
     exporter.export_transactions(transactions, review_queue.items, include_summary=True)
     
@@ -1,35 +1,229 @@
 #!/usr/bin/env python3
 """Regenerate Excel with clean descriptions - MARCH 2025 ONLY."""
 import sys
-import json
 import os
+import argparse
 from pathlib import Path
-from datetime import datetime
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import logging
 
+import orjson
+
 sys.path.append('src')
-from parse import JapaneseReceiptParser
-from classify import CategoryClassifier
+from parse import get_parser, parse_iso_date
+from classify import get_classifier
 from review import ReviewQueue, ReviewItem
-from export import ExcelExporter
+from transaction import Transaction
+from parse_cache import ParseCache, cache_version, parse_fields
+
+logger = logging.getLogger(__name__)
+
+# DEBUG: Source files to trace through the March filter
+DEBUG_FILES = frozenset(['Meishi.pdf', 'Starbucks refill.pdf', 'Slimblade.pdf', 'Suica recharge March 21.pdf'])
+
+RULES_PATH = 'rules/categories.yml'
+
+# Review reasons by bit position in the reason mask
+REVIEW_REASONS = (
+    "no date found - needs manual date entry",
+    "missing amount",
+    "low category confidence",
+    "low OCR quality",
+    "unknown category",
+)
+
+# Per-process components, built once by init_worker
+_parser = None
+_classifier = None
+_cache = None
+_verbose = False
+
+
+def init_worker(version, verbose=False):
+    """Load the shared parser and category rules once per worker process.
+    
+    Workers only read the parse cache; new entries go back to the main
+    process, which is the single writer.
+    """
+    global _parser, _classifier, _cache, _verbose
+    _verbose = verbose
+    _parser = get_parser()
+    _classifier = get_classifier(RULES_PATH)
+    _cache = ParseCache(version=version, read_only=True)
+
+
+@lru_cache(maxsize=1 << len(REVIEW_REASONS))
+def review_reason_text(mask):
+    """Joined review reason for a REVIEW_REASONS bitmask - built once per combination."""
+    reasons = [reason for bit, reason in enumerate(REVIEW_REASONS) if mask >> bit & 1]
+    return "; ".join(reasons) if reasons else "unknown issue"
+
+
+def process_one(ocr_path):
+    """
+    Parse, classify and filter one OCR JSON file for March 2025.
+    
+    Args:
+        ocr_path: Path to the OCR JSON file
+        
+    Returns:
+        Tuple of (Transaction or None, ReviewItem or None,
+        skipped month key or None, (level, message) log records,
+        (text, fields) to add to the parse cache or None)
+    """
+    parser = _parser
+    review_queue = ReviewQueue()
+    ocr_file = Path(ocr_path)
+    skipped_month = None
+    messages = []
+    fresh = None
+    try:
+        # One read of the whole file; the pool already overlaps reads with other workers' parsing
+        ocr_data = orjson.loads(ocr_file.read_bytes())
+        
+        text = ocr_data['full_text']
+        ocr_confidence = ocr_data.get('confidence', 0.0)
+        file_path = ocr_data['file_path']
+        
+        # DEBUG: Track specific missing files (by source PDF name; JSON names carry a hash suffix)
+        is_debug_file = _verbose and Path(file_path).name in DEBUG_FILES
+        if is_debug_file:
+            messages.append((logging.DEBUG, f"\n🔍 DEBUG: Processing {ocr_file.name}"))
+        
+        # Extract and classify data, unless an earlier run already did for this text
+        fields = _cache.get(text)
+        if fields is None:
+            fields = parse_fields(text, parser, _classifier)
+            fresh = (text, fields)
+        date, amount, vendor = fields['date'], fields['amount'], fields['vendor']
+        category, category_confidence = fields['category'], fields['category_confidence']
+        
+        # Check if this is March 2025
+        is_march_2025 = False
+        is_no_date_review = False
+        
+        if date:
+            try:
+                year, month, _ = parse_iso_date(date)
+                if year == 2025 and month == 3:
+                    is_march_2025 = True
+                else:
+                    # Track what months we're skipping
+                    skipped_month = f"{year}-{month:02d}"
+            except ValueError:
+                skipped_month = 'unknown'
+        else:
+            # CRITICAL FIX: No date found - this should go to REVIEW, not be skipped!
+            is_no_date_review = True
+            skipped_month = 'no_date_review'
+            if _verbose:
+                messages.append((logging.DEBUG, f"⚠️  No date found in {file_path} - sending to review instead of skipping"))
+        
+        # Process March 2025 receipts OR receipts with no date (for review)
+        if not is_march_2025 and not is_no_date_review:
+            if is_debug_file:
+                messages.append((logging.DEBUG, f"🔍 DEBUG: {ocr_file.name} - NOT March 2025 (date: {date})"))
+            return None, None, skipped_month, messages, fresh
+        
+        if is_debug_file:
+            if is_march_2025:
+                messages.append((logging.DEBUG, f"🔍 DEBUG: {ocr_file.name} - IS March 2025! Date: {date}, Amount: ¥{amount}, Category: {category}"))
+            elif is_no_date_review:
+                messages.append((logging.DEBUG, f"🔍 DEBUG: {ocr_file.name} - NO DATE - sending to review! Amount: ¥{amount}, Category: {category}"))
+            
+        # Create clean filename from original path
+        original_filename = Path(file_path).name
+        clean_file_path = original_filename
+        
+        # Check if needs review (including high-value transaction check)
+        # CRITICAL: No-date receipts automatically go to review
+        if is_no_date_review:
+            needs_review = True
+        else:
+            needs_review = review_queue.should_review(
+                date=date,
+                amount=amount,
+                category=category,
+                category_confidence=category_confidence,
+                ocr_confidence=ocr_confidence,
+                file_path=clean_file_path,
+                ocr_text=text,
+                parser=parser
+            )
+        
+        if not needs_review:
+            if is_debug_file:
+                messages.append((logging.DEBUG, f"🔍 DEBUG: {ocr_file.name} - CLEAN TRANSACTION (not flagged for review)"))
+            
+            # Generate CLEAN description using category
+            description = fields['description']
+            
+            # Use the same clean filename we created above
+            transaction = Transaction(
+                date=date,
+                amount=amount,
+                category=category,
+                description=description,
+                vendor=vendor,
+                filename=clean_file_path,
+                category_confidence=category_confidence,
+                ocr_confidence=ocr_confidence
+            )
+            return transaction, None, skipped_month, messages, fresh
+        else:
+            if is_debug_file:
+                messages.append((logging.DEBUG, f"🔍 DEBUG: {ocr_file.name} - SENT TO REVIEW (needs manual review)"))
+            
+            # Add to review queue with reason - one bit per REVIEW_REASONS entry
+            # (only no-date receipts get here without a date)
+            reason_mask = (
+                (not date)
+                | (not amount) << 1
+                | (category_confidence < 0.3) << 2
+                | (ocr_confidence < 0.3) << 3
+                | (category == "Other") << 4
+            )
+            review_reason = review_reason_text(reason_mask)
+            
+            review_item = ReviewItem(
+                file_path=clean_file_path,
+                reason=review_reason,
+                suggested_date=date,
+                suggested_amount=amount,
+                suggested_category=category,
+                raw_snippet=text[:200] + "..." if len(text) > 200 else text,
+                confidence_scores={
+                    'category': category_confidence,
+                    'ocr': ocr_confidence
+                }
+            )
+            return None, review_item, skipped_month, messages, fresh
+            
+    except Exception as e:
+        messages.append((logging.ERROR, f"Error processing {ocr_file}: {e}"))
+    
+    return None, None, skipped_month, messages, fresh
+
 
 def main():
     # Get directories from environment variables or use defaults
     ocr_dir = os.environ.get('OCR_DIR', './ocr_json')
     output_dir = os.environ.get('OUTPUT_DIR', './out')
     
-    # Setup logging
-    logging.basicConfig(level=logging.INFO)
-    logger = logging.getLogger(__name__)
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--verbose', action='store_true', help='Log per-file details and debug-file traces, not just errors')
+    args = arg_parser.parse_args()
     
-    # Initialize components
-    parser = JapaneseReceiptParser()
-    classifier = CategoryClassifier('rules/categories.yml')
-    review_queue = ReviewQueue()
+    # Setup logging - per-file lines are DEBUG (shown with --verbose); the summary below is printed
+    logging.basicConfig(level=logging.WARNING, format='%(message)s', handlers=[logging.StreamHandler(sys.stdout)])
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
     
-    # Find all OCR JSON files
-    ocr_files = list(Path(ocr_dir).glob('*.json'))
+    # Find all OCR JSON files - scandir entries answer is_file() from the listing
+    ocr_files = [e.path for e in os.scandir(ocr_dir)
+                 if e.name.endswith('.json') and e.is_file()]
     
     print(f"Processing {len(ocr_files)} OCR files...")
     
@@ -38,141 +232,24 @@ def main():
     review_items = []
     skipped_months = Counter()
     
-    for ocr_file in ocr_files:
-        try:
-            with open(ocr_file, 'r', encoding='utf-8') as f:
-                ocr_data = json.load(f)
-            
-            text = ocr_data['full_text']
-            ocr_confidence = ocr_data.get('confidence', 0.0)
-            file_path = ocr_data['file_path']
-            
-            # DEBUG: Track specific missing files
-            debug_files = ['Meishi.pdf', 'Starbucks refill.pdf', 'Slimblade.pdf', 'Suica recharge March 21.pdf']
-            is_debug_file = any(debug_name in str(ocr_file) for debug_name in debug_files)
-            if is_debug_file:
-                print(f"\n🔍 DEBUG: Processing {ocr_file.name}")
-            
-            # Extract data
-            date = parser.parse_date(text)
-            amount = parser.parse_amount(text)
-            vendor = parser.parse_vendor(text)
-            
-            # Classify category
-            category, category_confidence = classifier.classify(vendor, "", text)
-            
-            # Check if this is March 2025
-            is_march_2025 = False
-            is_no_date_review = False
-            parsed_date = None
-            
-            if date:
-                try:
-                    parsed_date = datetime.strptime(date, '%Y-%m-%d')
-                    if parsed_date.year == 2025 and parsed_date.month == 3:
-                        is_march_2025 = True
-                    else:
-                        # Track what months we're skipping
-                        month_key = f"{parsed_date.year}-{parsed_date.month:02d}"
-                        skipped_months[month_key] += 1
-                except ValueError:
-                    skipped_months['unknown'] += 1
-            else:
-                # CRITICAL FIX: No date found - this should go to REVIEW, not be skipped!
-                is_no_date_review = True
-                skipped_months['no_date_review'] += 1
-                print(f"⚠️  No date found in {file_path} - sending to review instead of skipping")
-            
-            # Process March 2025 receipts OR receipts with no date (for review)
-            if not is_march_2025 and not is_no_date_review:
-                if is_debug_file:
-                    print(f"🔍 DEBUG: {ocr_file.name} - NOT March 2025 (date: {date})")
-                continue
-            
-            if is_debug_file:
-                if is_march_2025:
-                    print(f"🔍 DEBUG: {ocr_file.name} - IS March 2025! Date: {date}, Amount: ¥{amount}, Category: {category}")
-                elif is_no_date_review:
-                    print(f"🔍 DEBUG: {ocr_file.name} - NO DATE - sending to review! Amount: ¥{amount}, Category: {category}")
-                
-            # Create clean filename from original path
-            original_filename = Path(file_path).name
-            clean_file_path = original_filename
-            
-            # Check if needs review (including high-value transaction check)
-            # CRITICAL: No-date receipts automatically go to review
-            if is_no_date_review:
-                needs_review = True
-            else:
-                needs_review = review_queue.should_review(
-                    date=date,
-                    amount=amount,
-                    category=category,
-                    category_confidence=category_confidence,
-                    ocr_confidence=ocr_confidence,
-                    file_path=clean_file_path,
-                    ocr_text=text,
-                    parser=parser
-                )
-            
-            if not needs_review:
-                if is_debug_file:
-                    print(f"🔍 DEBUG: {ocr_file.name} - CLEAN TRANSACTION (not flagged for review)")
-                
-                # Generate CLEAN description using category
-                description = parser.extract_description_context(text, vendor, amount, category)
-                
-                # Use the same clean filename we created above
-                transaction = {
-                    'date': date,
-                    'amount': amount,
-                    'category': category,
-                    'description': description,
-                    'vendor': vendor,
-                    'filename': clean_file_path,
-                    'category_confidence': category_confidence,
-                    'ocr_confidence': ocr_confidence
-                }
+    # Parsing is CPU-bound and independent per file, so spread it over processes
+    workers = int(os.getenv('PARSE_WORKERS', os.cpu_count() or 1))
+    chunksize = max(1, len(ocr_files) // (workers * 4))
+    version = cache_version(RULES_PATH)
+    cache = ParseCache(version=version)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(version, args.verbose)) as pool:
+        for transaction, review_item, skipped_month, messages, fresh in pool.map(process_one, ocr_files, chunksize=chunksize):
+            for level, message in messages:
+                logger.log(level, message)
+            if skipped_month:
+                skipped_months[skipped_month] += 1
+            if transaction:
                 clean_transactions.append(transaction)
-            else:
-                if is_debug_file:
-                    print(f"🔍 DEBUG: {ocr_file.name} - SENT TO REVIEW (needs manual review)")
-                
-                # Add to review queue with reason - generate reason manually
-                reasons = []
-                if not date:
-                    if is_no_date_review:
-                        reasons.append("no date found - needs manual date entry")
-                    else:
-                        reasons.append("missing date")
-                if not amount:
-                    reasons.append("missing amount")
-                if category_confidence < 0.3:
-                    reasons.append("low category confidence")
-                if ocr_confidence < 0.3:
-                    reasons.append("low OCR quality")
-                if category == "Other":
-                    reasons.append("unknown category")
-                
-                review_reason = "; ".join(reasons) if reasons else "unknown issue"
-                
-                review_item = ReviewItem(
-                    file_path=clean_file_path,
-                    reason=review_reason,
-                    suggested_date=date,
-                    suggested_amount=amount,
-                    suggested_category=category,
-                    raw_snippet=text[:200] + "..." if len(text) > 200 else text,
-                    confidence_scores={
-                        'category': category_confidence,
-                        'ocr': ocr_confidence
-                    }
-                )
+            if review_item:
                 review_items.append(review_item)
-                
-        except Exception as e:
-            logger.error(f"Error processing {ocr_file}: {e}")
-            continue
+            if fresh:
+                cache.put(*fresh)
+    cache.close()
     
     # Filter stats
     march_count = len(clean_transactions) + len(review_items)
@@ -190,10 +267,11 @@ def main():
         return
     
     # Sort transactions by date
-    clean_transactions.sort(key=lambda x: x['date'] if x['date'] else '1900-01-01')
+    clean_transactions.sort(key=lambda x: x.date if x.date else '1900-01-01')
     
     # Generate Excel
     output_path = Path(output_dir) / 'transactions_March_2025.xlsx'
+    from export import ExcelExporter  # openpyxl is only needed once results are ready
     exporter = ExcelExporter(output_path)
     exporter.export_transactions(
         clean_transactions,
@@ -217,8 +295,8 @@ def main():
         print()
         print("Sample descriptions:")
         for txn in clean_transactions[:5]:
-            amount_str = f"¥{txn['amount']}" if txn['amount'] else "¥???"
-            print(f"  {txn['date']}: {amount_str} - {txn['description']} ({txn['category']})")
+            amount_str = f"¥{txn.amount}" if txn.amount else "¥???"
+            print(f"  {txn.date}: {amount_str} - {txn.description} ({txn.category})")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Regenerate Excel with clean descriptions for one or more months in a single pass."""
+import sys
+import os
+import argparse
+import calendar
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import logging
+
+import orjson
+
+sys.path.append('src')
+from parse import get_parser, parse_iso_date
+from classify import get_classifier
+from review import ReviewQueue, ReviewItem
+from transaction import Transaction
+from ocr_json import iter_ocr_pack
+from parse_cache import ParseCache, cache_version, parse_fields
+
+logger = logging.getLogger(__name__)
+
+RULES_PATH = 'rules/categories.yml'
+
+# Sheet title for receipts without a date - they cannot be filed under a month
+NO_DATE_TITLE = "No Date"
+
+# Per-process components, built once by init_worker
+_parser = None
+_classifier = None
+_cache = None
+_months = frozenset()
+_verbose = False
+
+
+def init_worker(version, months, verbose=False):
+    """Load the shared parser and category rules once per worker process.
+    
+    Workers only read the parse cache; new entries go back to the main
+    process, which is the single writer.
+    """
+    global _parser, _classifier, _cache, _months, _verbose
+    _months = months
+    _verbose = verbose
+    _parser = get_parser()
+    _classifier = get_classifier(RULES_PATH)
+    _cache = ParseCache(version=version, read_only=True)
+
+
+def process_one(ocr_path):
+    """
+    Parse, classify and bucket one OCR JSON file by month.
+    
+    Args:
+        ocr_path: Path to the OCR JSON file
+    
+    Returns:
+        Same tuple as process_record
+    """
+    try:
+        ocr_data = orjson.loads(Path(ocr_path).read_bytes())
+    except Exception as e:
+        return None, None, None, [(logging.ERROR, f"Error processing {ocr_path}: {e}")], None
+    return process_record(ocr_data, ocr_path)
+
+
+def process_record(ocr_data, source):
+    """
+    Parse, classify and bucket one decoded OCR record by month.
+    
+    Args:
+        ocr_data: OCR JSON contents (or a pack record) with full_text,
+            file_path and optionally confidence
+        source: OCR file path or pack record name, for error messages
+    
+    Returns:
+        Tuple of ((year, month) key, or None for undated receipts,
+        Transaction or None, ReviewItem or None, (level, message) log
+        records, (text, fields) to add to the parse cache or None). Both the
+        transaction and review item are None for months that were not requested.
+    """
+    month_key = None
+    messages = []
+    fresh = None
+    try:
+        text = ocr_data['full_text']
+        ocr_confidence = ocr_data.get('confidence', 0.0)
+        file_path = ocr_data['file_path']
+        
+        # Extract and classify data, unless an earlier run already did for this text
+        fields = _cache.get(text)
+        if fields is None:
+            fields = parse_fields(text, _parser, _classifier)
+            fresh = (text, fields)
+        date, amount, vendor = fields['date'], fields['amount'], fields['vendor']
+        category, category_confidence = fields['category'], fields['category_confidence']
+        
+        original_filename = Path(file_path).name
+        
+        if date:
+            try:
+                year, month, _ = parse_iso_date(date)
+            except ValueError:
+                messages.append((logging.WARNING, f"Unparseable date {date!r} in {original_filename}"))
+                return None, None, None, messages, fresh
+            month_key = (year, month)
+            if month_key not in _months:
+                return month_key, None, None, messages, fresh
+        
+        # CRITICAL: No-date receipts fall through and go to review instead of being skipped
+        needs_review, review_reason = ReviewQueue().evaluate(
+            date=date,
+            amount=amount,
+            category=category,
+            category_confidence=category_confidence,
+            ocr_confidence=ocr_confidence,
+            file_path=original_filename,
+            ocr_text=text,
+            parser=_parser
+        )
+        
+        if needs_review:
+            review_item = ReviewItem(
+                file_path=original_filename,
+                reason=review_reason or "unknown issue",
+                suggested_date=date,
+                suggested_amount=amount,
+                suggested_category=category,
+                raw_snippet=text[:200] + "..." if len(text) > 200 else text,
+                confidence_scores={
+                    'category': category_confidence,
+                    'ocr': ocr_confidence
+                }
+            )
+            if _verbose:
+                messages.append((logging.DEBUG, f"Review: {original_filename} - {review_reason}"))
+            return month_key, None, review_item, messages, fresh
+        
+        transaction = Transaction(
+            date=date,
+            amount=amount,
+            category=category,
+            description=fields['description'],
+            vendor=vendor,
+            filename=original_filename,
+            category_confidence=category_confidence,
+            ocr_confidence=ocr_confidence
+        )
+        if _verbose:
+            messages.append((logging.DEBUG, f"Added: {original_filename} - {date} - ¥{amount} - {category}"))
+        return month_key, transaction, None, messages, fresh
+    
+    except Exception as e:
+        messages.append((logging.ERROR, f"Error processing {source}: {e}"))
+    
+    return month_key, None, None, messages, fresh
+
+
+def month_title(month_key):
+    """Sheet title such as "March 2025" for a (year, month) key."""
+    year, month = month_key
+    return f"{calendar.month_name[month]} {year}"
+
+
+def main():
+    # Get directories from environment variables or use defaults
+    ocr_dir = os.environ.get('OCR_DIR', './ocr_json')
+    output_dir = os.environ.get('OUTPUT_DIR', './out')
+    
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--year', type=int, default=2025, help='Year to export (default: 2025)')
+    arg_parser.add_argument('--month', type=int, nargs='+', choices=range(1, 13), metavar='MONTH',
+                            help='Month number(s) to export (default: all 12)')
+    arg_parser.add_argument('--pack', type=Path,
+                            help='Read OCR records from a pack built by pack_ocr_json.py instead of OCR_DIR')
+    arg_parser.add_argument('--verbose', action='store_true', help='Log every processed file, not just errors')
+    args = arg_parser.parse_args()
+    
+    # Per-file lines are logged (DEBUG with --verbose); the summary below is printed
+    logging.basicConfig(level=logging.WARNING, format='%(message)s', handlers=[logging.StreamHandler(sys.stdout)])
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+    
+    months = sorted({(args.year, month) for month in (args.month or range(1, 13))})
+    
+    if args.pack:
+        # One sequential read of the pack instead of one open per receipt
+        records = list(iter_ocr_pack(args.pack))
+        work = (process_record, records, [record['name'] for record in records])
+    else:
+        # One listing of the OCR directory serves every requested month
+        ocr_files = [e.path for e in os.scandir(ocr_dir)
+                     if e.name.endswith('.json') and e.is_file()]
+        work = (process_one, ocr_files)
+    file_count = len(work[1])
+    
+    print(f"Processing {file_count} OCR files for {len(months)} month(s) of {args.year}...")
+    
+    # (year, month) -> (transactions, review_items); None collects undated receipts
+    batches = {key: ([], []) for key in months}
+    batches[None] = ([], [])
+    other_months = 0
+    
+    # Parsing is CPU-bound and independent per file, so spread it over processes
+    workers = int(os.getenv('PARSE_WORKERS', os.cpu_count() or 1))
+    chunksize = max(1, file_count // (workers * 4))
+    version = cache_version(RULES_PATH)
+    cache = ParseCache(version=version)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(version, frozenset(months), args.verbose)) as pool:
+        for month_key, transaction, review_item, messages, fresh in pool.map(*work, chunksize=chunksize):
+            for level, message in messages:
+                logger.log(level, message)
+            if transaction or review_item:
+                transactions, review_items = batches[month_key]
+                if transaction:
+                    transactions.append(transaction)
+                if review_item:
+                    review_items.append(review_item)
+            elif month_key is not None and month_key not in batches:
+                other_months += 1
+            if fresh:
+                cache.put(*fresh)
+    cache.close()
+    
+    undated_reviews = batches.pop(None)[1]
+    
+    print(f"Filtered to {len(months)} month(s):")
+    for key, (transactions, review_items) in batches.items():
+        print(f"  {month_title(key)}: {len(transactions)} transactions, {len(review_items)} for review")
+    print(f"  ⚠️  No date (sent to review): {len(undated_reviews)}")
+    print(f"  ⏭️  Other months skipped: {other_months}")
+    
+    # Only export months that have something in them
+    sheets = {}
+    for key, (transactions, review_items) in batches.items():
+        if transactions or review_items:
+            transactions.sort(key=lambda x: x.date)
+            sheets[month_title(key)] = (transactions, review_items)
+    
+    if not sheets and not undated_reviews:
+        print("❌ No transactions found for the requested months!")
+        return
+    
+    if undated_reviews:
+        sheets[NO_DATE_TITLE] = ([], undated_reviews)
+    
+    # A single month keeps the per-month scripts' file name
+    if len(months) == 1:
+        output_name = f"transactions_{month_title(months[0]).replace(' ', '_')}.xlsx"
+    else:
+        output_name = f"transactions_{args.year}.xlsx"
+    output_path = Path(output_dir) / output_name
+    
+    from export import ExcelExporter  # openpyxl is only needed once results are ready
+    ExcelExporter(output_path).export_many(sheets, include_summary=True)
+    
+    total_transactions = sum(len(transactions) for transactions, _ in sheets.values())
+    total_reviews = sum(len(review_items) for _, review_items in sheets.values())
+    print(f"✅ Generated {total_transactions} clean transactions on {len(sheets)} sheet(s) in {output_path}")
+    if total_reviews:
+        print(f"📋 {total_reviews} items sent to manual review")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Setup script for Japanese Receipt OCR tool."""
 
+import os
 from setuptools import setup, find_packages
 from pathlib import Path
 
@@ -13,6 +14,20 @@ requirements = []
 if requirements_path.exists():
     requirements = requirements_path.read_text().strip().split('\n')
 
+# Optional: compile the parser to a C extension with mypyc
+#   RECEIPTS_MYPYC=1 python setup.py build_ext --inplace
+# Scripts and the CLI keep importing `parse` and pick up the compiled module.
+ext_modules = []
+if os.environ.get('RECEIPTS_MYPYC') == '1':
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        print("mypyc not installed. Run: pip install mypy")
+        raise
+    # Build it as top-level `parse` (matching package_dir) rather than `src.parse`
+    os.environ.setdefault('MYPYPATH', 'src')
+    ext_modules = mypycify(['--explicit-package-bases', '--ignore-missing-imports', 'src/parse.py'])
+
 setup(
     name="japanese-receipt-ocr",
     version="1.0.0",
@@ -24,6 +39,7 @@ setup(
     url="",
     packages=find_packages(),
     package_dir={"": "src"},
+    ext_modules=ext_modules,
     install_requires=requirements,
     entry_points={
         'console_scripts': [
@@ -9,6 +9,7 @@ from .parse import JapaneseReceiptParser
 from .classify import CategoryClassifier
 from .review import ReviewQueue, ReviewItem
 from .export import ExcelExporter
+from .transaction import Transaction
 
 __all__ = [
     'OCRProcessor',
@@ -17,4 +18,5 @@ __all__ = [
     'ReviewQueue',
     'ReviewItem',
     'ExcelExporter',
+    'Transaction',
 ]
\ No newline at end of file
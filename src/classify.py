@@ -1,14 +1,257 @@
 """Category classification using rules and heuristics."""
 
 import yaml
+import heapq
 import logging
 import re
-from typing import Dict, List, Optional, Tuple
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple, Union
 from pathlib import Path
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
+
+# LibYAML parser when PyYAML was built with it; the pure-Python one otherwise
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    from .parse import KeywordMatcher
+except ImportError:
+    from parse import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever classify() output changes (heuristics, keyword tables, fuzzy
+# thresholds) so persisted parse caches drop their stored categories
+CLASSIFIER_VERSION = '1'
+
+# Heuristic keyword sets matched against the lowercased OCR text. They are all
+# found in one sweep per call (see CategoryClassifier._apply_heuristics), so
+# each check is a frozenset test against the (usually few) keywords found.
+
+# Transportation heuristics (but be careful about JR in building addresses)
+TRANSPORT_INDICATORS = frozenset({'地下鉄', 'タクシー', '高速', 'suica', 'pasmo', '新幹線', 'バス', '電車'})
+JR_TRANSPORT_WORDS = frozenset({'乗車', '切符', '運賃', '電車代', '駅'})
+
+# Communications heuristics - but be careful not to trigger on restaurant contact info
+COMM_INDICATORS = frozenset({'ntt', 'kddi', 'ソフトバンク', 'wi-fi', 'インターネット', '電話', '通信'})
+RESTAURANT_CONTEXT_INDICATORS = frozenset({'料理', 'レストラン', '居酒屋', '食堂', 'カフェ', '喫茶', 'rice', 'curry', 'ライス', 'カレー', '店'})
+
+# IKEA classification - categorize based on actual items
+IKEA_TEXT_INDICATORS = frozenset({'ikea', 'イケア', 'ikea渋谷', 'ikea shibuya'})
+# IKEA food items and restaurant indicators
+IKEA_FOOD_INDICATORS = frozenset({
+    'プラントボール', 'plant ball', 'ミートボール', 'meatball',
+    'フード', 'food', 'レストラン', 'restaurant', 'カフェ', 'cafe',
+    'ホットドッグ', 'hot dog', 'ソフトクリーム', 'soft cream',
+    'フィッシュ&チップス', 'fish&chips', 'fish & chips', 'フィッシュアンドチップス'
+})
+# IKEA office/furniture items
+IKEA_OFFICE_INDICATORS = frozenset({
+    '靴r', '靴R', '靴ラック', 'shoe rack', 'grejig', 'グレイグ',
+    'デスク', 'desk', 'チェア', 'chair', '収納', 'storage',
+    'ファイル', 'file', 'ボックス', 'box', 'シェルフ', 'shelf'
+})
+
+# Business meeting vs personal consumption at coffee shops
+MEETING_WORDS = frozenset({'会議', '打合せ', 'ミーティング', '商談'})
+
+# Restaurant/Bar heuristics - restaurants default to entertainment, light refreshments to meetings
+RESTAURANT_INDICATORS = frozenset({'居酒屋', 'レストラン', '食事', '飲食', '鍋', '火鍋', '店', 'お食事代', '料理', 'rice', 'curry', 'ライス', 'カレー', 'gaprao', 'マヤ', 'ネパール', 'インド', 'bagel', 'cafe', 'カフェ', 'ベーグル',
+                                   # Enhanced food-related characters and terms that indicate restaurants
+                                   '牛', '肉', '焼肉', '焼き鳥', '鳥', '豚', '魚', '海鮮', '寿司', '刺身', '天ぷら', 
+                                   '定食', '弁当', '丼', '麺', 'ラーメン', 'うどん', 'そば', '串焼'})
+LIGHT_FOOD_INDICATORS = frozenset({'弁当', 'ベント', 'サンドイッチ', 'おにぎり', 'パン', 'ドリンク', '飲み物', 'コーヒー', 'お茶'})
+MEETING_CONTEXT_INDICATORS = frozenset({'会議', '打合せ', 'ミーティング', '商談', '会議室'})
+# Additional strong restaurant/food indicators
+FOOD_INDICATORS = frozenset({'料理', 'rice', 'curry', 'ライス', 'カレー', 'gaprao', 'マヤ', 'ネパール', 'インド', 'タイ', 'thai', 'bagel', 'cafe', 'カフェ', 'ベーグル', '牛', '肉', '焼肉', '焼き鳥', '鳥', '豚', '魚', '海鮮', '寿司', '刺身', '天ぷら', '定食', '弁当', '丼', '麺', 'ラーメン', 'うどん', 'そば', '串焼'})
+# Evening meals or alcohol usually entertainment
+EVENING_INDICATORS = frozenset({'夜', 'ビール', '酒', 'アルコール'})
+
+# Office supplies / equipment items from major retailers
+OFFICE_ITEM_WORDS = frozenset({'文具', 'ペン', 'ノート', 'コピー', '用紙'})
+EQUIPMENT_ITEM_WORDS = frozenset({'pc', 'パソコン', 'ディスプレイ', 'プリンタ'})
+
+EQUIPMENT_INDICATORS = frozenset({'pc', 'パソコン', 'ノートパソコン', 'mac', 'ディスプレイ', 'プリンタ', 'カメラ'})
+UTILITY_COMPANIES = frozenset({'東京電力', '東京ガス', '関西電力', '中部電力'})
+PROFESSIONAL_INDICATORS = frozenset({'弁護士', '税理士', '会計士', 'コンサル'})
+OUTSOURCING_INDICATORS = frozenset({'外注', '委託', '請負', '業務委託'})
+RENT_INDICATORS = frozenset({'家賃', '賃料', 'オフィス', 'テナント'})
+AD_INDICATORS = frozenset({'google ads', 'facebook', 'meta', '広告', 'リスティング'})
+
+# Education/Books heuristics - bookstores and educational materials
+BOOKSTORE_INDICATORS = frozenset({'有隣堂', '紀伊國屋', 'tsutaya', 'ブックストア', 'bookstore'})
+EDUCATION_INDICATORS = frozenset({
+    '本', '書籍', '教科書', '参考書', '語学', '英語', '中国語', 'アラビア語', 'フランス語', 
+    'スペイン語', 'ドイツ語', '韓国語', '学習', '勉強', '教育', '辞書', '辞典',
+    '本の在庫', 'isbn', '復習', '基本', '入門', '初級', '中級', '上級'
+})
+LANGUAGE_INDICATORS = frozenset({'アラビア語', '英語', '中国語', 'フランス語', 'スペイン語', 'ドイツ語', '韓国語', '語学', '復習', '基本'})
+
+# Medical/Healthcare heuristics
+MEDICAL_INDICATORS = frozenset({'クリニック', 'clinic', '病院', '医院', '診療所', '歯科', '歯医者'})
+MEDICAL_CONTEXT_INDICATORS = frozenset({'保険管理', '保険点数', '診察', '治療', '医療費', '薬局', 'ドラッグストア'})
+MEDICAL_POINT_WORDS = frozenset({'保険', '医療', '診察', '治療', 'クリニック', '病院'})
+MEDICAL_POINT_SYSTEM_WORDS = frozenset({'保険', '医療', '診察', '治療'})
+
+# Membership fees - but check if it's promotional text on restaurant receipts
+MEMBERSHIP_INDICATORS = frozenset({'会費', '年会費', 'メンバーシップ', '入会金'})
+RESTAURANT_TRANSACTION_INDICATORS = frozenset({
+    'pizza', 'pasta', 'ボンゴレ', 'ビアンコ', 'テーブル', '人数:', '担当者:', 
+    'pos:', '点数', '小計', '合計', '内消費税', 'お預り', 'おつり'
+})
+RESTAURANT_NAME_INDICATORS = frozenset({'papa milano', 'ダイナック', 'pizza&pasta'})
+
+# Professional services - should be advertising/marketing or software
+PROFESSIONAL_SERVICES = frozenset({
+    'linkedin', 'linkedinpre', 'twitter', 'facebook', 'instagram', 'youtube',
+    'google ads', 'facebook ads', 'meta', 'hubspot', 'salesforce', 'zoom',
+    'slack', 'microsoft', 'adobe', 'canva', 'mailchimp'
+})
+LINKEDIN_INDICATORS = frozenset({'linkedin', 'linkedinpre'})
+
+# Legal Affairs Bureau, unless the stamp tax info is on a store receipt
+LEGAL_INDICATORS = frozenset({'法務局', '登記', '登記簿'})
+STORE_INDICATORS = frozenset({'ikea', 'イケア', '店舗', 'pos', '取引', '購入', '商品', 'レシート', '領収証'})
+
+# Tokyo restaurants should be entertainment; other Tokyo receipts are travel only with transport words
+TOKYO_FOOD_INDICATORS = frozenset({'居酒屋', 'レストラン', '飲食', '鍋', '火鍋', '食堂', 'コーヒー', '珈琲', 'カフェ', 'スターバックス', 'ドトール', 'indian', 'restaurant'})
+TOKYO_TRANSPORT_WORDS = frozenset({'駅', '乗車', '切符', '運賃', '電車代', 'suica', 'pasmo'})
+
+HEURISTIC_KEYWORDS = frozenset({'jr', '点数', '印紙'}).union(
+    TRANSPORT_INDICATORS, JR_TRANSPORT_WORDS, COMM_INDICATORS, RESTAURANT_CONTEXT_INDICATORS,
+    IKEA_TEXT_INDICATORS, IKEA_FOOD_INDICATORS, IKEA_OFFICE_INDICATORS, MEETING_WORDS,
+    RESTAURANT_INDICATORS, LIGHT_FOOD_INDICATORS, MEETING_CONTEXT_INDICATORS, FOOD_INDICATORS,
+    EVENING_INDICATORS, OFFICE_ITEM_WORDS, EQUIPMENT_ITEM_WORDS, EQUIPMENT_INDICATORS,
+    UTILITY_COMPANIES, PROFESSIONAL_INDICATORS, OUTSOURCING_INDICATORS, RENT_INDICATORS,
+    AD_INDICATORS, BOOKSTORE_INDICATORS, EDUCATION_INDICATORS, LANGUAGE_INDICATORS,
+    MEDICAL_INDICATORS, MEDICAL_CONTEXT_INDICATORS, MEDICAL_POINT_WORDS, MEDICAL_POINT_SYSTEM_WORDS,
+    MEMBERSHIP_INDICATORS, RESTAURANT_TRANSACTION_INDICATORS, RESTAURANT_NAME_INDICATORS,
+    PROFESSIONAL_SERVICES, LINKEDIN_INDICATORS, LEGAL_INDICATORS, STORE_INDICATORS,
+    TOKYO_FOOD_INDICATORS, TOKYO_TRANSPORT_WORDS
+)
+
+
+# Keyword lists matched case-sensitively against the raw OCR text (or, for
+# the vendor lists, the lowercased vendor). Each is compiled once into its own
+# alternation pattern (see CategoryClassifier.__init__).
+
+# JR building with a store/restaurant - not transport
+JR_BUILDING_STORE_WORDS = ('店', '真巴石火鍋')
+
+# IKEA vendor names
+IKEA_VENDOR_INDICATORS = ('ikea', 'イケア')
+
+# 3-4 digit prices on an IKEA receipt - small purchases are likely food
+IKEA_AMOUNT_RE = re.compile(r'¥?\s*(\d{3,4})\s*¥?')
+
+# Coffee shops: business meeting vs personal consumption
+COFFEE_VENDORS = ('スターバックス', 'ドトール', '珈琲', 'コーヒー')
+
+# Strong restaurant indicators default to entertainment
+STRONG_RESTAURANT_INDICATORS = ('真巴石火鍋', 'お食事代として', '火鍋', '鍋', '居酒屋', 'レストラン')
+
+# Office supplies from major retailers
+OFFICE_RETAILERS = ('amazon', 'アマゾン', 'ヨドバシ', 'ビックカメラ')
+
+# Geographic detection - outside Tokyo = travel
+# Tokyo indicators - Enhanced with English ward names and variations
+TOKYO_INDICATORS = ('東京都', '東京', 'Tokyo', 'tokyo', 'TOKYO', '渋谷', '新宿', '品川', '池袋', '上野', '銀座', '六本木', '恵比寿',
+                   '表参道', '原宿', '秋葉原', '浅草', '丸の内', '有楽町', '新橋', '目黒', '中野',
+                   '吉祥寺', '立川', '八王子', '町田', '府中', '調布', '三鷹', '武蔵野市', '杉並区',
+                   '世田谷区', '大田区', '江東区', '墨田区', '台東区', '荒川区', '足立区', '葛飾区',
+                   '江戸川区', '練馬区', '板橋区', '北区', '豊島区', '文京区', '千代田区', '中央区',
+                   '港区', '目黒区', '品川区',
+                   # English ward names and variations
+                   'Minato-ku', 'Shibuya', 'Shinjuku', 'Azabu', 'Shibuya-ku', 'Shinjuku-ku', 'Minato-ku',
+                   'Chiyoda-ku', 'Chuo-ku', 'Bunkyo-ku', 'Taito-ku', 'Sumida-ku', 'Koto-ku', 'Shinagawa-ku',
+                   'Meguro-ku', 'Ota-ku', 'Setagaya-ku', 'Suginami-ku', 'Nakano-ku', 'Toshima-ku',
+                   'Kita-ku', 'Itabashi-ku', 'Nerima-ku', 'Adachi-ku', 'Katsushika-ku', 'Edogawa-ku', 'Arakawa-ku',
+                   # Common Tokyo locations in English
+                   'Jingumae', 'Roppongi', 'Ginza', 'Akasaka', 'Ebisu', 'Harajuku', 'Omotesando')
+
+# Airport detection - ALWAYS travel
+AIRPORT_INDICATORS = (
+    # Major airports
+    '成田空港', '羽田空港', '関西空港', '中部空港', '新千歳空港', '伊丹空港',
+    # Airport stations
+    '成田空港駅', '羽田空港駅', '関西空港駅',
+    # Generic airport terms
+    '空港', 'airport', 'Airport', 'AIRPORT'
+)
+
+# Transportation companies - ALWAYS travel
+TRANSPORTATION_COMPANIES = (
+    # Railways
+    '京成電鉄', '東海旅客鉄道', 'JR東海', 'JR西日本', 'JR九州', 'JR北海道', 'JR四国',
+    '小田急', '京急', '東急', '西武', '東武', '京王', '相鉄', '阪急', '阪神', '南海',
+    # Airlines
+    'ANA', 'JAL', '全日空', '日本航空',
+    # Other transport
+    'タクシー', 'taxi', 'TAXI'
+)
+
+# Transportation keywords
+TRANSPORTATION_KEYWORDS = (
+    '乗車券類', '乗車券', '切符', '運賃', '電車代', 'ticket', 'fare',
+    '取引内容:乗車券類購入', '但し、乗車券類'
+)
+
+# Non-Tokyo locations (major cities and prefectures) - Enhanced
+NON_TOKYO_INDICATORS = (
+    # Major cities - key travel destinations
+    '大阪', '神戸', '名古屋', '京都', '奈良', '福岡', '札幌', '仙台', '広島', '岡山',
+    '熊本', '鹿児島', '沖縄', '横浜', '川崎', '千葉', '神戸', '北九州', '静岡',
+    # Prefectures and regions
+    '北海道', '青森', '岩手', '宮城', '秋田', '山形', '福島', '茨城', '栃木', '群馬',
+    '埼玉', '千葉県', '神奈川', '新潟', '富山', '石川', '福井', '山梨', '長野', '岐阜',
+    '静岡県', '愛知', '三重', '滋賀', '京都府', '大阪府', '兵庫', '奈良県', '和歌山',
+    '鳥取', '島根', '岡山県', '広島県', '山口', '徳島', '香川', '愛媛', '高知',
+    '福岡県', '佐賀', '長崎', '熊本県', '大分', '宮崎', '鹿児島県', '沖縄県',
+    # Specific areas that indicate travel
+    '名古屋中村', '京都市', '大阪市', '神戸市', '福岡市', '札幌市', '仙台市'
+)
+
+# Strong Tokyo indicators that should override OCR errors
+STRONG_TOKYO_INDICATORS = ('Tokyo', 'tokyo', 'TOKYO', 'Minato-ku', 'Shibuya', 'Shibuya-ku', 'Azabu',
+                           '東京都', '港区', '渋谷区', 'Jingumae', ', Japan', 'Japan')
+
+# Office rental/tax invoices - should always be Rent category
+OFFICE_INVOICE_INDICATORS = ('TAX INVOICE', 'Office', 'Kitchen Amenities', 'BOKSEN', 'Account number:', 'Invoice number:')
+
+# Key travel destinations outside Tokyo
+MAJOR_TRAVEL_CITIES = ('京都', '大阪', '名古屋', '福岡', '札幌', '広島', '仙台', '岡山', '熊本')
+
+
+# Number of (vendor, description, text) results each classifier remembers
+CLASSIFY_CACHE_SIZE = 4096
+
+
+def get_classifier(rules_path: Union[str, Path]) -> 'CategoryClassifier':
+    """
+    Shared classifier per rules file - the YAML is parsed once per process.
+    
+    The cache is keyed on the file's modification time as well, so a
+    long-running process (e.g. regenerating several months) picks up edits
+    to the rules instead of reusing a stale classifier.
+    
+    Args:
+        rules_path: Path to categories.yml file
+        
+    Returns:
+        CategoryClassifier for the current contents of the file
+    """
+    rules_path = Path(rules_path)
+    return _load_classifier(str(rules_path), rules_path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=None)
+def _load_classifier(rules_path: str, mtime_ns: int) -> 'CategoryClassifier':
+    return CategoryClassifier(Path(rules_path))
+
 
 class CategoryClassifier:
     """Classify receipts into predefined categories using rules and fuzzy matching."""
@@ -22,18 +265,88 @@ class CategoryClassifier:
         """
         self.rules_path = rules_path
         self.categories = {}
+        self.category_keywords = {}
+        # Flat (structure-of-arrays) view of every category's keywords
+        self.category_names = []
+        self.flat_keywords = np.array([], dtype=object)
+        self.keyword_category = np.array([], dtype=np.intp)
+        self.keyword_min_text_len = np.array([], dtype=np.intp)
+        self.keyword_ids = {}
+        # Rule and lowercase heuristic keywords, found together in one sweep
+        self.keyword_matcher = KeywordMatcher(HEURISTIC_KEYWORDS)
+        # One alternation pattern per raw-text and vendor keyword list
+        self.jr_building_store_matcher = KeywordMatcher(JR_BUILDING_STORE_WORDS)
+        self.ikea_vendor_matcher = KeywordMatcher(IKEA_VENDOR_INDICATORS)
+        self.coffee_vendor_matcher = KeywordMatcher(COFFEE_VENDORS)
+        self.strong_restaurant_matcher = KeywordMatcher(STRONG_RESTAURANT_INDICATORS)
+        self.office_retailer_matcher = KeywordMatcher(OFFICE_RETAILERS)
+        self.tokyo_matcher = KeywordMatcher(TOKYO_INDICATORS)
+        self.airport_matcher = KeywordMatcher(AIRPORT_INDICATORS)
+        self.transport_matcher = KeywordMatcher(TRANSPORTATION_COMPANIES + TRANSPORTATION_KEYWORDS)
+        self.non_tokyo_matcher = KeywordMatcher(NON_TOKYO_INDICATORS)
+        self.strong_tokyo_matcher = KeywordMatcher(STRONG_TOKYO_INDICATORS)
+        self.office_invoice_matcher = KeywordMatcher(OFFICE_INVOICE_INDICATORS)
+        self.major_city_matcher = KeywordMatcher(MAJOR_TRAVEL_CITIES)
+        # Reruns and duplicate receipts classify the same OCR text again;
+        # cache per instance so the results are dropped with the rules
+        self._classify_impl = lru_cache(maxsize=CLASSIFY_CACHE_SIZE)(self._classify_impl)
         self.load_rules()
     
     def load_rules(self):
         """Load category rules from YAML file."""
         try:
             with open(self.rules_path, 'r', encoding='utf-8') as f:
-                self.categories = yaml.safe_load(f)
+                rules_yaml = f.read()
+            try:
+                self.categories = yaml.load(rules_yaml, Loader=SafeLoader)
+            except yaml.YAMLError:
+                if SafeLoader is yaml.SafeLoader:
+                    raise
+                # LibYAML rejects a few constructs the Python parser accepts
+                logger.warning(f"LibYAML could not parse {self.rules_path}, retrying with the Python loader")
+                self.categories = yaml.load(rules_yaml, Loader=yaml.SafeLoader)
+            # Keywords are matched against lowercased text; lower them once here
+            self.category_keywords = {
+                category: tuple(keyword.lower() for keyword in rules.get('any', []))
+                for category, rules in self.categories.items()
+                if category != 'Other'
+            }
+            self._build_keyword_table()
+            # Cached results were scored against the old rules
+            self._classify_impl.cache_clear()
             logger.info(f"Loaded {len(self.categories)} category rules")
         except Exception as e:
             logger.error(f"Failed to load category rules: {e}")
             raise
     
+    def _build_keyword_table(self):
+        """
+        Flatten category_keywords into parallel arrays for scoring every
+        category in one pass.
+        
+        keyword_category[i] is the index into category_names of
+        flat_keywords[i]; keyword_ids maps each keyword to its positions,
+        since a keyword can belong to more than one category.
+        """
+        self.category_names = list(self.category_keywords)
+        flat_keywords, keyword_category = [], []
+        for index, keywords in enumerate(self.category_keywords.values()):
+            flat_keywords.extend(keywords)
+            keyword_category.extend([index] * len(keywords))
+        
+        self.flat_keywords = np.array(flat_keywords, dtype=object)
+        self.keyword_category = np.array(keyword_category, dtype=np.intp)
+        # fuzz.ratio is at most 200*a/(a+b) for lengths a <= b, so reaching 80
+        # needs a word - and so a text - at least 2/3 as long as the keyword
+        self.keyword_min_text_len = np.array([-(-2 * len(keyword) // 3) for keyword in flat_keywords],
+                                             dtype=np.intp)
+        self.keyword_ids = {}
+        for i, keyword in enumerate(flat_keywords):
+            self.keyword_ids.setdefault(keyword, []).append(i)
+        # Many rule keywords are heuristic keywords too; one sweep of the
+        # text finds both (see _score_categories and _apply_heuristics)
+        self.keyword_matcher = KeywordMatcher(HEURISTIC_KEYWORDS.union(self.keyword_ids))
+    
     def classify(self, vendor: Optional[str], description: str, text: str) -> Tuple[str, float]:
         """
         Classify a receipt into a category.
@@ -46,21 +359,23 @@ class CategoryClassifier:
         Returns:
             Tuple of (category, confidence_score)
         """
-        all_text = f"{vendor or ''} {description} {text}".lower()
+        return self._classify_impl(vendor, description, text)
+    
+    def _classify_impl(self, vendor: Optional[str], description: str, text: str) -> Tuple[str, float]:
+        """Uncached classify(); identical inputs are answered from the cache."""
+        # Lowercase each part once; rules and heuristics share the results
+        vendor_lower = (vendor or '').lower()
+        desc_lower = description.lower()
+        text_lower = text.lower()
         
-        category_scores = {}
+        # Every rule and heuristic keyword in the text, found in one sweep
+        found = self.keyword_matcher.present(text_lower)
         
         # Score each category based on keyword matches
-        for category, rules in self.categories.items():
-            if category == 'Other':
-                continue
-                
-            score = self._calculate_category_score(all_text, rules.get('any', []))
-            if score > 0:
-                category_scores[category] = score
+        category_scores = self._score_categories(text_lower, vendor_lower, desc_lower, found)
         
         # Apply special heuristics
-        heuristic_scores = self._apply_heuristics(vendor, description, text)
+        heuristic_scores = self._apply_heuristics(vendor_lower, desc_lower, text_lower, text, found)
         for category, score in heuristic_scores.items():
             category_scores[category] = category_scores.get(category, 0) + score
         
@@ -90,295 +405,226 @@ class CategoryClassifier:
         logger.info(f"Classified as '{best_category[0]}' with confidence {confidence:.2f}")
         return best_category[0], confidence
     
-    def _calculate_category_score(self, text: str, keywords: List[str]) -> float:
-        """Calculate score for a category based on keyword matches."""
-        score = 0.0
+    def _score_categories(self, text: str, vendor: str = '', description: str = '',
+                          found: Optional[Set[str]] = None) -> Dict[str, float]:
+        """
+        Score every category against a text in one pass over the flat keyword table.
         
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            
-            # Exact match gets highest score
-            if keyword_lower in text:
-                score += 5.0
-                continue
+        Each category gets 5 points per exact keyword match, and for its other
+        keywords up to 3 points for every word at or above 80% similarity. The
+        vendor and description are scored with the text without being joined
+        onto (and copying) it.
+        
+        Args:
+            text: Lowercased text to score
+            vendor: Lowercased vendor name
+            description: Lowercased description
+            found: keyword_matcher.present(text), when the caller already swept it
             
-            # Fuzzy match for partial matches
-            words = text.split()
-            for word in words:
-                similarity = fuzz.ratio(keyword_lower, word)
-                if similarity >= 80:  # 80% similarity threshold
-                    score += similarity / 100.0 * 3.0  # Max 3 points for fuzzy match
-        
-        return score
+        Returns:
+            Dict of category -> score, for categories that scored above zero
+        """
+        # One sweep per part finds every exact keyword; the rest are fuzzy candidates
+        found = set(self.keyword_matcher.present(text) if found is None else found)
+        for part in (vendor, description):
+            if part:
+                found |= self.keyword_matcher.present(part)
+        # The matcher also knows the heuristic keywords; only rule keywords score here
+        hit_ids = [i for keyword in found for i in self.keyword_ids.get(keyword, ())]
+        exact_scores = np.zeros(len(self.category_names))
+        np.add.at(exact_scores, self.keyword_category[hit_ids], 5.0)
+        
+        fuzzy_sums = np.zeros(len(self.category_names))
+        fuzzy_mask = self.keyword_min_text_len <= max(len(text), len(vendor), len(description))
+        fuzzy_mask[hit_ids] = False
+        words = vendor.split() + description.split() + text.split()
+        if words and fuzzy_mask.any():
+            similarities = process.cdist(self.flat_keywords[fuzzy_mask], words, scorer=fuzz.ratio,
+                                         score_cutoff=80, dtype=np.float64)
+            np.add.at(fuzzy_sums, self.keyword_category[fuzzy_mask], similarities.sum(axis=1))
+        
+        scores = exact_scores + fuzzy_sums / 100.0 * 3.0
+        return {category: float(score) for category, score in zip(self.category_names, scores) if score > 0}
     
-    def _apply_heuristics(self, vendor: Optional[str], description: str, text: str) -> Dict[str, float]:
-        """Apply specific heuristics for common patterns."""
-        scores = {}
-        text_lower = text.lower()
-        vendor_lower = (vendor or '').lower()
-        desc_lower = description.lower()  # For potential future use
+    def _apply_heuristics(self, vendor_lower: str, desc_lower: str, text_lower: str, text: str,
+                          hits: Optional[Set[str]] = None) -> Dict[str, float]:
+        """
+        Apply specific heuristics for common patterns.
+        
+        Args:
+            vendor_lower: Lowercased vendor name ('' if none was found)
+            desc_lower: Lowercased description (for potential future use)
+            text_lower: Lowercased OCR text
+            text: Full OCR text as read, for the case-sensitive checks
+            hits: keyword_matcher.present(text_lower), when the caller already swept it
+            
+        Returns:
+            Dict of category -> score adjustment
+        """
+        scores = defaultdict(float)
+        
+        # Every heuristic keyword in the lowercased text, found in one sweep;
+        # each keyword-list check below is then a set lookup
+        if hits is None:
+            hits = self.keyword_matcher.present(text_lower)
         
         # Transportation heuristics (but be careful about JR in building addresses)
-        transport_indicators = ['地下鉄', 'タクシー', '高速', 'suica', 'pasmo', '新幹線', 'バス', '電車']
-        if any(indicator in text_lower for indicator in transport_indicators):
-            scores['travel'] = scores.get('travel', 0) + 3.0
+        if not hits.isdisjoint(TRANSPORT_INDICATORS):
+            scores['travel'] += 3.0
         
         # Handle JR specifically - only boost travel if it's actual transport, not building address
-        if 'jr' in text_lower:
-            if any(transport_word in text_lower for transport_word in ['乗車', '切符', '運賃', '電車代', '駅']):
-                scores['travel'] = scores.get('travel', 0) + 3.0
-            elif 'ビル' in text and ('店' in text or '真巴石火鍋' in text):
+        if 'jr' in hits:
+            if not hits.isdisjoint(JR_TRANSPORT_WORDS):
+                scores['travel'] += 3.0
+            elif 'ビル' in text and self.jr_building_store_matcher.search(text):
                 # JR building with store/restaurant - definitely not transport
-                scores['travel'] = scores.get('travel', 0) - 15.0  # Very strong penalty to override rule-based score
+                scores['travel'] -= 15.0  # Very strong penalty to override rule-based score
                 logger.info(f"JR building with restaurant detected, very strongly penalizing travel")
             elif 'ビル' in text:
                 # JR building generally - likely not transport  
-                scores['travel'] = scores.get('travel', 0) - 5.0
+                scores['travel'] -= 5.0
         
         # Communications heuristics - but be careful not to trigger on restaurant contact info
-        comm_indicators = ['ntt', 'kddi', 'ソフトバンク', 'wi-fi', 'インターネット', '電話', '通信']
-        if any(indicator in text_lower for indicator in comm_indicators):
+        if not hits.isdisjoint(COMM_INDICATORS):
             # Check if this is actually a restaurant with contact info, not a telecom business
-            restaurant_context_indicators = ['料理', 'レストラン', '居酒屋', '食堂', 'カフェ', '喫茶', 'rice', 'curry', 'ライス', 'カレー', '店']
-            if any(rest_indicator in text_lower for rest_indicator in restaurant_context_indicators):
+            if not hits.isdisjoint(RESTAURANT_CONTEXT_INDICATORS):
                 # This is a restaurant with contact info - reduce communications score
-                scores['communications (phone, internet, postage)'] = scores.get('communications (phone, internet, postage)', 0) + 1.0  # Much lower score
+                scores['communications (phone, internet, postage)'] += 1.0  # Much lower score
             else:
-                scores['communications (phone, internet, postage)'] = scores.get('communications (phone, internet, postage)', 0) + 3.0
+                scores['communications (phone, internet, postage)'] += 3.0
         
         # IKEA classification - categorize based on actual items (check both vendor and text)
-        is_ikea = (vendor_lower and any(indicator in vendor_lower for indicator in ['ikea', 'イケア'])) or \
-                  any(indicator in text_lower for indicator in ['ikea', 'イケア', 'ikea渋谷', 'ikea shibuya'])
+        is_ikea = (vendor_lower and self.ikea_vendor_matcher.search(vendor_lower)) or \
+                  not hits.isdisjoint(IKEA_TEXT_INDICATORS)
         
         if is_ikea:
-            # IKEA food items and restaurant indicators
-            ikea_food_indicators = [
-                'プラントボール', 'plant ball', 'ミートボール', 'meatball',
-                'フード', 'food', 'レストラン', 'restaurant', 'カフェ', 'cafe',
-                'ホットドッグ', 'hot dog', 'ソフトクリーム', 'soft cream',
-                'フィッシュ&チップス', 'fish&chips', 'fish & chips', 'フィッシュアンドチップス'
-            ]
-            
-            # IKEA office/furniture items
-            ikea_office_indicators = [
-                '靴r', '靴R', '靴ラック', 'shoe rack', 'grejig', 'グレイグ',
-                'デスク', 'desk', 'チェア', 'chair', '収納', 'storage',
-                'ファイル', 'file', 'ボックス', 'box', 'シェルフ', 'shelf'
-            ]
-            
             # Check categories in order of specificity
-            if any(food_item in text_lower for food_item in ikea_food_indicators):
-                scores['entertainment'] = scores.get('entertainment', 0) + 10.0
+            if not hits.isdisjoint(IKEA_FOOD_INDICATORS):
+                scores['entertainment'] += 10.0
                 logger.info("IKEA food/restaurant detected - strongly boosting entertainment")
-            elif any(office_item in text_lower for office_item in ikea_office_indicators):
-                scores['Office supplies'] = scores.get('Office supplies', 0) + 10.0
+            elif not hits.isdisjoint(IKEA_OFFICE_INDICATORS):
+                scores['Office supplies'] += 10.0
                 logger.info("IKEA office/furniture item detected - strongly boosting Office supplies")
             # For remaining small purchases at IKEA, likely food (under ¥1200)
-            elif any(int(amount) <= 1200 for amount in re.findall(r'¥?\s*(\d{3,4})\s*¥?', text) if amount.isdigit()):
-                scores['entertainment'] = scores.get('entertainment', 0) + 6.0
+            elif (amounts := [int(amount) for amount in IKEA_AMOUNT_RE.findall(text) if amount.isdigit()]) \
+                    and min(amounts) <= 1200:
+                scores['entertainment'] += 6.0
                 logger.info("Small IKEA purchase detected - likely food, boosting entertainment")
         
         # Food/Entertainment heuristics
-        if any(indicator in vendor_lower for indicator in ['スターバックス', 'ドトール', '珈琲', 'コーヒー']):
+        if self.coffee_vendor_matcher.search(vendor_lower):
             # Check if it's a business meeting vs personal consumption
-            if any(biz in text_lower for biz in ['会議', '打合せ', 'ミーティング', '商談']):
-                scores['meetings'] = scores.get('meetings', 0) + 4.0
+            if not hits.isdisjoint(MEETING_WORDS):
+                scores['meetings'] += 4.0
             else:
-                scores['entertainment'] = scores.get('entertainment', 0) + 2.0
+                scores['entertainment'] += 2.0
         
         # Restaurant/Bar heuristics - restaurants default to entertainment, light refreshments to meetings
-        restaurant_indicators = ['居酒屋', 'レストラン', '食事', '飲食', '鍋', '火鍋', '店', 'お食事代', '料理', 'rice', 'curry', 'ライス', 'カレー', 'gaprao', 'マヤ', 'ネパール', 'インド', 'bagel', 'cafe', 'カフェ', 'ベーグル',
-                                # Enhanced food-related characters and terms that indicate restaurants
-                                '牛', '肉', '焼肉', '焼き鳥', '鳥', '豚', '魚', '海鮮', '寿司', '刺身', '天ぷら', 
-                                '定食', '弁当', '丼', '麺', 'ラーメン', 'うどん', 'そば', '串焼']
-        if any(indicator in text_lower for indicator in restaurant_indicators):
+        if not hits.isdisjoint(RESTAURANT_INDICATORS):
             # Light refreshments/bento in meeting context → meetings
-            if any(light_indicator in text_lower for light_indicator in ['弁当', 'ベント', 'サンドイッチ', 'おにぎり', 'パン', 'ドリンク', '飲み物', 'コーヒー', 'お茶']):
-                if any(meeting_indicator in text_lower for meeting_indicator in ['会議', '打合せ', 'ミーティング', '商談', '会議室']):
-                    scores['meetings'] = scores.get('meetings', 0) + 5.0  # Light refreshments in meetings
+            if not hits.isdisjoint(LIGHT_FOOD_INDICATORS):
+                if not hits.isdisjoint(MEETING_CONTEXT_INDICATORS):
+                    scores['meetings'] += 5.0  # Light refreshments in meetings
                 else:
-                    scores['entertainment'] = scores.get('entertainment', 0) + 3.0  # Light food without meeting context
+                    scores['entertainment'] += 3.0  # Light food without meeting context
             # Strong restaurant indicators default to entertainment
-            elif any(strong_indicator in text for strong_indicator in ['真巴石火鍋', 'お食事代として', '火鍋', '鍋', '居酒屋', 'レストラン']):
-                scores['entertainment'] = scores.get('entertainment', 0) + 6.0  # Clear restaurant → entertainment
+            elif self.strong_restaurant_matcher.search(text):
+                scores['entertainment'] += 6.0  # Clear restaurant → entertainment
             # Additional strong restaurant/food indicators
-            elif any(food_indicator in text_lower for food_indicator in ['料理', 'rice', 'curry', 'ライス', 'カレー', 'gaprao', 'マヤ', 'ネパール', 'インド', 'タイ', 'thai', 'bagel', 'cafe', 'カフェ', 'ベーグル', '牛', '肉', '焼肉', '焼き鳥', '鳥', '豚', '魚', '海鮮', '寿司', '刺身', '天ぷら', '定食', '弁当', '丼', '麺', 'ラーメン', 'うどん', 'そば', '串焼']):
-                scores['entertainment'] = scores.get('entertainment', 0) + 8.0  # Very clear food establishment → entertainment
+            elif not hits.isdisjoint(FOOD_INDICATORS):
+                scores['entertainment'] += 8.0  # Very clear food establishment → entertainment
             # Evening meals or alcohol usually entertainment
-            elif any(indicator in text_lower for indicator in ['夜', 'ビール', '酒', 'アルコール']):
-                scores['entertainment'] = scores.get('entertainment', 0) + 3.0
+            elif not hits.isdisjoint(EVENING_INDICATORS):
+                scores['entertainment'] += 3.0
             else:
-                scores['entertainment'] = scores.get('entertainment', 0) + 4.0  # Default restaurants to entertainment
+                scores['entertainment'] += 4.0  # Default restaurants to entertainment
         
         # Office supplies from major retailers
-        office_retailers = ['amazon', 'アマゾン', 'ヨドバシ', 'ビックカメラ']
-        if any(retailer in vendor_lower for retailer in office_retailers):
-            if any(item in text_lower for item in ['文具', 'ペン', 'ノート', 'コピー', '用紙']):
-                scores['Office supplies'] = scores.get('Office supplies', 0) + 3.0
-            elif any(item in text_lower for item in ['pc', 'パソコン', 'ディスプレイ', 'プリンタ']):
-                scores['Equipment'] = scores.get('Equipment', 0) + 3.0
+        if self.office_retailer_matcher.search(vendor_lower):
+            if not hits.isdisjoint(OFFICE_ITEM_WORDS):
+                scores['Office supplies'] += 3.0
+            elif not hits.isdisjoint(EQUIPMENT_ITEM_WORDS):
+                scores['Equipment'] += 3.0
         
         # Equipment keywords
-        equipment_indicators = ['pc', 'パソコン', 'ノートパソコン', 'mac', 'ディスプレイ', 'プリンタ', 'カメラ']
-        if any(indicator in text_lower for indicator in equipment_indicators):
-            scores['Equipment'] = scores.get('Equipment', 0) + 4.0
+        if not hits.isdisjoint(EQUIPMENT_INDICATORS):
+            scores['Equipment'] += 4.0
         
         # Utilities pattern matching
-        utility_companies = ['東京電力', '東京ガス', '関西電力', '中部電力']
-        if any(company in text_lower for company in utility_companies):
-            scores['Utilities'] = scores.get('Utilities', 0) + 5.0
+        if not hits.isdisjoint(UTILITY_COMPANIES):
+            scores['Utilities'] += 5.0
         
         # Professional services
-        if any(indicator in text_lower for indicator in ['弁護士', '税理士', '会計士', 'コンサル']):
-            scores['Professional fees'] = scores.get('Professional fees', 0) + 4.0
+        if not hits.isdisjoint(PROFESSIONAL_INDICATORS):
+            scores['Professional fees'] += 4.0
         
         # Outsourcing keywords
-        if any(indicator in text_lower for indicator in ['外注', '委託', '請負', '業務委託']):
-            scores['outsourced fees'] = scores.get('outsourced fees', 0) + 4.0
+        if not hits.isdisjoint(OUTSOURCING_INDICATORS):
+            scores['outsourced fees'] += 4.0
         
         # Rent/Real estate
-        if any(indicator in text_lower for indicator in ['家賃', '賃料', 'オフィス', 'テナント']):
-            scores['Rent'] = scores.get('Rent', 0) + 5.0
+        if not hits.isdisjoint(RENT_INDICATORS):
+            scores['Rent'] += 5.0
         
         # Advertising
-        ad_indicators = ['google ads', 'facebook', 'meta', '広告', 'リスティング']
-        if any(indicator in text_lower for indicator in ad_indicators):
-            scores['Advertising'] = scores.get('Advertising', 0) + 4.0
+        if not hits.isdisjoint(AD_INDICATORS):
+            scores['Advertising'] += 4.0
         
         # Education/Books heuristics - bookstores and educational materials
-        if any(bookstore in text_lower for bookstore in ['有隣堂', '紀伊國屋', 'tsutaya', 'ブックストア', 'bookstore']):
+        if not hits.isdisjoint(BOOKSTORE_INDICATORS):
             # Check if it's actually books/educational content
-            education_indicators = [
-                '本', '書籍', '教科書', '参考書', '語学', '英語', '中国語', 'アラビア語', 'フランス語', 
-                'スペイン語', 'ドイツ語', '韓国語', '学習', '勉強', '教育', '辞書', '辞典',
-                '本の在庫', 'isbn', '復習', '基本', '入門', '初級', '中級', '上級'
-            ]
-            if any(edu_indicator in text_lower for edu_indicator in education_indicators):
-                scores['Education'] = scores.get('Education', 0) + 10.0  # Very strong boost for education
+            if not hits.isdisjoint(EDUCATION_INDICATORS):
+                scores['Education'] += 10.0  # Very strong boost for education
                 # Reduce entertainment score since bookstores might be miscategorized as entertainment
                 scores['entertainment'] = max(0, scores.get('entertainment', 0) - 5.0)
                 logger.info("Bookstore with educational content detected - strongly boosting Education")
             else:
                 # General bookstore purchase - still likely educational
-                scores['Education'] = scores.get('Education', 0) + 6.0
+                scores['Education'] += 6.0
                 logger.info("Bookstore purchase detected - boosting Education")
         
         # Language learning materials detection
-        language_indicators = ['アラビア語', '英語', '中国語', 'フランス語', 'スペイン語', 'ドイツ語', '韓国語', '語学', '復習', '基本']
-        if any(lang in text_lower for lang in language_indicators):
-            scores['Education'] = scores.get('Education', 0) + 8.0  # Strong boost for language learning
+        if not hits.isdisjoint(LANGUAGE_INDICATORS):
+            scores['Education'] += 8.0  # Strong boost for language learning
             logger.info("Language learning material detected - boosting Education")
         
         # Medical/Healthcare heuristics
-        medical_indicators = ['クリニック', 'clinic', '病院', '医院', '診療所', '歯科', '歯医者']
-        medical_context_indicators = ['保険管理', '保険点数', '診察', '治療', '医療費', '薬局', 'ドラッグストア']
-        
-        if any(indicator in text_lower for indicator in medical_indicators):
-            scores['Medical'] = scores.get('Medical', 0) + 10.0  # Very strong boost for medical facilities
+        if not hits.isdisjoint(MEDICAL_INDICATORS):
+            scores['Medical'] += 10.0  # Very strong boost for medical facilities
             logger.info("Medical facility detected - strongly boosting Medical")
-        elif any(indicator in text_lower for indicator in medical_context_indicators):
-            scores['Medical'] = scores.get('Medical', 0) + 8.0  # Strong boost for medical context
+        elif not hits.isdisjoint(MEDICAL_CONTEXT_INDICATORS):
+            scores['Medical'] += 8.0  # Strong boost for medical context
             logger.info("Medical context detected - boosting Medical")
         # Special case: "点数" alone could mean purchase items, only boost Medical if in medical context
-        elif '点数' in text_lower and any(medical_word in text_lower for medical_word in ['保険', '医療', '診察', '治療', 'クリニック', '病院']):
-            scores['Medical'] = scores.get('Medical', 0) + 6.0  # Moderate boost for medical points
+        elif '点数' in hits and not hits.isdisjoint(MEDICAL_POINT_WORDS):
+            scores['Medical'] += 6.0  # Moderate boost for medical points
             logger.info("Medical point system context detected - boosting Medical")
         
         # Special detection for Japanese medical point system
-        if '点' in text and any(medical_word in text_lower for medical_word in ['保険', '医療', '診察', '治療']):
-            scores['Medical'] = scores.get('Medical', 0) + 12.0  # Very strong boost for medical points
+        if '点' in text and not hits.isdisjoint(MEDICAL_POINT_SYSTEM_WORDS):
+            scores['Medical'] += 12.0  # Very strong boost for medical points
             logger.info("Japanese medical point system detected - very strongly boosting Medical")
         
         # Membership fees - but check if it's promotional text on restaurant receipts
-        if any(indicator in text_lower for indicator in ['会費', '年会費', 'メンバーシップ', '入会金']):
+        if not hits.isdisjoint(MEMBERSHIP_INDICATORS):
             # Check if this is actually a restaurant with promotional membership text
-            restaurant_transaction_indicators = [
-                'pizza', 'pasta', 'ボンゴレ', 'ビアンコ', 'テーブル', '人数:', '担当者:', 
-                'pos:', '点数', '小計', '合計', '内消費税', 'お預り', 'おつり'
-            ]
-            restaurant_name_indicators = ['papa milano', 'ダイナック', 'pizza&pasta']
-            
-            has_restaurant_transaction = any(indicator in text_lower for indicator in restaurant_transaction_indicators)
-            has_restaurant_name = any(indicator in text_lower for indicator in restaurant_name_indicators)
+            has_restaurant_transaction = not hits.isdisjoint(RESTAURANT_TRANSACTION_INDICATORS)
+            has_restaurant_name = not hits.isdisjoint(RESTAURANT_NAME_INDICATORS)
             
             if has_restaurant_transaction or has_restaurant_name:
                 # This is likely promotional text on a restaurant receipt
-                scores['entertainment'] = scores.get('entertainment', 0) + 12.0  # Very strong boost for entertainment
-                scores['Memberships'] = scores.get('Memberships', 0) + 0.5  # Very weak membership signal
+                scores['entertainment'] += 12.0  # Very strong boost for entertainment
+                scores['Memberships'] += 0.5  # Very weak membership signal
                 logger.info("Restaurant receipt with promotional membership text detected - strongly boosting entertainment")
             else:
                 # Likely actual membership fee
-                scores['Memberships'] = scores.get('Memberships', 0) + 4.0
+                scores['Memberships'] += 4.0
         
         # Geographic detection - outside Tokyo = travel
-        # Tokyo indicators - Enhanced with English ward names and variations
-        tokyo_indicators = ['東京都', '東京', 'Tokyo', 'tokyo', 'TOKYO', '渋谷', '新宿', '品川', '池袋', '上野', '銀座', '六本木', '恵比寿', 
-                           '表参道', '原宿', '秋葉原', '浅草', '丸の内', '有楽町', '新橋', '目黒', '中野', 
-                           '吉祥寺', '立川', '八王子', '町田', '府中', '調布', '三鷹', '武蔵野市', '杉並区', 
-                           '世田谷区', '大田区', '江東区', '墨田区', '台東区', '荒川区', '足立区', '葛飾区', 
-                           '江戸川区', '練馬区', '板橋区', '北区', '豊島区', '文京区', '千代田区', '中央区', 
-                           '港区', '目黒区', '品川区', 
-                           # English ward names and variations
-                           'Minato-ku', 'Shibuya', 'Shinjuku', 'Azabu', 'Shibuya-ku', 'Shinjuku-ku', 'Minato-ku',
-                           'Chiyoda-ku', 'Chuo-ku', 'Bunkyo-ku', 'Taito-ku', 'Sumida-ku', 'Koto-ku', 'Shinagawa-ku',
-                           'Meguro-ku', 'Ota-ku', 'Setagaya-ku', 'Suginami-ku', 'Nakano-ku', 'Toshima-ku',
-                           'Kita-ku', 'Itabashi-ku', 'Nerima-ku', 'Adachi-ku', 'Katsushika-ku', 'Edogawa-ku', 'Arakawa-ku',
-                           # Common Tokyo locations in English
-                           'Jingumae', 'Roppongi', 'Ginza', 'Akasaka', 'Ebisu', 'Harajuku', 'Omotesando']
-        
-        # Airport detection - ALWAYS travel
-        airport_indicators = [
-            # Major airports
-            '成田空港', '羽田空港', '関西空港', '中部空港', '新千歳空港', '伊丹空港',
-            # Airport stations  
-            '成田空港駅', '羽田空港駅', '関西空港駅',
-            # Generic airport terms
-            '空港', 'airport', 'Airport', 'AIRPORT'
-        ]
-        
-        # Transportation companies - ALWAYS travel 
-        transportation_companies = [
-            # Railways
-            '京成電鉄', '東海旅客鉄道', 'JR東海', 'JR西日本', 'JR九州', 'JR北海道', 'JR四国',
-            '小田急', '京急', '東急', '西武', '東武', '京王', '相鉄', '阪急', '阪神', '南海',
-            # Airlines  
-            'ANA', 'JAL', '全日空', '日本航空',
-            # Other transport
-            'タクシー', 'taxi', 'TAXI'
-        ]
-        
-        # Transportation keywords
-        transportation_keywords = [
-            '乗車券類', '乗車券', '切符', '運賃', '電車代', 'ticket', 'fare',
-            '取引内容:乗車券類購入', '但し、乗車券類'
-        ]
-        
-        # Non-Tokyo locations (major cities and prefectures) - Enhanced
-        non_tokyo_indicators = [
-            # Major cities - key travel destinations
-            '大阪', '神戸', '名古屋', '京都', '奈良', '福岡', '札幌', '仙台', '広島', '岡山',
-            '熊本', '鹿児島', '沖縄', '横浜', '川崎', '千葉', '神戸', '北九州', '静岡',
-            # Prefectures and regions
-            '北海道', '青森', '岩手', '宮城', '秋田', '山形', '福島', '茨城', '栃木', '群馬', 
-            '埼玉', '千葉県', '神奈川', '新潟', '富山', '石川', '福井', '山梨', '長野', '岐阜', 
-            '静岡県', '愛知', '三重', '滋賀', '京都府', '大阪府', '兵庫', '奈良県', '和歌山', 
-            '鳥取', '島根', '岡山県', '広島県', '山口', '徳島', '香川', '愛媛', '高知', 
-            '福岡県', '佐賀', '長崎', '熊本県', '大分', '宮崎', '鹿児島県', '沖縄県',
-            # Specific areas that indicate travel
-            '名古屋中村', '京都市', '大阪市', '神戸市', '福岡市', '札幌市', '仙台市'
-        ]
-        
-        # Professional services - should be advertising/marketing or software
-        professional_services = [
-            'linkedin', 'linkedinpre', 'twitter', 'facebook', 'instagram', 'youtube',
-            'google ads', 'facebook ads', 'meta', 'hubspot', 'salesforce', 'zoom',
-            'slack', 'microsoft', 'adobe', 'canva', 'mailchimp'
-        ]
-        
         # PRIORITY 1: Airport detection - ALWAYS travel (highest priority)
-        airport_found = any(indicator in text for indicator in airport_indicators)
+        airport_found = self.airport_matcher.search(text)
         if airport_found:
-            scores['travel'] = scores.get('travel', 0) + 25.0  # Ultra high priority
+            scores['travel'] += 25.0  # Ultra high priority
             # Strong penalty for other categories
             for other_cat in ['entertainment', 'meetings', 'Office supplies']:
                 if other_cat in scores:
@@ -386,11 +632,8 @@ class CategoryClassifier:
             logger.info("Airport detected - ultra strong boost for travel category")
             
         # PRIORITY 2: Transportation companies - ALWAYS travel
-        transport_company_found = any(company in text for company in transportation_companies)
-        transport_keyword_found = any(keyword in text for keyword in transportation_keywords)
-        
-        if transport_company_found or transport_keyword_found:
-            scores['travel'] = scores.get('travel', 0) + 20.0  # Very high priority
+        if self.transport_matcher.search(text):
+            scores['travel'] += 20.0  # Very high priority
             # Penalty for other categories
             for other_cat in ['entertainment', 'meetings']:
                 if other_cat in scores:
@@ -398,50 +641,48 @@ class CategoryClassifier:
             logger.info("Transportation company/keywords detected - very strong boost for travel category")
             
         # PRIORITY 3: Professional services - Marketing/Advertising or Software
-        professional_service_found = any(service in text_lower for service in professional_services)
+        professional_service_found = not hits.isdisjoint(PROFESSIONAL_SERVICES)
         if professional_service_found:
-            if any(linkedin_indicator in text_lower for linkedin_indicator in ['linkedin', 'linkedinpre']):
-                scores['Advertising'] = scores.get('Advertising', 0) + 15.0  # Strong boost for advertising
+            if not hits.isdisjoint(LINKEDIN_INDICATORS):
+                scores['Advertising'] += 15.0  # Strong boost for advertising
                 logger.info("LinkedIn detected - strongly boosting Advertising category")
             else:
-                scores['Software and Services'] = scores.get('Software and Services', 0) + 15.0
+                scores['Software and Services'] += 15.0
                 logger.info("Professional service detected - strongly boosting Software and Services category")
         
         # Check Tokyo indicators FIRST to avoid conflicts with non-Tokyo patterns
-        tokyo_found = any(location in text for location in tokyo_indicators)
-        non_tokyo_found = any(location in text for location in non_tokyo_indicators)
+        tokyo_found = self.tokyo_matcher.search(text)
+        non_tokyo_found = self.non_tokyo_matcher.search(text)
         
         # Strong Tokyo indicators that should override OCR errors
-        strong_tokyo_indicators = ['Tokyo', 'tokyo', 'TOKYO', 'Minato-ku', 'Shibuya', 'Shibuya-ku', 'Azabu', 
-                                  '東京都', '港区', '渋谷区', 'Jingumae', ', Japan', 'Japan']
-        strong_tokyo_found = any(indicator in text for indicator in strong_tokyo_indicators)
+        strong_tokyo_found = self.strong_tokyo_matcher.search(text)
         
         # Special handling for office rental/tax invoices - should always be Rent category
-        if any(office_indicator in text for office_indicator in ['TAX INVOICE', 'Office', 'Kitchen Amenities', 'BOKSEN', 'Account number:', 'Invoice number:']):
-            scores['Rent'] = scores.get('Rent', 0) + 25.0  # Very strong boost for Rent
+        if self.office_invoice_matcher.search(text):
+            scores['Rent'] += 25.0  # Very strong boost for Rent
             scores['entertainment'] = max(0, scores.get('entertainment', 0) - 20.0)  # Strong penalty for entertainment
             scores['travel'] = max(0, scores.get('travel', 0) - 20.0)  # Strong penalty for travel
             scores['Other'] = max(0, scores.get('Other', 0) - 10.0)  # Penalty for Other
             logger.info(f"Office rental/tax invoice detected, strongly boosting Rent category and penalizing entertainment")
         # Special handling for Legal Affairs Bureau - should always be Other category
         # But exclude receipts from stores (they just have stamp tax info)
-        elif (any(legal_indicator in text_lower for legal_indicator in ['法務局', '登記', '登記簿']) or 
-              ('印紙' in text_lower and not any(store_indicator in text_lower for store_indicator in ['ikea', 'イケア', '店舗', 'pos', '取引', '購入', '商品', 'レシート', '領収証']))):
-            scores['Other'] = scores.get('Other', 0) + 20.0  # Very strong boost for Other
+        elif (not hits.isdisjoint(LEGAL_INDICATORS) or 
+              ('印紙' in hits and hits.isdisjoint(STORE_INDICATORS))):
+            scores['Other'] += 20.0  # Very strong boost for Other
             scores['travel'] = max(0, scores.get('travel', 0) - 25.0)  # Very strong penalty for travel
             scores['Professional fees'] = max(0, scores.get('Professional fees', 0) - 10.0)  # Penalty for professional fees
             scores['Office supplies'] = max(0, scores.get('Office supplies', 0) - 10.0)  # Penalty for office supplies
             logger.info(f"Legal Affairs Bureau detected, strongly boosting Other category and penalizing travel")
         elif tokyo_found:
             # Check if this is a restaurant/food establishment in Tokyo
-            if any(food_indicator in text_lower for food_indicator in ['居酒屋', 'レストラン', '飲食', '鍋', '火鍋', '食堂', 'コーヒー', '珈琲', 'カフェ', 'スターバックス', 'ドトール', 'indian', 'restaurant']):
+            if not hits.isdisjoint(TOKYO_FOOD_INDICATORS):
                 # Tokyo restaurants should be entertainment, not travel
                 penalty_strength = 20.0 if strong_tokyo_found else 15.0  # Extra strong if we have very clear Tokyo indicators
-                scores['entertainment'] = scores.get('entertainment', 0) + 12.0  # Very strong boost
+                scores['entertainment'] += 12.0  # Very strong boost
                 scores['travel'] = max(0, scores.get('travel', 0) - penalty_strength)  # Very strong penalty
                 logger.info(f"Tokyo restaurant/food detected (strong={strong_tokyo_found}), strongly boosting entertainment and penalizing travel")
             # For non-food Tokyo locations, reduce travel unless it's actual transport
-            elif not any(transport in text_lower for transport in ['駅', '乗車', '切符', '運賃', '電車代', 'suica', 'pasmo']):
+            elif hits.isdisjoint(TOKYO_TRANSPORT_WORDS):
                 penalty_strength = 15.0 if strong_tokyo_found else 10.0
                 scores['travel'] = max(0, scores.get('travel', 0) - penalty_strength)  # Strong reduction
                 logger.info(f"Tokyo non-transport detected (strong={strong_tokyo_found}), strongly reducing travel category")
@@ -451,19 +692,18 @@ class CategoryClassifier:
             travel_boost = 20.0  # Very high priority
             
             # Special cases for key travel destinations
-            major_travel_cities = ['京都', '大阪', '名古屋', '福岡', '札幌', '広島', '仙台', '岡山', '熊本']
-            if any(city in text for city in major_travel_cities):
+            if self.major_city_matcher.search(text):
                 travel_boost = 25.0  # Ultra high priority for major cities
                 logger.info(f"Major non-Tokyo city detected - ultra strong boost for travel category")
             
-            scores['travel'] = scores.get('travel', 0) + travel_boost
+            scores['travel'] += travel_boost
             # Strong reduction of competing categories when outside Tokyo
             for other_cat in ['entertainment', 'meetings', 'Office supplies']:
                 if other_cat in scores:
                     scores[other_cat] = max(0, scores[other_cat] - 10.0)
             logger.info(f"Non-Tokyo location detected (no strong Tokyo indicators), strongly boosting travel category")
         
-        return scores
+        return dict(scores)
     
     def get_category_suggestions(self, text: str, top_n: int = 3) -> List[Tuple[str, float]]:
         """
@@ -476,16 +716,8 @@ class CategoryClassifier:
         Returns:
             List of (category, score) tuples sorted by score
         """
-        category_scores = {}
-        text_lower = text.lower()
-        
-        for category, rules in self.categories.items():
-            if category == 'Other':
-                continue
-            score = self._calculate_category_score(text_lower, rules.get('any', []))
-            if score > 0:
-                category_scores[category] = score
+        # Same rule scoring as classify(), without the heuristics
+        category_scores = self._score_categories(text.lower())
         
-        # Sort by score and return top N
-        sorted_categories = sorted(category_scores.items(), key=lambda x: x[1], reverse=True)
-        return sorted_categories[:top_n]
\ No newline at end of file
+        # Top N by score; ties keep rules-file order, as a stable sort would
+        return heapq.nlargest(top_n, category_scores.items(), key=lambda x: x[1])
\ No newline at end of file
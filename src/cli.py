@@ -1,20 +1,24 @@
 """Command-line interface for Japanese receipt OCR processing."""
 
+import os
 import logging
 import click
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 from tqdm import tqdm
 import sys
+import threading
 from datetime import datetime
 from collections import Counter
 
-from .ocr import OCRProcessor
+from .ocr import OCRProcessor, OCRQueue, hash_bytes
+from .embedded_text import good_embedded_text
 from .parse import JapaneseReceiptParser
 from .classify import CategoryClassifier
-from .review import ReviewQueue
+from .review import ReviewQueue, ReviewItem
 from .export import ExcelExporter
 
 # Set up logging
@@ -107,6 +111,35 @@ def determine_month_year_from_transactions(transactions: List[Dict[str, Any]]) -
         return "Mixed Months"
 
 
+# Receipt formats picked up by find_receipt_files (matched case-insensitively)
+RECEIPT_EXTENSIONS = ('.pdf', '.png', '.jpg', '.jpeg')
+
+
+def _iter_receipt_files(root: Path) -> Iterator[Path]:
+    """
+    Walk a directory tree once, yielding receipt files.
+    
+    os.scandir entries carry the file type from readdir, so no extra stat is
+    needed per entry, and each directory is read exactly once.
+    
+    Args:
+        root: Directory to search recursively
+        
+    Yields:
+        Paths of files with a receipt extension
+    """
+    try:
+        entries = list(os.scandir(root))
+    except OSError as e:
+        logger.warning(f"Could not read directory {root}: {e}")
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from _iter_receipt_files(Path(entry.path))
+        elif entry.name.lower().endswith(RECEIPT_EXTENSIONS) and entry.is_file():
+            yield Path(entry.path)
+
+
 class ReceiptProcessor:
     """Main processor for batch receipt OCR and extraction."""
     
@@ -130,12 +163,15 @@ class ReceiptProcessor:
         """
         self.device = device
         self.lite = lite
+        self.rules_path = rules_path
         self.max_workers = max_workers
         self.force_ocr = force_ocr
         self.debug = debug
         
-        # Initialize components
-        self.ocr_processor = OCRProcessor(device=device, lite=lite)
+        # Initialize components. OCR models load on the first file that needs
+        # OCR, so batches of embedded-text PDFs never load them.
+        self.ocr_processor = OCRProcessor(device=device, lite=lite, lazy=True)
+        self.ocr_queue: Optional[OCRQueue] = None  # set by process_batch on mps/cuda
         self.parser = JapaneseReceiptParser()
         self.classifier = CategoryClassifier(Path(rules_path))
         self.review_queue = ReviewQueue()
@@ -148,17 +184,21 @@ class ReceiptProcessor:
             'skipped_duplicates': 0,
             'review_items': 0
         }
+        self._stats_lock = threading.Lock()
         
         # Initialize file audit tracker
         self.audit = FileAuditTracker()
+        
+        # Extracted (text, ocr_confidence) by file content hash
+        self._text_cache: Dict[str, Tuple[str, float]] = {}
+    
+    def _count(self, stat: str) -> None:
+        """Increment a processing stat; safe to call from worker threads."""
+        with self._stats_lock:
+            self.stats[stat] += 1
     
     def find_receipt_files(self, input_dir: Path) -> List[Path]:
         """Find all receipt files (PDF and image formats) in the input directory."""
-        receipt_files = []
-        
-        # Support for PDFs and image formats
-        patterns = ['*.pdf', '*.PDF', '*.png', '*.PNG', '*.jpg', '*.JPG', '*.jpeg', '*.JPEG']
-        
         # Log directory structure for debugging
         logger.info(f"Searching for receipt files in: {input_dir}")
         if input_dir.exists():
@@ -166,21 +206,10 @@ class ReceiptProcessor:
             if subdirs:
                 logger.info(f"Found subdirectories: {[d.name for d in subdirs]}")
         
-        for pattern in patterns:
-            # Search current directory
-            current_files = list(input_dir.glob(pattern))
-            receipt_files.extend(current_files)
-            
-            # Search subdirectories recursively
-            subdir_files = list(input_dir.glob(f'**/{pattern}'))
-            receipt_files.extend(subdir_files)
-            
-            # Log findings for debugging
-            if current_files or subdir_files:
-                logger.info(f"Pattern {pattern}: {len(current_files)} in root, {len(subdir_files)} in subdirs")
-        
-        # Remove duplicates and sort
-        receipt_files = sorted(list(set(receipt_files)))
+        # One directory walk covers the root and all subdirectories
+        receipt_files = sorted(_iter_receipt_files(input_dir))
+        root_count = sum(1 for f in receipt_files if f.parent == input_dir)
+        logger.info(f"{root_count} in root, {len(receipt_files) - root_count} in subdirs")
         logger.info(f"Found {len(receipt_files)} total receipt files (PDF/PNG/JPG) in {input_dir}")
         
         # Log each file found for complete audit trail
@@ -193,15 +222,122 @@ class ReceiptProcessor:
         
         return receipt_files
     
+    def prepare_text(self,
+                     receipt_path: Path,
+                     output_dir: Path) -> Tuple[str, Optional[Tuple[str, float]], Optional[List[Any]]]:
+        """
+        Do everything for one receipt that comes before OCR inference (I/O stage).
+        
+        The file's content hash is looked up in memory and then in the OCR JSON
+        cache before any embedded-text check, so reruns over the same input
+        (and duplicate copies of a receipt) skip extraction entirely. Page
+        images are only rendered when OCR is actually needed.
+        
+        Args:
+            receipt_path: Path to receipt file (PDF/PNG/JPG)
+            output_dir: Output directory for OCR JSON
+            
+        Returns:
+            Tuple of (file_hash, (text, ocr_confidence) if no OCR is needed, page images otherwise)
+        """
+        # Read the file once: hashing, the embedded-text check and image
+        # decoding all work from these bytes instead of reopening the file
+        data = receipt_path.read_bytes()
+        file_hash = hash_bytes(data, self.ocr_processor.hash_algo)
+        cached = self._text_cache.get(file_hash)
+        if cached is not None:
+            logger.debug(f"Reusing extracted text for {receipt_path.name}")
+            return file_hash, cached, None
+        
+        cached_path = self.ocr_processor.find_cached_json(receipt_path, output_dir, file_hash)
+        if cached_path:
+            with open(cached_path, 'r', encoding='utf-8') as f:
+                ocr_result = json.load(f)
+            # Embedded-text results do not count as OCR when --force-ocr is set
+            if not (self.force_ocr and ocr_result.get('source') == 'embedded'):
+                logger.info(f"Loading cached OCR result for {receipt_path.name}")
+                cached = (ocr_result['full_text'], ocr_result['confidence'])
+                self._text_cache[file_hash] = cached
+                return file_hash, cached, None
+        
+        # Determine if this is a PDF or image file
+        is_pdf = receipt_path.suffix.lower() == '.pdf'
+        
+        # Check for embedded text first (only for PDFs, unless force_ocr is enabled)
+        text = good_embedded_text(receipt_path, data) if is_pdf and not self.force_ocr else None
+        if text is not None:
+            ocr_confidence = 0.95  # High confidence for embedded text
+            if self.debug:
+                logger.debug(f"Using embedded text for {receipt_path.name}")
+            
+            # Cache embedded text in the same JSON format as OCR results
+            self.ocr_processor.save_result(self.ocr_processor.get_json_path(receipt_path, output_dir, file_hash), {
+                'file_path': str(receipt_path),
+                'file_hash': file_hash,
+                'source': 'embedded',
+                'pages': [{'page_number': 1, 'blocks': [], 'text': text}],
+                'full_text': text,
+                'confidence': ocr_confidence
+            })
+            self._text_cache[file_hash] = (text, ocr_confidence)
+            return file_hash, (text, ocr_confidence), None
+        
+        # Use OCR (for PDFs without embedded text or for image files)
+        if self.debug:
+            logger.debug(f"Using OCR for {receipt_path.name} (force_ocr={self.force_ocr}, is_pdf={is_pdf})")
+        
+        if is_pdf:
+            images = self.ocr_processor.render_pdf(receipt_path)
+        else:
+            # For image files, use direct OCR
+            images = [self.ocr_processor.load_image(receipt_path, data)]
+        return file_hash, None, images
+    
+    def extract_text(self,
+                     receipt_path: Path,
+                     output_dir: Path,
+                     prepared: Optional[Future] = None) -> Tuple[str, float]:
+        """
+        Get the text of a receipt, running OCR only when prepare_text could not.
+        
+        Args:
+            receipt_path: Path to receipt file (PDF/PNG/JPG)
+            output_dir: Output directory for OCR JSON
+            prepared: Future of prepare_text for this file, if it was run ahead
+            
+        Returns:
+            Tuple of (text, ocr_confidence)
+        """
+        if prepared is not None:
+            file_hash, extracted, images = prepared.result()
+        else:
+            file_hash, extracted, images = self.prepare_text(receipt_path, output_dir)
+        if extracted is not None:
+            return extracted
+        
+        logger.info(f"Processing {receipt_path.name} with YomiToku...")
+        if self.ocr_queue is not None:
+            page_results = self.ocr_queue.submit(images).result()
+        else:
+            page_results = self.ocr_processor.run_pages(images)
+        ocr_result = self.ocr_processor.build_result(receipt_path, file_hash, page_results)
+        self.ocr_processor.save_result(self.ocr_processor.get_json_path(receipt_path, output_dir, file_hash), ocr_result)
+        logger.info(f"OCR completed for {receipt_path.name} with confidence: {ocr_result['confidence']:.2f}")
+        
+        self._text_cache[file_hash] = (ocr_result['full_text'], ocr_result['confidence'])
+        return ocr_result['full_text'], ocr_result['confidence']
+    
     def process_single_file(self, 
                           receipt_path: Path, 
-                          output_dir: Path) -> Dict[str, Any]:
+                          output_dir: Path,
+                          prepared: Optional[Future] = None) -> Dict[str, Any]:
         """
         Process a single receipt file (PDF or image).
         
         Args:
             receipt_path: Path to receipt file (PDF/PNG/JPG)
             output_dir: Output directory for OCR JSON
+            prepared: Future of prepare_text for this file, if it was run ahead
             
         Returns:
             Dictionary with extraction results
@@ -209,35 +345,14 @@ class ReceiptProcessor:
         try:
             logger.debug(f"Processing {receipt_path.name}")
             
-            # Determine if this is a PDF or image file
-            is_pdf = receipt_path.suffix.lower() == '.pdf'
-            
-            # Check for embedded text first (only for PDFs, unless force_ocr is enabled)
-            if is_pdf and not self.force_ocr and self.ocr_processor.has_embedded_text(receipt_path):
-                text = self.ocr_processor.extract_embedded_text(receipt_path)
-                ocr_confidence = 0.95  # High confidence for embedded text
-                if self.debug:
-                    logger.debug(f"Using embedded text for {receipt_path.name}")
-            else:
-                # Use OCR (for PDFs without embedded text or for image files)
-                if self.debug:
-                    logger.debug(f"Using OCR for {receipt_path.name} (force_ocr={self.force_ocr}, is_pdf={is_pdf})")
-                
-                if is_pdf:
-                    ocr_result = self.ocr_processor.extract_text_from_pdf(receipt_path, output_dir)
-                else:
-                    # For image files, use direct OCR
-                    ocr_result = self.ocr_processor.extract_text_from_image(receipt_path, output_dir)
-                text = ocr_result['full_text']
-                ocr_confidence = ocr_result['confidence']
+            text, ocr_confidence = self.extract_text(receipt_path, output_dir, prepared)
             
             # Update audit: OCR successful
             self.audit.update_file(receipt_path, ocr='success', status='ocr_complete')
             
             # Extract structured data
-            date = self.parser.parse_date(text)
-            amount = self.parser.parse_amount(text)
-            vendor = self.parser.parse_vendor(text)
+            fields = self.parser.parse_all(text)
+            date, amount, vendor = fields['date'], fields['amount'], fields['vendor']
             
             # Classify category first
             category, category_confidence = self.classifier.classify(vendor, "", text)
@@ -252,7 +367,7 @@ class ReceiptProcessor:
             description = self.parser.extract_description_context(text, vendor, amount, category)
             
             # Check if needs review
-            self.review_queue.add_from_extraction(
+            needs_review = self.review_queue.add_from_extraction(
                 file_path=str(receipt_path),
                 date=date,
                 amount=amount,
@@ -271,7 +386,7 @@ class ReceiptProcessor:
                 'vendor': vendor,
                 'ocr_confidence': ocr_confidence,
                 'category_confidence': category_confidence,
-                'needs_review': len(self.review_queue.items) > self.stats['review_items']
+                'needs_review': needs_review
             }
             
             # Update audit with final status
@@ -280,12 +395,12 @@ class ReceiptProcessor:
             else:
                 self.audit.update_file(receipt_path, status='processed')
             
-            self.stats['processed'] += 1
+            self._count('processed')
             return result
             
         except Exception as e:
             logger.error(f"Failed to process {receipt_path}: {e}")
-            self.stats['failed'] += 1
+            self._count('failed')
             
             # Update audit with failure
             self.audit.update_file(receipt_path, 
@@ -312,18 +427,36 @@ class ReceiptProcessor:
                 'error': str(e)
             }
     
+    def _merge_worker_result(self,
+                             receipt_path: Path,
+                             result: Dict[str, Any],
+                             review_items: List[ReviewItem],
+                             audit_entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Fold a worker process's review items, audit entry and outcome into this processor."""
+        self.review_queue.items.extend(review_items)
+        self.audit.update_file(receipt_path, **audit_entry)
+        if 'error' in result:
+            self._count('failed')
+        else:
+            self._count('processed')
+        return result
+    
     def process_batch(self, 
                      input_dir: Path, 
-                     output_dir: Path) -> List[Dict[str, Any]]:
+                     output_dir: Path) -> Iterator[Dict[str, Any]]:
         """
         Process all PDF files in the input directory.
         
+        Results are yielded as files finish, so callers can consume them
+        without the whole batch being held in memory. Stats and the review
+        item count are final once the generator is exhausted.
+        
         Args:
             input_dir: Directory containing PDF files
             output_dir: Output directory for results
             
-        Returns:
-            List of extraction results
+        Yields:
+            Extraction result for each file, in completion order
         """
         # Find all PDF files
         receipt_files = self.find_receipt_files(input_dir)
@@ -331,21 +464,75 @@ class ReceiptProcessor:
         
         if not receipt_files:
             logger.warning("No receipt files found!")
-            return []
+            return
         
         # Create output directory
         ocr_output_dir = output_dir / 'ocr_json'
         ocr_output_dir.mkdir(parents=True, exist_ok=True)
         
         # Process files with progress bar
-        results = []
+        result_paths = set()
+        
+        # On CPU, OCR and rasterization fight the GIL, so each file runs in a
+        # worker process with its own models. GPU devices hold a single model
+        # copy: files are rendered and parsed on threads in this process, and
+        # their pages go through an OCRQueue whose single thread runs inference.
+        in_workers = self.device == 'cpu'
+        config = {
+            'device': self.device,
+            'lite': self.lite,
+            'rules_path': self.rules_path,
+            'force_ocr': self.force_ocr,
+            'debug': self.debug
+        }
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all jobs
-            future_to_file = {
-                executor.submit(self.process_single_file, receipt_file, ocr_output_dir): receipt_file
-                for receipt_file in receipt_files
-            }
+        with ExitStack() as stack:
+            if in_workers:
+                executor = stack.enter_context(ProcessPoolExecutor(
+                    max_workers=self.max_workers, initializer=_init_worker, initargs=(config,)))
+                # If the caller stops early, drop queued files instead of processing them all
+                stack.callback(executor.shutdown, cancel_futures=True)
+                future_to_file = {
+                    executor.submit(_process_file_in_worker, receipt_file, ocr_output_dir): receipt_file
+                    for receipt_file in receipt_files
+                }
+            else:
+                # Render threads hash, read and rasterize up to two files per
+                # worker ahead of OCR, so the device does not wait on PDF decoding
+                # (a plain Semaphore: files cancelled during shutdown release a
+                # slot they never took, which is harmless once nothing waits)
+                slots = threading.Semaphore(2 * self.max_workers)
+                stopping = threading.Event()
+                
+                def prepare(receipt_file: Path):
+                    # Wait for a read-ahead slot, giving up once the batch is shutting down
+                    while not slots.acquire(timeout=0.5):
+                        if stopping.is_set():
+                            raise RuntimeError("Batch processing stopped")
+                    return self.prepare_text(receipt_file, ocr_output_dir)
+                
+                def process(receipt_file: Path, prepared: Future) -> Dict[str, Any]:
+                    try:
+                        return self.process_single_file(receipt_file, ocr_output_dir, prepared)
+                    finally:
+                        slots.release()
+                
+                render_pool = stack.enter_context(
+                    ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="receipt-render"))
+                self.ocr_queue = stack.enter_context(OCRQueue(self.ocr_processor))
+                stack.callback(setattr, self, 'ocr_queue', None)
+                executor = stack.enter_context(ThreadPoolExecutor(max_workers=self.max_workers))
+                
+                # Callbacks unwind in reverse: if the caller stops early, queued
+                # files are cancelled and running ones drain while the OCR queue is
+                # still alive, so no thread falls back to calling run_pages itself
+                stack.callback(executor.shutdown, cancel_futures=True)
+                stack.callback(render_pool.shutdown, wait=False, cancel_futures=True)
+                stack.callback(stopping.set)
+                future_to_file = {
+                    executor.submit(process, receipt_file, render_pool.submit(prepare, receipt_file)): receipt_file
+                    for receipt_file in receipt_files
+                }
             
             # Process results with progress bar
             with tqdm(total=len(receipt_files), desc="Processing receipts") as pbar:
@@ -353,36 +540,75 @@ class ReceiptProcessor:
                     receipt_file = future_to_file[future]
                     try:
                         result = future.result()
-                        results.append(result)
+                        if in_workers:
+                            result = self._merge_worker_result(receipt_file, *result)
                     except Exception as e:
                         logger.error(f"Exception processing {receipt_file}: {e}")
-                        self.stats['failed'] += 1
+                        self._count('failed')
+                        result = None
                     
                     pbar.update(1)
                     pbar.set_postfix({
                         'processed': self.stats['processed'],
                         'failed': self.stats['failed']
                     })
+                    
+                    if result:
+                        result_paths.add(result.get('file_path', ''))
+                        yield result
         
         self.stats['review_items'] = len(self.review_queue.items)
         
         # Validate that all found files were processed
-        processed_files = len(results)
+        processed_files = len(result_paths)
         if processed_files != len(receipt_files):
             missing_count = len(receipt_files) - processed_files
             logger.warning(f"⚠️  File processing mismatch! Found {len(receipt_files)} files but only processed {processed_files}")
             logger.warning(f"   {missing_count} files may have been skipped or failed processing")
             
             # Log which files might be missing from results
-            result_paths = {r.get('file_path', '') for r in results if r}
+            result_names = {Path(p).name for p in result_paths}
             for receipt_file in receipt_files:
-                if str(receipt_file) not in result_paths and receipt_file.name not in {Path(p).name for p in result_paths}:
+                if str(receipt_file) not in result_paths and receipt_file.name not in result_names:
                     logger.warning(f"   Potentially missed: {receipt_file}")
         
         logger.info(f"Batch processing complete. Processed: {self.stats['processed']}, "
                    f"Failed: {self.stats['failed']}, Review items: {self.stats['review_items']}")
+
+
+# One ReceiptProcessor per worker process, built by _init_worker so the OCR
+# models and category rules load once per worker instead of once per file
+_worker: Optional[ReceiptProcessor] = None
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """
+    ProcessPoolExecutor initializer that builds the worker's ReceiptProcessor.
+    
+    Args:
+        config: ReceiptProcessor keyword arguments (device, lite, rules_path, ...)
+    """
+    global _worker
+    if config.get('debug'):
+        logging.getLogger().setLevel(logging.DEBUG)
+    _worker = ReceiptProcessor(max_workers=1, **config)
+
+
+def _process_file_in_worker(receipt_path: Path, output_dir: Path) -> Tuple[Dict[str, Any], List[ReviewItem], Dict[str, Any]]:
+    """
+    Process one receipt with the worker's ReceiptProcessor.
+    
+    Args:
+        receipt_path: Path to receipt file (PDF/PNG/JPG)
+        output_dir: Output directory for OCR JSON
         
-        return results
+    Returns:
+        Tuple of (result dict, review items it added, audit entry for the file)
+    """
+    _worker.review_queue.items = []
+    _worker.audit.add_file(receipt_path)
+    result = _worker.process_single_file(receipt_path, output_dir)
+    return result, _worker.review_queue.items, _worker.audit.files.pop(str(receipt_path))
 
 
 @click.group()
@@ -456,16 +682,13 @@ def run(input_dir: Path,
             debug=debug
         )
         
-        # Process all files
-        results = processor.process_batch(input_dir, output_dir)
-        
-        if not results:
-            logger.error("No files were processed successfully!")
-            return
-        
-        # Filter successful extractions for Excel export
+        # Process all files, keeping only what the Excel export needs
         transactions = []
-        for result in results:
+        result_count = 0
+        for result in processor.process_batch(input_dir, output_dir):
+            result_count += 1
+            
+            # Filter successful extractions for Excel export
             if result.get('date') and result.get('amount'):
                 transaction = ExcelExporter.create_transaction_dict(
                     date=result['date'],
@@ -476,6 +699,10 @@ def run(input_dir: Path,
                 )
                 transactions.append(transaction)
         
+        if not result_count:
+            logger.error("No files were processed successfully!")
+            return
+        
         # Determine month/year for filename
         month_year = determine_month_year_from_transactions(transactions)
         
@@ -0,0 +1,86 @@
+"""Embedded-text extraction for PDFs that do not need OCR.
+
+Only pdfminer is used here, so checking a PDF for a usable text layer never
+imports YomiToku or loads OCR models.
+"""
+
+import io
+import logging
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def extract_embedded_text(pdf_path: Path) -> str:
+    """Extract embedded text from PDF."""
+    try:
+        from pdfminer.high_level import extract_text
+        return extract_text(str(pdf_path))
+    except Exception as e:
+        logger.error(f"Failed to extract embedded text from {pdf_path}: {e}")
+        return ""
+
+
+def good_embedded_text(pdf_path: Path, data: Optional[bytes] = None) -> Optional[str]:
+    """
+    Embedded text of a PDF if it is GOOD QUALITY (to skip OCR if possible).
+
+    The text is extracted once and returned, so callers do not need a second
+    pdfminer pass after the quality check.
+
+    Args:
+        pdf_path: Path to PDF file
+        data: The PDF's bytes, if the caller has already read the file
+
+    Returns:
+        The embedded text, or None if it is missing or looks unreliable
+    """
+    try:
+        from pdfminer.high_level import extract_text
+        text = extract_text(io.BytesIO(data) if data is not None else str(pdf_path))
+
+        # More strict criteria for embedded text quality
+        if len(text.strip()) > 100:
+            # Check for signs of good quality text
+            lines = text.split('\n')
+            readable_lines = 0
+            total_chars = 0
+
+            for line in lines:
+                line = line.strip()
+                if len(line) > 3:
+                    total_chars += len(line)
+                    # Count lines that look readable (not too many weird chars)
+                    weird_chars = sum(1 for c in line if ord(c) < 32 or ord(c) > 126)
+                    if weird_chars / len(line) < 0.3:  # Less than 30% weird characters
+                        readable_lines += 1
+
+            # Only use embedded text if it looks high quality
+            quality_good = readable_lines >= 3 and total_chars > 50
+
+            if quality_good:
+                logger.info(f"{pdf_path.name} has good embedded text, extracting directly")
+                return text
+            else:
+                logger.info(f"{pdf_path.name} has poor embedded text, will use OCR instead")
+                return None
+
+        return None
+
+    except Exception as e:
+        logger.warning(f"Could not check embedded text for {pdf_path}: {e}")
+        return None
+
+
+def has_embedded_text(pdf_path: Path) -> bool:
+    """
+    Check if PDF has GOOD QUALITY embedded text (to skip OCR if possible).
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Returns:
+        True if PDF has substantial, good quality embedded text
+    """
+    return good_embedded_text(pdf_path) is not None
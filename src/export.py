@@ -1,7 +1,7 @@
 """Excel export functionality for transactions and review data."""
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 import pandas as pd
 from openpyxl import Workbook
@@ -98,9 +98,42 @@ class ExcelExporter:
             logger.error(f"Failed to export Excel file: {e}")
             raise
     
-    def _create_consolidated_sheet(self, transactions: List[Dict[str, Any]], review_items: List[ReviewItem], include_summary: bool = True):
+    def export_many(self,
+                    batches: Dict[str, Tuple[List[Dict[str, Any]], List[ReviewItem]]],
+                    include_summary: bool = True):
+        """
+        Export several periods to one workbook, one consolidated sheet each.
+        
+        The workbook and styles are set up once and saved once, instead of
+        writing a separate file per month.
+        
+        Args:
+            batches: Sheet title (e.g. "January 2025") -> (transactions, review_items)
+            include_summary: Whether to include the summary section on each sheet
+        """
+        try:
+            # Remove default sheet
+            if "Sheet" in self.workbook.sheetnames:
+                self.workbook.remove(self.workbook["Sheet"])
+            
+            for title, (transactions, review_items) in batches.items():
+                self._create_consolidated_sheet(transactions, review_items, include_summary, title=title)
+            
+            # Save workbook
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            self.workbook.save(str(self.output_path))
+            
+            logger.info(f"Excel file with {len(batches)} sheets exported to: {self.output_path}")
+            
+        except Exception as e:
+            logger.error(f"Failed to export Excel file: {e}")
+            raise
+    
+    def _create_consolidated_sheet(self, transactions: List[Dict[str, Any]], review_items: List[ReviewItem],
+                                   include_summary: bool = True, title: str = "All Transactions"):
         """Create a single consolidated sheet with transactions, review items, and summary."""
-        ws = self.workbook.create_sheet("All Transactions")
+        # Excel limits sheet titles to 31 characters
+        ws = self.workbook.create_sheet(title[:31])
         
         current_row = 1
         
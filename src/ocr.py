@@ -1,11 +1,17 @@
 """YomiToku OCR wrapper for Japanese text extraction."""
 
+import os
 import logging
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple, Union
+from collections import deque
 import hashlib
+import tempfile
 import asyncio
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
 import cv2
 import numpy as np
 
@@ -16,24 +22,74 @@ except ImportError:
     print("Required packages not installed. Run: pip install yomitoku pdf2image")
     raise
 
+try:
+    from .embedded_text import has_embedded_text, extract_embedded_text
+except ImportError:
+    from embedded_text import has_embedded_text, extract_embedded_text
+
 logger = logging.getLogger(__name__)
 
+# Content hash used in OCR JSON names (<stem>_<hash>.json). MD5 by default;
+# HASH_ALGO=xxh128 (xxh3_128) or HASH_ALGO=blake2b (16-byte digest, stdlib)
+# switch new files to a faster hash of the same 32-hex-char length, while
+# existing MD5-named results are still found.
+HASH_ALGO = os.environ.get('HASH_ALGO', 'md5')
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def new_hasher(algo: str = HASH_ALGO):
+    """Create an incremental hasher for a supported content-hash algorithm."""
+    if algo == 'md5':
+        return hashlib.md5(usedforsecurity=False)
+    if algo == 'xxh128':
+        try:
+            import xxhash
+        except ImportError:
+            print("HASH_ALGO=xxh128 requires xxhash. Run: pip install xxhash")
+            raise
+        return xxhash.xxh3_128()
+    if algo == 'blake2b':
+        return hashlib.blake2b(digest_size=16)
+    raise ValueError(f"Unsupported HASH_ALGO: {algo}")
+
+
+def compute_file_hash(file_path: Path, algo: str = HASH_ALGO) -> str:
+    """Hash a file's content, streamed in 1 MiB chunks."""
+    hasher = new_hasher(algo)
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def hash_bytes(data: bytes, algo: str = HASH_ALGO) -> str:
+    """Hash content already in memory (same digest as compute_file_hash)."""
+    hasher = new_hasher(algo)
+    hasher.update(data)
+    return hasher.hexdigest()
+
 
 class OCRProcessor:
     """Wrapper for YomiToku DocumentAnalyzer with Japanese optimization."""
     
-    def __init__(self, device: str = "mps", lite: bool = False):
+    def __init__(self, device: str = "mps", lite: bool = False, hash_algo: str = HASH_ALGO,
+                 lazy: bool = False):
         """
         Initialize OCR processor.
         
         Args:
             device: Device to use ('mps', 'cuda', 'cpu')
             lite: Use lite models for faster processing
+            hash_algo: Content hash for cache file names ('md5', 'xxh128' or 'blake2b')
+            lazy: Load the models on the first OCR call instead of now
         """
         self.device = device
         self.lite = lite
+        self.hash_algo = hash_algo
         self.analyzer = None
-        self._init_analyzer()
+        self._analyzer_lock = threading.Lock()
+        if not lazy:
+            self._init_analyzer()
         
     def _init_analyzer(self):
         """Initialize YomiToku DocumentAnalyzer."""
@@ -53,190 +109,119 @@ class OCRProcessor:
             raise
     
     def get_file_hash(self, file_path: Path) -> str:
-        """Generate hash for file to detect duplicates."""
-        with open(file_path, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
+        """Generate hash for file to detect duplicates (streamed in 1 MiB chunks)."""
+        return compute_file_hash(file_path, self.hash_algo)
     
-    def extract_text_from_pdf(self, pdf_path: Path, output_dir: Path) -> Dict[str, Any]:
+    def get_json_path(self, source_path: Path, output_dir: Path, file_hash: str) -> Path:
+        """Location of the cached OCR JSON for a source file."""
+        return output_dir / f"{source_path.stem}_{file_hash}.json"
+    
+    def find_cached_json(self, source_path: Path, output_dir: Path, file_hash: str) -> Optional[Path]:
+        """Existing OCR JSON for a source file, including legacy MD5-named results."""
+        json_path = self.get_json_path(source_path, output_dir, file_hash)
+        if json_path.exists():
+            return json_path
+        if self.hash_algo != 'md5':
+            legacy_path = self.get_json_path(source_path, output_dir, compute_file_hash(source_path, 'md5'))
+            if legacy_path.exists():
+                return legacy_path
+        return None
+    
+    def render_pdf(self, pdf_path: Path) -> List[np.ndarray]:
         """
-        Extract text from PDF using YomiToku.
+        Render PDF pages to BGR arrays ready for YomiToku (CPU-bound stage).
         
         Args:
             pdf_path: Path to PDF file
-            output_dir: Directory to save OCR JSON results
             
         Returns:
-            Dictionary with OCR results and metadata
+            One image array per page
         """
-        try:
-            file_hash = self.get_file_hash(pdf_path)
-            
-            # Check if already processed
-            json_path = output_dir / f"{pdf_path.stem}_{file_hash}.json"
-            if json_path.exists():
-                logger.info(f"Loading cached OCR result for {pdf_path.name}")
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            
-            logger.info(f"Processing {pdf_path.name} with YomiToku...")
-            
-            # Convert PDF to images
-            images = convert_from_path(str(pdf_path), dpi=200)
-            logger.info(f"Converted PDF to {len(images)} image(s)")
-            
-            # Process each page with YomiToku
-            ocr_result = {
-                'file_path': str(pdf_path),
-                'file_hash': file_hash,
-                'pages': [],
-                'full_text': '',
-                'confidence': 0.0
-            }
-            
-            full_text_parts = []
-            total_confidence = 0
-            block_count = 0
-            
-            async def process_page(page_img, page_idx):
-                # Convert PIL image to numpy array for YomiToku
-                img_array = np.array(page_img)
-                if img_array.shape[2] == 4:  # RGBA
-                    img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)
-                elif img_array.shape[2] == 3:  # RGB
-                    img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-                
-                # Workaround for YomiToku bug: set img attribute
-                self.analyzer.img = img_array
-                
-                # Process with YomiToku
-                result = await self.analyzer.run(img_array)
-                return result, page_idx
-            
-            async def process_all_pages():
-                tasks = [process_page(img, idx) for idx, img in enumerate(images)]
-                return await asyncio.gather(*tasks)
-            
-            # Run async processing
-            page_results = asyncio.run(process_all_pages())
-            
-            for result, page_idx in page_results:
-                page_data = {
-                    'page_number': page_idx + 1,
-                    'blocks': [],
-                    'text': ''
-                }
-                
-                page_text_parts = []
-                
-                # Extract text from YomiToku result (tuple format)
-                if isinstance(result, tuple) and len(result) > 0:
-                    document_schema = result[0]
-                    
-                    # Use words directly since they contain the actual text
-                    if hasattr(document_schema, 'words') and document_schema.words:
-                        word_texts = []
-                        word_confidences = []
-                        
-                        for word in document_schema.words:
-                            if hasattr(word, 'content') and word.content.strip():
-                                word_texts.append(word.content)
-                                word_confidences.append(getattr(word, 'rec_score', 0.8))
-                        
-                        if word_texts:
-                            # Create one block with all text
-                            combined_text = '\n'.join(word_texts)  # Use newlines to separate words for better parsing
-                            avg_confidence = sum(word_confidences) / len(word_confidences) if word_confidences else 0.8
-                            
-                            block_data = {
-                                'text': combined_text,
-                                'confidence': avg_confidence
-                            }
-                            page_data['blocks'].append(block_data)
-                            page_text_parts.append(combined_text)
-                            
-                            total_confidence += avg_confidence
-                            block_count += 1
-                
-                page_data['text'] = '\\n'.join(page_text_parts)
-                ocr_result['pages'].append(page_data)
-                full_text_parts.append(page_data['text'])
-            
-            ocr_result['full_text'] = '\\n'.join(full_text_parts)
-            ocr_result['confidence'] = total_confidence / block_count if block_count > 0 else 0.7
-            
-            # Save OCR result to JSON
-            output_dir.mkdir(parents=True, exist_ok=True)
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(ocr_result, f, ensure_ascii=False, indent=2)
-            
-            logger.info(f"OCR completed for {pdf_path.name} with confidence: {ocr_result['confidence']:.2f}")
-            return ocr_result
-            
-        except Exception as e:
-            logger.error(f"OCR failed for {pdf_path}: {e}")
-            raise
+        images = convert_from_path(str(pdf_path), dpi=200)
+        logger.info(f"Converted PDF to {len(images)} image(s)")
+        
+        arrays = []
+        for page_img in images:
+            # Convert PIL image to numpy array for YomiToku
+            img_array = np.array(page_img)
+            if img_array.shape[2] == 4:  # RGBA
+                img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)
+            elif img_array.shape[2] == 3:  # RGB
+                img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
+            arrays.append(img_array)
+        return arrays
     
-    def extract_text_from_image(self, image_path: Path, output_dir: Path) -> Dict[str, Any]:
+    def load_image(self, image_path: Path, data: Optional[bytes] = None) -> np.ndarray:
+        """Load an image file (or its already-read bytes) as an array ready for YomiToku."""
+        if data is not None:
+            img_array = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        else:
+            img_array = cv2.imread(str(image_path))
+        if img_array is None:
+            raise ValueError(f"Could not load image: {image_path}")
+        
+        # Convert BGR to RGB for YomiToku
+        return cv2.cvtColor(img_array, cv2.COLOR_BGR2RGB)
+    
+    def run_pages(self, images: List[np.ndarray]) -> List[Any]:
         """
-        Extract text from image using YomiToku.
+        Run YomiToku over page images (device-bound stage).
         
         Args:
-            image_path: Path to image file (PNG/JPG/JPEG)
-            output_dir: Directory to save OCR JSON results
+            images: Page arrays from render_pdf/load_image
             
         Returns:
-            Dictionary with OCR results and metadata
+            Raw YomiToku results in page order
         """
-        try:
-            file_hash = self.get_file_hash(image_path)
-            
-            # Check if already processed
-            json_path = output_dir / f"{image_path.stem}_{file_hash}.json"
-            if json_path.exists():
-                logger.info(f"Loading cached OCR result for {image_path.name}")
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            
-            logger.info(f"Processing {image_path.name} with YomiToku...")
-            
-            # Load image directly
-            import cv2
-            img_array = cv2.imread(str(image_path))
-            if img_array is None:
-                raise ValueError(f"Could not load image: {image_path}")
-            
-            # Convert BGR to RGB for YomiToku
-            img_array = cv2.cvtColor(img_array, cv2.COLOR_BGR2RGB)
+        if self.analyzer is None:
+            with self._analyzer_lock:
+                if self.analyzer is None:
+                    self._init_analyzer()
+        
+        async def process_page(img_array):
+            # Workaround for YomiToku bug: set img attribute
+            self.analyzer.img = img_array
             
             # Process with YomiToku
-            ocr_result = {
-                'file_path': str(image_path),
-                'file_hash': file_hash,
-                'pages': [],
-                'full_text': '',
-                'confidence': 0.0
-            }
-            
-            async def process_image():
-                # Workaround for YomiToku bug: set img attribute
-                self.analyzer.img = img_array
-                
-                # Process with YomiToku
-                result = await self.analyzer.run(img_array)
-                return result
-            
-            # Run async processing
-            result = asyncio.run(process_image())
+            return await self.analyzer.run(img_array)
+        
+        async def process_all_pages():
+            return await asyncio.gather(*(process_page(img) for img in images))
+        
+        return list(asyncio.run(process_all_pages()))
+    
+    def build_result(self, source_path: Path, file_hash: str, page_results: List[Any]) -> Dict[str, Any]:
+        """
+        Assemble the OCR JSON document from raw YomiToku page results.
+        
+        Args:
+            source_path: Original PDF/image path
+            file_hash: Hash of the source file
+            page_results: Results from run_pages
             
+        Returns:
+            Dictionary with OCR results and metadata
+        """
+        ocr_result = {
+            'file_path': str(source_path),
+            'file_hash': file_hash,
+            'pages': [],
+            'full_text': '',
+            'confidence': 0.0
+        }
+        
+        full_text_parts = []
+        total_confidence = 0
+        block_count = 0
+        
+        for page_idx, result in enumerate(page_results):
             page_data = {
-                'page_number': 1,
+                'page_number': page_idx + 1,
                 'blocks': [],
                 'text': ''
             }
             
             page_text_parts = []
-            total_confidence = 0
-            block_count = 0
             
             # Extract text from YomiToku result (tuple format)
             if isinstance(result, tuple) and len(result) > 0:
@@ -269,13 +254,96 @@ class OCRProcessor:
             
             page_data['text'] = '\\n'.join(page_text_parts)
             ocr_result['pages'].append(page_data)
-            ocr_result['full_text'] = page_data['text']
-            ocr_result['confidence'] = total_confidence / block_count if block_count > 0 else 0.7
+            full_text_parts.append(page_data['text'])
+        
+        ocr_result['full_text'] = '\\n'.join(full_text_parts)
+        ocr_result['confidence'] = total_confidence / block_count if block_count > 0 else 0.7
+        return ocr_result
+    
+    def save_result(self, json_path: Path, ocr_result: Dict[str, Any]) -> None:
+        """Write an OCR result to its JSON cache file (I/O stage).
+        
+        The JSON is written to a temporary file and renamed into place, so an
+        interrupted run never leaves a truncated cache entry behind.
+        """
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=json_path.parent, prefix=f".{json_path.stem}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(ocr_result, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, json_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def extract_text_from_pdf(self, pdf_path: Path, output_dir: Path) -> Dict[str, Any]:
+        """
+        Extract text from PDF using YomiToku.
+        
+        Args:
+            pdf_path: Path to PDF file
+            output_dir: Directory to save OCR JSON results
+            
+        Returns:
+            Dictionary with OCR results and metadata
+        """
+        try:
+            file_hash = self.get_file_hash(pdf_path)
+            
+            # Check if already processed
+            cached_path = self.find_cached_json(pdf_path, output_dir, file_hash)
+            if cached_path:
+                logger.info(f"Loading cached OCR result for {pdf_path.name}")
+                with open(cached_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            json_path = self.get_json_path(pdf_path, output_dir, file_hash)
+            
+            logger.info(f"Processing {pdf_path.name} with YomiToku...")
+            
+            # Convert PDF to images and process each page with YomiToku
+            images = self.render_pdf(pdf_path)
+            ocr_result = self.build_result(pdf_path, file_hash, self.run_pages(images))
             
             # Save OCR result to JSON
-            output_dir.mkdir(parents=True, exist_ok=True)
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(ocr_result, f, ensure_ascii=False, indent=2)
+            self.save_result(json_path, ocr_result)
+            
+            logger.info(f"OCR completed for {pdf_path.name} with confidence: {ocr_result['confidence']:.2f}")
+            return ocr_result
+            
+        except Exception as e:
+            logger.error(f"OCR failed for {pdf_path}: {e}")
+            raise
+    
+    def extract_text_from_image(self, image_path: Path, output_dir: Path) -> Dict[str, Any]:
+        """
+        Extract text from image using YomiToku.
+        
+        Args:
+            image_path: Path to image file (PNG/JPG/JPEG)
+            output_dir: Directory to save OCR JSON results
+            
+        Returns:
+            Dictionary with OCR results and metadata
+        """
+        try:
+            file_hash = self.get_file_hash(image_path)
+            
+            # Check if already processed
+            cached_path = self.find_cached_json(image_path, output_dir, file_hash)
+            if cached_path:
+                logger.info(f"Loading cached OCR result for {image_path.name}")
+                with open(cached_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            json_path = self.get_json_path(image_path, output_dir, file_hash)
+            
+            logger.info(f"Processing {image_path.name} with YomiToku...")
+            
+            # Load image directly and process with YomiToku
+            img_array = self.load_image(image_path)
+            ocr_result = self.build_result(image_path, file_hash, self.run_pages([img_array]))
+            
+            # Save OCR result to JSON
+            self.save_result(json_path, ocr_result)
             
             logger.info(f"OCR completed for {image_path.name} with confidence: {ocr_result['confidence']:.2f}")
             return ocr_result
@@ -284,6 +352,64 @@ class OCRProcessor:
             logger.error(f"OCR failed for {image_path}: {e}")
             raise
     
+    def extract_text_from_files(self, file_paths: Iterable[Path], output_dir: Path,
+                                prefetch: int = 1) -> Iterator[Tuple[Path, Union[Dict[str, Any], Exception]]]:
+        """
+        Extract text from many PDFs/images, decoding ahead of inference.
+        
+        While YomiToku runs on one file, the next `prefetch` files are hashed
+        and rendered on worker threads (double buffering), so the device is not
+        idle during PDF decoding. Results come back in input order.
+        
+        Args:
+            file_paths: PDF/image paths to process
+            output_dir: Directory to save OCR JSON results
+            prefetch: Number of files to render ahead
+            
+        Yields:
+            (file_path, OCR result dict) or (file_path, exception) on failure
+        """
+        def prepare(path: Path):
+            file_hash = self.get_file_hash(path)
+            cached_path = self.find_cached_json(path, output_dir, file_hash)
+            if cached_path:
+                return file_hash, cached_path, None
+            if path.suffix.lower() == '.pdf':
+                return file_hash, None, self.render_pdf(path)
+            return file_hash, None, [self.load_image(path)]
+        
+        paths = iter(file_paths)
+        window = deque()
+        
+        with ThreadPoolExecutor(max_workers=max(1, prefetch), thread_name_prefix="ocr-render") as pool:
+            def fill():
+                while len(window) <= prefetch:
+                    path = next(paths, None)
+                    if path is None:
+                        return
+                    window.append((path, pool.submit(prepare, path)))
+            
+            fill()
+            while window:
+                path, future = window.popleft()
+                fill()  # start rendering the next file before running OCR on this one
+                try:
+                    file_hash, cached_path, images = future.result()
+                    if cached_path:
+                        logger.info(f"Loading cached OCR result for {path.name}")
+                        with open(cached_path, 'r', encoding='utf-8') as f:
+                            ocr_result = json.load(f)
+                    else:
+                        logger.info(f"Processing {path.name} with YomiToku...")
+                        ocr_result = self.build_result(path, file_hash, self.run_pages(images))
+                        self.save_result(self.get_json_path(path, output_dir, file_hash), ocr_result)
+                        logger.info(f"OCR completed for {path.name} with confidence: {ocr_result['confidence']:.2f}")
+                except Exception as e:
+                    logger.error(f"OCR failed for {path}: {e}")
+                    yield path, e
+                    continue
+                yield path, ocr_result
+    
     def has_embedded_text(self, pdf_path: Path) -> bool:
         """
         Check if PDF has GOOD QUALITY embedded text (to skip OCR if possible).
@@ -294,47 +420,145 @@ class OCRProcessor:
         Returns:
             True if PDF has substantial, good quality embedded text
         """
-        try:
-            from pdfminer.high_level import extract_text
-            text = extract_text(str(pdf_path))
-            
-            # More strict criteria for embedded text quality
-            if len(text.strip()) > 100:
-                # Check for signs of good quality text
-                lines = text.split('\n')
-                readable_lines = 0
-                total_chars = 0
-                
-                for line in lines:
-                    line = line.strip()
-                    if len(line) > 3:
-                        total_chars += len(line)
-                        # Count lines that look readable (not too many weird chars)
-                        weird_chars = sum(1 for c in line if ord(c) < 32 or ord(c) > 126)
-                        if weird_chars / len(line) < 0.3:  # Less than 30% weird characters
-                            readable_lines += 1
-                
-                # Only use embedded text if it looks high quality
-                quality_good = readable_lines >= 3 and total_chars > 50
-                
-                if quality_good:
-                    logger.info(f"{pdf_path.name} has good embedded text, extracting directly")
-                    return True
-                else:
-                    logger.info(f"{pdf_path.name} has poor embedded text, will use OCR instead")
-                    return False
-            
-            return False
-            
-        except Exception as e:
-            logger.warning(f"Could not check embedded text for {pdf_path}: {e}")
-            return False
+        return has_embedded_text(pdf_path)
     
     def extract_embedded_text(self, pdf_path: Path) -> str:
         """Extract embedded text from PDF."""
-        try:
-            from pdfminer.high_level import extract_text
-            return extract_text(str(pdf_path))
-        except Exception as e:
-            logger.error(f"Failed to extract embedded text from {pdf_path}: {e}")
-            return ""
\ No newline at end of file
+        return extract_embedded_text(pdf_path)
+
+
+class OCRQueue:
+    """Serialize OCR inference from many threads onto one consumer thread.
+    
+    Callers submit the rendered pages of one file and get a Future for that
+    file's page results. A single background thread runs the queued files in
+    submission order, one page at a time, so the shared analyzer (which relies
+    on the analyzer.img workaround) never sees concurrent inferences while
+    rendering and writing happen on other threads. A failing page only fails
+    the file it belongs to.
+    """
+    
+    def __init__(self, ocr_processor: OCRProcessor):
+        """
+        Initialize queue.
+        
+        Args:
+            ocr_processor: Processor whose run_pages performs inference
+        """
+        self.ocr_processor = ocr_processor
+        self._queue = queue.Queue()  # (images, future), None to stop
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="ocr-queue", daemon=True)
+        self._thread.start()
+    
+    def submit(self, images: List[np.ndarray]) -> Future:
+        """Queue one file's page images; the Future resolves to its page results."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("OCRQueue is closed")
+            self._queue.put((images, future))
+        return future
+    
+    def close(self) -> None:
+        """Finish the queued files and stop the background thread."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._thread.join()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            file_images, future = item
+            try:
+                results = [self.ocr_processor.run_pages([img])[0] for img in file_images]
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            future.set_result(results)
+
+
+# One OCRProcessor per worker process, built by init_ocr_worker so the models
+# load once per worker instead of once per file
+_worker_processor: Optional[OCRProcessor] = None
+
+
+def _build_processor(device: str, lite: bool, fallback_device: Optional[str]) -> OCRProcessor:
+    """OCRProcessor on `device`, retrying on `fallback_device` if initialization fails."""
+    try:
+        return OCRProcessor(device=device, lite=lite)
+    except Exception as e:
+        if not fallback_device:
+            raise
+        logger.warning(f"Failed to initialize OCR on {device}: {e}; retrying with {fallback_device}")
+        return OCRProcessor(device=fallback_device, lite=lite)
+
+
+def init_ocr_worker(device: str = "mps", lite: bool = False, fallback_device: Optional[str] = None) -> None:
+    """
+    ProcessPoolExecutor initializer that builds the worker's OCRProcessor.
+    
+    Args:
+        device: Device to use ('mps', 'cuda', 'cpu')
+        lite: Use lite models for faster processing
+        fallback_device: Device to retry with if `device` fails to initialize
+    """
+    global _worker_processor
+    _worker_processor = _build_processor(device, lite, fallback_device)
+
+
+def _ocr_file_in_worker(file_path: str, output_dir: str) -> Union[Dict[str, Any], Exception]:
+    """Run one file through the worker's processor; failures are returned, not raised."""
+    path = Path(file_path)
+    try:
+        if path.suffix.lower() == '.pdf':
+            return _worker_processor.extract_text_from_pdf(path, Path(output_dir))
+        return _worker_processor.extract_text_from_image(path, Path(output_dir))
+    except Exception as e:
+        return e
+
+
+def extract_text_parallel(file_paths: Iterable[Path], output_dir: Path, workers: int,
+                          device: str = "mps", lite: bool = False,
+                          fallback_device: Optional[str] = None) -> Iterator[Tuple[Path, Union[Dict[str, Any], Exception]]]:
+    """
+    OCR independent files across worker processes, each with its own OCRProcessor.
+    
+    PDF rasterization of one file overlaps with inference on others. With a
+    single worker everything stays in-process and uses
+    OCRProcessor.extract_text_from_files (render-ahead double buffering).
+    
+    Args:
+        file_paths: PDF/image paths to process
+        output_dir: Directory to save OCR JSON results
+        workers: Number of worker processes
+        device: Device to use ('mps', 'cuda', 'cpu')
+        lite: Use lite models for faster processing
+        fallback_device: Device to retry with if `device` fails to initialize
+        
+    Yields:
+        (file_path, OCR result dict) or (file_path, exception), in input order
+    """
+    file_paths = [Path(p) for p in file_paths]
+    
+    if workers <= 1:
+        processor = _build_processor(device, lite, fallback_device)
+        yield from processor.extract_text_from_files(file_paths, output_dir)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_ocr_worker,
+                             initargs=(device, lite, fallback_device)) as executor:
+        results = executor.map(_ocr_file_in_worker, [str(p) for p in file_paths],
+                               [str(output_dir)] * len(file_paths), chunksize=1)
+        yield from zip(file_paths, results)
@@ -0,0 +1,155 @@
+"""Fast readers for cached YomiToku OCR JSON files."""
+
+import os
+import mmap
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+FULL_TEXT_KEY = b'"full_text"'
+# OCRProcessor writes indent=2 (": "); also accept compact separators
+EMPTY_FULL_TEXT = (b'"full_text": ""', b'"full_text":""')
+
+# Fields kept in a pack file - everything the regenerate scripts read
+# (the per-page results, usually the bulk of each file, are dropped)
+PACK_FIELDS = ('file_path', 'full_text', 'confidence')
+
+
+def load_ocr_json(path: Union[str, Path]) -> Dict[str, Any]:
+    """Load a whole OCR JSON file."""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def has_empty_full_text(raw: bytes) -> bool:
+    """
+    True if raw OCR JSON bytes have no `full_text` key or an empty one.
+
+    Lets callers skip failed/blank OCR results without decoding them. Quotes
+    inside string values are always backslash-escaped, so only the real key
+    can match.
+
+    Args:
+        raw: Contents of an OCR JSON file
+
+    Returns:
+        True if the record can be skipped as empty
+    """
+    return FULL_TEXT_KEY not in raw or any(empty in raw for empty in EMPTY_FULL_TEXT)
+
+
+def _find_string_end(buf, start: int) -> int:
+    """Index of the closing quote of a JSON string whose body starts at `start`."""
+    pos = start
+    while True:
+        pos = buf.find(b'"', pos)
+        if pos == -1:
+            return -1
+        # A quote preceded by an odd number of backslashes is escaped
+        backslashes = 0
+        while buf[pos - 1 - backslashes] == 0x5C:  # '\\'
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return pos
+        pos += 1
+
+
+def read_full_text(path: Union[str, Path]) -> Optional[str]:
+    """
+    Read only the `full_text` field of an OCR JSON file.
+
+    The file is memory-mapped and the key located with a byte search, so the
+    (often much larger) `pages` section is never parsed. OCRProcessor writes
+    `full_text` after `pages`, hence the search from the end.
+
+    Args:
+        path: Path to OCR JSON file
+
+    Returns:
+        The full_text string, or None if the file has no string `full_text`
+        key (callers should then fall back to load_ocr_json)
+    """
+    with open(path, 'rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return None
+
+    with buf:
+        key_pos = buf.rfind(FULL_TEXT_KEY)
+        if key_pos == -1:
+            return None
+
+        # Skip whitespace and ':' up to the opening quote of the value
+        pos = key_pos + len(FULL_TEXT_KEY)
+        while pos < len(buf) and buf[pos] in b' \t\r\n:':
+            pos += 1
+        if pos >= len(buf) or buf[pos] != 0x22:  # '"'
+            return None
+
+        end = _find_string_end(buf, pos + 1)
+        if end == -1:
+            return None
+
+        try:
+            return orjson.loads(buf[pos:end + 1])
+        except orjson.JSONDecodeError as e:
+            logger.debug(f"Partial full_text read failed for {path}: {e}")
+            return None
+
+
+def pack_ocr_dir(ocr_dir: Union[str, Path], pack_path: Union[str, Path]) -> int:
+    """
+    Pack the OCR JSON files of a directory into one JSON Lines file.
+    
+    Each line holds the PACK_FIELDS present in one OCR file plus its `name`,
+    sorted by name. Reading the pack back is one open instead of one per
+    receipt. Files that cannot be read or decoded are skipped with a warning.
+    
+    Args:
+        ocr_dir: Directory of OCR JSON files
+        pack_path: Output file; written to a temporary name and then replaced
+        
+    Returns:
+        Number of records written
+    """
+    names = sorted(e.name for e in os.scandir(ocr_dir)
+                   if e.name.endswith('.json') and e.is_file())
+    
+    pack_path = Path(pack_path)
+    tmp_path = pack_path.with_name(pack_path.name + '.tmp')
+    count = 0
+    with open(tmp_path, 'wb') as out:
+        for name in names:
+            try:
+                data = load_ocr_json(os.path.join(ocr_dir, name))
+            except (OSError, orjson.JSONDecodeError) as e:
+                logger.warning(f"Skipping {name}: {e}")
+                continue
+            record = {'name': name}
+            record.update((field, data[field]) for field in PACK_FIELDS if field in data)
+            out.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+            count += 1
+    os.replace(tmp_path, pack_path)
+    
+    logger.info(f"Packed {count} OCR files from {ocr_dir} into {pack_path}")
+    return count
+
+
+def iter_ocr_pack(pack_path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the records of a pack written by pack_ocr_dir.
+    
+    Args:
+        pack_path: Pack file
+        
+    Yields:
+        Dict with `name` and the PACK_FIELDS the source file had
+    """
+    with open(pack_path, 'rb') as f:
+        for line in f:
+            yield orjson.loads(line)
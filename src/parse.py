@@ -2,12 +2,219 @@
 
 import re
 import logging
-from typing import Optional, List, Dict, Tuple
+from collections import Counter
+from functools import lru_cache
+from typing import Optional, List, Dict, Set, Tuple, Iterable, Iterator
 from datetime import datetime
 from dateutil.parser import parse as date_parse
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the output of anything behind parse_cache.parse_fields changes
+# (parse_date/amount/vendor, extract_description_context and their helpers) so
+# persisted parse caches are invalidated; classifier changes use CLASSIFIER_VERSION
+PARSER_VERSION = '1'
+
+
+class KeywordMatcher:
+    """Single-pass substring matcher over a fixed keyword list.
+    
+    The keywords are compiled into one regex alternation, so a line with no
+    keyword is rejected in a single C-level scan instead of one ``in`` check
+    per keyword. ``findall`` still reports every keyword the line contains
+    (including overlapping ones like 合 inside 合計) in list order, making it a
+    drop-in for ``[kw for kw in keywords if kw in line]``.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(keywords)
+        # Longest first so the alternation prefers 税込合計 over 税込 etc.
+        alternation = '|'.join(re.escape(kw) for kw in sorted(set(self.keywords), key=len, reverse=True))
+        self._pattern = re.compile(alternation) if alternation else None
+        # Every keyword that is a prefix of (or equal to) each keyword, found by
+        # looking up each keyword's own prefixes rather than comparing all pairs
+        unique = frozenset(self.keywords)
+        self._prefixes = {kw: frozenset(kw[:i] for i in range(len(kw) + 1) if kw[:i] in unique) for kw in unique}
+    
+    def search(self, text: str) -> bool:
+        """True if any keyword occurs in text."""
+        return self._pattern is not None and self._pattern.search(text) is not None
+    
+    def findall(self, text: str) -> List[str]:
+        """All keywords occurring in text, in keyword-list order."""
+        if not self.search(text):
+            return []
+        return [kw for kw in self.keywords if kw in text]
+    
+    def present(self, text: str) -> Set[str]:
+        """All distinct keywords occurring anywhere in text, in one sweep.
+        
+        Same result as ``{kw for kw in keywords if kw in text}``. The search
+        resumes one character after each match start, so keywords overlapping
+        a match are still found; the alternation picks the longest keyword at
+        a position and the shorter ones starting there are its prefixes.
+        """
+        hits: Set[str] = set()
+        if self._pattern is None:
+            return hits
+        search = self._pattern.search
+        match = search(text)
+        while match is not None:
+            hits |= self._prefixes[match.group()]
+            match = search(text, match.start() + 1)
+        return hits
+    
+    def finditer(self, text: str) -> Iterator['re.Match']:
+        """Non-overlapping keyword matches in text, left to right.
+        
+        Enough to tell *where* keywords occur in one sweep over a whole
+        document; use ``findall`` on a line to get every keyword it contains.
+        """
+        if self._pattern is None:
+            return iter(())
+        return self._pattern.finditer(text)
+
+
+# Total keywords (in order of preference) - 合計 is highest priority
+# Include spaced versions for OCR variations
+TOTAL_KEYWORDS = (
+    'お支払い金額', 'お支払金額', '支払い金額', '支払金額', '利用金額', '利用額', '入金額', '領収金額', '合計', '合 計', '総合計', '総 合 計', '税込合計', 'お買上げ', '総計', '税込', '言十', '合'
+)
+
+# Keywords to avoid (tax, subtotal, change, etc.)
+AVOID_KEYWORDS = (
+    '小計', '税抜', '本体価格', '内税', '消費税', '税額', '税金', 
+    '対象額', '課税', 'おつり', 'お釣り', '釣り', '預り', 'お預り', 'お預り金額',
+    '内消費税', '内消費費税', '内消費費税等', '消費費税', '消費税等',
+    '税込計', '税込合計', '軽減税率',
+    'ATM手数料', 'ATM利用手数料', '手数料', '振込手数料',
+    '入金後残高', '残高', '現在残高', '利用可能残高', 'ポイント残高',
+    '年', '月', '日', '時', '分', '秒', '取引番号', '登録番号', '電話番号'
+)
+
+# Date patterns
+DATE_PATTERNS = (
+    r'(\d{4})年\s*(\d{1,2})月\s*(\d{1,2})日',  # YYYY年MM月DD日 (with optional spaces)
+    r'(\d{4})年(\d{2})月(\d{2})日',           # YYYY年MMDD日 (no spaces, 2-digit month/day)
+    r'(\d{2})年\s*(\d{1,2})月\s*(\d{1,2})日',  # YY年MM月DD日 (24年 7月 9日 format)
+    r'(\d{4})/(\d{1,2})/(\d{1,2})',         # YYYY/MM/DD
+    r'(\d{4})-(\d{1,2})-(\d{1,2})',         # YYYY-MM-DD
+    r'(\d{4})\s*-\s*(\d{1,2})\.(\d{1,2})',  # YYYY -M.DD (Shinkansen format like "2025 -3.29")
+    r'(\d{1,2})月\s*(\d{1,2})日',           # MM月DD日 (month/day only, need to infer year)
+    r'(\d{2})/(\d{1,2})/(\d{1,2})',         # YY/MM/DD (IKEA format)
+    r'(\d{2})\.(\d{1,2})\.(\d{1,2})',       # YY.MM.DD format (common Japanese format like "24.10.30")
+    r'(\d{2})\.-(\d{1,2})\.(\d{1,2})',      # YY.-M.DD format (like "24.-8.30")
+    r'(令和|平成|昭和)(\d+)年\s*(\d{1,2})月\s*(\d{1,2})日',  # 和暦 (with optional spaces)
+)
+
+# Amount patterns - Japanese specific, prioritized order
+# Enhanced to handle OCR spacing issues like "1, 738円" → "1,738円"
+AMOUNT_PATTERNS = (
+    r'合計\s*¥?([0-9,\s]+)',  # 合計 followed by amount (highest priority) - with space tolerance
+    r'¥\s*([0-9,\s]+)\s*(?=\s|$|\n|円)',   # Clean yen amounts with space tolerance  
+    r'([0-9,\s]+)円',  # Numbers with 円 - with space tolerance
+    r'¥\s*([0-9,\s]+)-?',   # Yen symbol with optional trailing dash - with space tolerance
+    r'(?:総計|総合計|お買上げ|税込合計)\s*:?\s*¥?\s*([0-9,\s]+)',  # Other total keywords - with space tolerance
+    r'([0-9,\s]+)(?=\s*(?:合計|総計|総合計|お買上げ))',  # Numbers before total keywords - with space tolerance
+    r'([0-9,\s]+)\)?',  # Numbers with optional closing parenthesis - handle patterns like "1,166)"
+    r'\b([1-9][0-9,\s]{2,8})\b',  # Standalone numbers (lowest priority) - FIXED: first digit now captured
+)
+
+# CRITICAL: Tax context patterns - these indicate tax amounts that should never be the main total
+TAX_CONTEXT_PATTERNS = (
+    r'消費税等.*¥?([0-9,\s]+)',  # 消費税等 followed by amount
+    r'([0-9,\s]+).*消費税等',    # Amount followed by 消費税等
+    r'10%.*¥?([0-9,\s]+)',      # 10% tax rate followed by amount
+    r'([0-9,\s]+).*10%',        # Amount followed by 10% tax rate
+    r'税額.*¥?([0-9,\s]+)',     # 税額 followed by amount
+    r'([0-9,\s]+).*税額',       # Amount followed by 税額
+)
+
+# Specific patterns for non-amount numeric data
+NON_AMOUNT_PATTERNS = (
+    r'登録番号[：:]?\s*([0-9]+)',  # Registration numbers
+    r'登録No[：:]?\s*([0-9]+)',    # Registration No
+    r'取引番号[：:]?\s*([0-9]+)',  # Transaction numbers
+    r'ID[：:]?\s*([0-9]+)',       # ID numbers
+    r'番号[：:]?\s*([0-9]+)',     # Generic numbers
+    r'TEL[：:]?\s*([0-9-]+)',     # Phone numbers
+    r'電話[：:]?\s*([0-9-]+)',    # Phone numbers
+    r'Phone[：:]?\s*([0-9-]+)',   # Phone numbers
+    # ENHANCED: Better phone number detection for patterns like "TEL 080-3917-8881"
+    r'TEL\s*[0-9-]*([0-9]+)(?:\s*-|$)',  # Numbers at end of phone numbers after TEL
+    r'電話\s*[0-9-]*([0-9]+)(?:\s*-|$)', # Numbers at end of phone numbers after 電話
+    r'([0-9]{3})-([0-9]{4})-([0-9]{4})', # Standard phone format like 080-3917-8881
+    r'([0-9]{4})-([0-9]{4})',    # Partial phone numbers like 3917-8881
+    r'口座[：:]?\s*([0-9]+)',     # Account numbers
+    r'参照[：:]?\s*([0-9]+)',     # Reference numbers
+    r'郵便番号[：:]?\s*([0-9-]+)', # Postal codes
+    r'〒\s*([0-9-]+)',           # Postal codes with symbol
+    r'([0-9]+)時([0-9]+)分',      # Time patterns
+    r'([0-9]+):[0-9]+',          # Time patterns with colon
+    r'第([0-9]+)号',             # Issue/number patterns
+    r'No\.([0-9]+)',            # Number patterns
+    r'#([0-9]+)',                # Hash number patterns
+)
+
+# Common Japanese business entity patterns, tried in order on the first lines
+VENDOR_PATTERNS = (
+    r'株式会社[^\\n]+',
+    r'有限会社[^\\n]+',
+    r'[^\\n]*店[^\\n]*',
+    r'[^\\n]*支店[^\\n]*',
+    r'[^\\n]*堂[^\\n]*',
+    r'[^\\n]*屋[^\\n]*',
+    r'セブン.*イレブン',
+    r'JR[^\\n]*',
+    r'スターバックス[^\\n]*',
+)
+
+# Compiled once at import; parse methods use these, the string lists stay
+# available on the parser for inspection
+DATE_RES = tuple(re.compile(p) for p in DATE_PATTERNS)
+AMOUNT_RES = tuple(re.compile(p) for p in AMOUNT_PATTERNS)
+TAX_CONTEXT_RES = tuple(re.compile(p) for p in TAX_CONTEXT_PATTERNS)
+NON_AMOUNT_RES = tuple(re.compile(p) for p in NON_AMOUNT_PATTERNS)
+VENDOR_RES = tuple(re.compile(p) for p in VENDOR_PATTERNS)
+
+# Single-purpose patterns used inside per-line/per-amount loops
+YEN_NUMBER_RE = re.compile(r'¥?\s*([0-9,]+)')
+YEN_DIGITS_RE = re.compile(r'¥?([0-9,]+)')
+TAX_RATE_LINE_RE = re.compile(r'^\s*\d+\s*[8|10]%\s*$')
+NOT_VENDOR_LINE_RE = re.compile(r'\\d{4}年|\\d{4}/|\\d{4}-|[0-9,]+円|領収|レシート')
+TECHNICAL_ID_RE = re.compile(r'^[A-Za-z0-9\-\.]+$')
+
+# Compiled once at import and shared by every parser instance
+TOTAL_MATCHER = KeywordMatcher(TOTAL_KEYWORDS)
+AVOID_MATCHER = KeywordMatcher(AVOID_KEYWORDS)
+
+
+def parse_iso_date(date: str) -> Tuple[int, int, int]:
+    """
+    Split a YYYY-MM-DD string (the format parse_date returns) into integers.
+    
+    Slicing the fixed layout avoids datetime.strptime's format parsing when
+    callers only need to filter by year/month.
+    
+    Args:
+        date: Date string in YYYY-MM-DD format
+        
+    Returns:
+        Tuple of (year, month, day)
+        
+    Raises:
+        ValueError: If the string is not in YYYY-MM-DD layout
+    """
+    if len(date) != 10 or date[4] != '-' or date[7] != '-':
+        raise ValueError(f"Not a YYYY-MM-DD date: {date!r}")
+    return int(date[0:4]), int(date[5:7]), int(date[8:10])
+
+
+@lru_cache(maxsize=None)
+def get_parser() -> 'JapaneseReceiptParser':
+    """Shared parser instance - construction builds all keyword tables once per process."""
+    return JapaneseReceiptParser()
+
 
 class JapaneseReceiptParser:
     """Parser for extracting structured data from Japanese receipts."""
@@ -20,85 +227,23 @@ class JapaneseReceiptParser:
         }
         
         # Date patterns
-        self.date_patterns = [
-            r'(\d{4})年\s*(\d{1,2})月\s*(\d{1,2})日',  # YYYY年MM月DD日 (with optional spaces)
-            r'(\d{4})年(\d{2})月(\d{2})日',           # YYYY年MMDD日 (no spaces, 2-digit month/day)
-            r'(\d{2})年\s*(\d{1,2})月\s*(\d{1,2})日',  # YY年MM月DD日 (24年 7月 9日 format)
-            r'(\d{4})/(\d{1,2})/(\d{1,2})',         # YYYY/MM/DD
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',         # YYYY-MM-DD
-            r'(\d{4})\s*-\s*(\d{1,2})\.(\d{1,2})',  # YYYY -M.DD (Shinkansen format like "2025 -3.29")
-            r'(\d{1,2})月\s*(\d{1,2})日',           # MM月DD日 (month/day only, need to infer year)
-            r'(\d{2})/(\d{1,2})/(\d{1,2})',         # YY/MM/DD (IKEA format)
-            r'(\d{2})\.(\d{1,2})\.(\d{1,2})',       # YY.MM.DD format (common Japanese format like "24.10.30")
-            r'(\d{2})\.-(\d{1,2})\.(\d{1,2})',      # YY.-M.DD format (like "24.-8.30")
-            r'(令和|平成|昭和)(\d+)年\s*(\d{1,2})月\s*(\d{1,2})日',  # 和暦 (with optional spaces)
-        ]
+        self.date_patterns = list(DATE_PATTERNS)
         
         # Amount patterns - Japanese specific, prioritized order
         # Enhanced to handle OCR spacing issues like "1, 738円" → "1,738円"
-        self.amount_patterns = [
-            r'合計\s*¥?([0-9,\s]+)',  # 合計 followed by amount (highest priority) - with space tolerance
-            r'¥\s*([0-9,\s]+)\s*(?=\s|$|\n|円)',   # Clean yen amounts with space tolerance  
-            r'([0-9,\s]+)円',  # Numbers with 円 - with space tolerance
-            r'¥\s*([0-9,\s]+)-?',   # Yen symbol with optional trailing dash - with space tolerance
-            r'(?:総計|総合計|お買上げ|税込合計)\s*:?\s*¥?\s*([0-9,\s]+)',  # Other total keywords - with space tolerance
-            r'([0-9,\s]+)(?=\s*(?:合計|総計|総合計|お買上げ))',  # Numbers before total keywords - with space tolerance
-            r'([0-9,\s]+)\)?',  # Numbers with optional closing parenthesis - handle patterns like "1,166)"
-            r'\b([1-9][0-9,\s]{2,8})\b',  # Standalone numbers (lowest priority) - FIXED: first digit now captured
-        ]
-        
-        # Total keywords (in order of preference) - 合計 is highest priority
-        # Include spaced versions for OCR variations
-        self.total_keywords = [
-            'お支払い金額', 'お支払金額', '支払い金額', '支払金額', '利用金額', '利用額', '入金額', '領収金額', '合計', '合 計', '総合計', '総 合 計', '税込合計', 'お買上げ', '総計', '税込', '言十', '合'
-        ]
+        self.amount_patterns = list(AMOUNT_PATTERNS)
         
-        # Keywords to avoid (tax, subtotal, change, etc.)
-        self.avoid_keywords = [
-            '小計', '税抜', '本体価格', '内税', '消費税', '税額', '税金', 
-            '対象額', '課税', 'おつり', 'お釣り', '釣り', '預り', 'お預り', 'お預り金額',
-            '内消費税', '内消費費税', '内消費費税等', '消費費税', '消費税等',
-            '税込計', '税込合計', '軽減税率',
-            'ATM手数料', 'ATM利用手数料', '手数料', '振込手数料',
-            '入金後残高', '残高', '現在残高', '利用可能残高', 'ポイント残高',
-            '年', '月', '日', '時', '分', '秒', '取引番号', '登録番号', '電話番号'
-        ]
+        # Keyword lists are module constants; copies keep the old mutable attributes
+        self.total_keywords = list(TOTAL_KEYWORDS)
+        self.avoid_keywords = list(AVOID_KEYWORDS)
+        self.total_matcher = TOTAL_MATCHER
+        self.avoid_matcher = AVOID_MATCHER
         
         # CRITICAL: Tax context patterns - these indicate tax amounts that should never be the main total
-        self.tax_context_patterns = [
-            r'消費税等.*¥?([0-9,\s]+)',  # 消費税等 followed by amount
-            r'([0-9,\s]+).*消費税等',    # Amount followed by 消費税等
-            r'10%.*¥?([0-9,\s]+)',      # 10% tax rate followed by amount
-            r'([0-9,\s]+).*10%',        # Amount followed by 10% tax rate
-            r'税額.*¥?([0-9,\s]+)',     # 税額 followed by amount
-            r'([0-9,\s]+).*税額',       # Amount followed by 税額
-        ]
+        self.tax_context_patterns = list(TAX_CONTEXT_PATTERNS)
         
         # Specific patterns for non-amount numeric data
-        self.non_amount_patterns = [
-            r'登録番号[：:]?\s*([0-9]+)',  # Registration numbers
-            r'登録No[：:]?\s*([0-9]+)',    # Registration No
-            r'取引番号[：:]?\s*([0-9]+)',  # Transaction numbers
-            r'ID[：:]?\s*([0-9]+)',       # ID numbers
-            r'番号[：:]?\s*([0-9]+)',     # Generic numbers
-            r'TEL[：:]?\s*([0-9-]+)',     # Phone numbers
-            r'電話[：:]?\s*([0-9-]+)',    # Phone numbers
-            r'Phone[：:]?\s*([0-9-]+)',   # Phone numbers
-            # ENHANCED: Better phone number detection for patterns like "TEL 080-3917-8881"
-            r'TEL\s*[0-9-]*([0-9]+)(?:\s*-|$)',  # Numbers at end of phone numbers after TEL
-            r'電話\s*[0-9-]*([0-9]+)(?:\s*-|$)', # Numbers at end of phone numbers after 電話
-            r'([0-9]{3})-([0-9]{4})-([0-9]{4})', # Standard phone format like 080-3917-8881
-            r'([0-9]{4})-([0-9]{4})',    # Partial phone numbers like 3917-8881
-            r'口座[：:]?\s*([0-9]+)',     # Account numbers
-            r'参照[：:]?\s*([0-9]+)',     # Reference numbers
-            r'郵便番号[：:]?\s*([0-9-]+)', # Postal codes
-            r'〒\s*([0-9-]+)',           # Postal codes with symbol
-            r'([0-9]+)時([0-9]+)分',      # Time patterns
-            r'([0-9]+):[0-9]+',          # Time patterns with colon
-            r'第([0-9]+)号',             # Issue/number patterns
-            r'No\.([0-9]+)',            # Number patterns
-            r'#([0-9]+)',                # Hash number patterns
-        ]
+        self.non_amount_patterns = list(NON_AMOUNT_PATTERNS)
         
         # Date context keywords - prioritize invoice dates over service period dates
         self.date_keywords = [
@@ -108,6 +253,22 @@ class JapaneseReceiptParser:
             'due date', 'to date', 'from date'
         ]
         
+    def parse_all(self, text: str) -> Dict[str, object]:
+        """
+        Extract date, amount and vendor from one receipt text in a single call.
+        
+        Args:
+            text: Raw text from OCR
+            
+        Returns:
+            Dict with 'date', 'amount' and 'vendor' keys (values may be None)
+        """
+        return {
+            'date': self.parse_date(text),
+            'amount': self.parse_amount(text),
+            'vendor': self.parse_vendor(text),
+        }
+    
     def parse_date(self, text: str) -> Optional[str]:
         """
         Extract and normalize date from Japanese text.
@@ -122,8 +283,8 @@ class JapaneseReceiptParser:
         date_candidates = []
         
         for line in lines:
-            for pattern in self.date_patterns:
-                matches = re.finditer(pattern, line)
+            for pattern in DATE_RES:
+                matches = pattern.finditer(line)
                 for match in matches:
                     try:
                         if '令和' in match.group() or '平成' in match.group() or '昭和' in match.group():
@@ -216,7 +377,7 @@ class JapaneseReceiptParser:
         
         # CRITICAL: Additional validation for high-value documents
         if any(indicator in text.upper() for indicator in ['TAX INVOICE', 'INVOICE', 'RENT', 'OFFICE']):
-            amount_match = re.search(r'¥?\s*([0-9,]+)', text)
+            amount_match = YEN_NUMBER_RE.search(text)
             if amount_match:
                 amount_str = amount_match.group(1).replace(',', '').replace(' ', '')
                 try:
@@ -253,7 +414,7 @@ class JapaneseReceiptParser:
     
     def _calculate_date_priority_with_context(self, lines: List[str], line_idx: int, match_pos: int) -> int:
         """Calculate priority score for date including adjacent lines for keywords."""
-        priority = 0
+        priority = 0.0
         
         # Check current line
         priority += self._calculate_date_priority(lines[line_idx], match_pos)
@@ -330,209 +491,207 @@ class JapaneseReceiptParser:
         lines = text.split('\n')
         amount_candidates = []
         
+        # Extract candidate amounts once per line; every pass below reuses them
+        line_amounts = [self._extract_amounts_from_line(line) for line in lines]
+        # Same for avoid-keyword flags, which are looked up per candidate and its neighbours
+        avoid_flags = [self.avoid_matcher.search(line) for line in lines]
+        
         for line_idx, line in enumerate(lines):
             # Look for amounts near total keywords
-            for keyword in self.total_keywords:
-                if keyword in line:
-                    # Search in current line and adjacent lines
-                    search_lines = []
-                    search_lines.append((line, line_idx, 'current'))
-                    if line_idx > 0:
-                        search_lines.append((lines[line_idx - 1], line_idx - 1, 'previous'))
-                    if line_idx < len(lines) - 1:
-                        search_lines.append((lines[line_idx + 1], line_idx + 1, 'next'))
-                    
-                    for search_line, search_idx, position in search_lines:
-                        amounts = self._extract_amounts_from_line(search_line)
-                        for amount, confidence in amounts:
-                            # CRITICAL: Check if this amount is a tax amount that should be excluded
-                            if self._is_tax_amount(amount, search_line, lines, search_idx):
-                                logger.debug(f"Excluding tax amount ¥{amount} from line: {search_line.strip()}")
-                                continue
-                            
-                            # ULTRA HIGH priority for specific transaction amounts - with enhanced validation
-                            if keyword in ['利用金額', '利用額', '入金額', '領収金額']:
-                                # Enhanced validation for ultra-high priority keywords
-                                if self._validate_amount_for_keyword(amount, keyword, search_line, line, position):
-                                    keyword_priority = 2000  # Highest priority for specific amounts
-                                    # Bonus if amount is on same line as keyword
-                                    if position == 'current':
-                                        keyword_priority += 500
-                                    # Higher bonus if amount is on previous line 
-                                    elif position == 'previous':
-                                        keyword_priority += 100
-                                    logger.debug(f"High-priority keyword '{keyword}' validated for amount ¥{amount} (priority: {keyword_priority})")
+            for keyword in self.total_matcher.findall(line):
+                # Search in current line and adjacent lines
+                search_lines = []
+                search_lines.append((line, line_idx, 'current'))
+                if line_idx > 0:
+                    search_lines.append((lines[line_idx - 1], line_idx - 1, 'previous'))
+                if line_idx < len(lines) - 1:
+                    search_lines.append((lines[line_idx + 1], line_idx + 1, 'next'))
+                
+                for search_line, search_idx, position in search_lines:
+                    amounts = line_amounts[search_idx]
+                    for amount, confidence in amounts:
+                        # CRITICAL: Check if this amount is a tax amount that should be excluded
+                        if self._is_tax_amount(amount, search_line, lines, search_idx):
+                            logger.debug(f"Excluding tax amount ¥{amount} from line: {search_line.strip()}")
+                            continue
+                        
+                        # ULTRA HIGH priority for specific transaction amounts - with enhanced validation
+                        if keyword in ['利用金額', '利用額', '入金額', '領収金額']:
+                            # Enhanced validation for ultra-high priority keywords
+                            if self._validate_amount_for_keyword(amount, keyword, search_line, line, position):
+                                keyword_priority = 2000  # Highest priority for specific amounts
+                                # Bonus if amount is on same line as keyword
+                                if position == 'current':
+                                    keyword_priority += 500
+                                # Higher bonus if amount is on previous line 
+                                elif position == 'previous':
+                                    keyword_priority += 100
+                                logger.debug(f"High-priority keyword '{keyword}' validated for amount ¥{amount} (priority: {keyword_priority})")
+                            else:
+                                # Failed validation - give low priority instead of ultra-high
+                                keyword_priority = 50  # Low priority
+                                logger.debug(f"High-priority keyword '{keyword}' validation FAILED for amount ¥{amount} in line: {search_line.strip()}")
+                        # VERY HIGH priority for 合計 (total) - with or without space
+                        elif keyword in ['合計', '合 計']:
+                            # JAPANESE RECEIPT FIX: In Japanese receipts, the pattern is usually:
+                            # Line N: "合計" (total keyword)
+                            # Line N+1: "¥230" (the actual total amount)
+                            # Line N-1: might be "お預り金額" or other avoid keywords
+                            # So NEXT line should get highest priority, not previous line
+                            if position == 'next':
+                                # HIGHEST priority for amount after 合計 keyword
+                                # But check if amount after 合計 could be tax (rare but possible)
+                                next_line_has_tax = False
+                                if search_idx < len(lines) - 1:
+                                    next_line = lines[search_idx + 1]
+                                    next_line_has_tax = any(tax_ind in next_line for tax_ind in ['消費税', '税額', '10%', '8%'])
+                                
+                                if next_line_has_tax or self._is_tax_amount(amount, search_line, lines, search_idx):
+                                    keyword_priority = 1000  # Lower priority for potential tax after 合計
+                                    logger.debug(f"合計 next line amount ¥{amount} might be tax - giving lower priority")
                                 else:
-                                    # Failed validation - give low priority instead of ultra-high
-                                    keyword_priority = 50  # Low priority
-                                    logger.debug(f"High-priority keyword '{keyword}' validation FAILED for amount ¥{amount} in line: {search_line.strip()}")
-                            # VERY HIGH priority for 合計 (total) - with or without space
-                            elif keyword in ['合計', '合 計']:
-                                # JAPANESE RECEIPT FIX: In Japanese receipts, the pattern is usually:
-                                # Line N: "合計" (total keyword)
-                                # Line N+1: "¥230" (the actual total amount)
-                                # Line N-1: might be "お預り金額" or other avoid keywords
-                                # So NEXT line should get highest priority, not previous line
-                                if position == 'next':
-                                    # HIGHEST priority for amount after 合計 keyword
-                                    # But check if amount after 合計 could be tax (rare but possible)
-                                    next_line_has_tax = False
-                                    if search_idx < len(lines) - 1:
-                                        next_line = lines[search_idx + 1]
-                                        next_line_has_tax = any(tax_ind in next_line for tax_ind in ['消費税', '税額', '10%', '8%'])
+                                    keyword_priority = 7000  # ULTRA HIGH priority for next line (Japanese pattern)
                                     
-                                    if next_line_has_tax or self._is_tax_amount(amount, search_line, lines, search_idx):
-                                        keyword_priority = 1000  # Lower priority for potential tax after 合計
-                                        logger.debug(f"合計 next line amount ¥{amount} might be tax - giving lower priority")
-                                    else:
-                                        keyword_priority = 7000  # ULTRA HIGH priority for next line (Japanese pattern)
+                                    # CRITICAL: But if this is a very small amount (like ¥40) and there are much larger amounts
+                                    # available (like ¥400+), be suspicious - this might be tax or change
+                                    if amount < 100:
+                                        # Find all amounts in the text to compare
+                                        all_amounts = [amt for amounts_in_line in line_amounts for amt, _ in amounts_in_line]
                                         
-                                        # CRITICAL: But if this is a very small amount (like ¥40) and there are much larger amounts
-                                        # available (like ¥400+), be suspicious - this might be tax or change
-                                        if amount < 100:
-                                            # Find all amounts in the text to compare
-                                            all_amounts = []
-                                            for line in lines:
-                                                amounts_in_line = self._extract_amounts_from_line(line)
-                                                for amt, _ in amounts_in_line:
-                                                    all_amounts.append(amt)
-                                            
-                                            # If there are amounts 10x larger, reduce priority significantly
-                                            max_amount = max(all_amounts) if all_amounts else 0
-                                            if max_amount >= amount * 10:
-                                                keyword_priority = 3000  # Reduce priority for suspicious small totals
-                                                logger.debug(f"Reducing priority for small amount ¥{amount} after 合計 - much larger amounts available (max: ¥{max_amount})")
-                                elif position == 'current':
-                                    # Check if this could be a tax amount by examining the full line
-                                    if self._could_be_tax_on_total_line(amount, search_line):
-                                        keyword_priority = 1000  # Lower priority for potential tax on 合計 line
-                                        logger.debug(f"合計 amount ¥{amount} might be tax - giving lower priority")
-                                    else:
-                                        keyword_priority = 5000  # Standard high priority
+                                        # If there are amounts 10x larger, reduce priority significantly
+                                        max_amount = max(all_amounts) if all_amounts else 0
+                                        if max_amount >= amount * 10:
+                                            keyword_priority = 3000  # Reduce priority for suspicious small totals
+                                            logger.debug(f"Reducing priority for small amount ¥{amount} after 合計 - much larger amounts available (max: ¥{max_amount})")
+                            elif position == 'current':
+                                # Check if this could be a tax amount by examining the full line
+                                if self._could_be_tax_on_total_line(amount, search_line):
+                                    keyword_priority = 1000  # Lower priority for potential tax on 合計 line
+                                    logger.debug(f"合計 amount ¥{amount} might be tax - giving lower priority")
                                 else:
-                                    # Previous line to 合計 is often avoid keywords like "お預り金額"
-                                    # CRITICAL: Check if amount before 合計 could be tax or avoid keyword pattern
-                                    prev_line_has_tax = False
-                                    if search_idx > 0:
-                                        prev_line = lines[search_idx - 1]
-                                        prev_line_has_tax = any(tax_ind in prev_line for tax_ind in ['消費税', '税額', '10%', '8%'])
-                                    
-                                    if prev_line_has_tax or self._is_tax_amount(amount, search_line, lines, search_idx):
-                                        keyword_priority = 1000  # Lower priority for potential tax before 合計
-                                        logger.debug(f"合計 previous line amount ¥{amount} might be tax - giving lower priority")
-                                    else:
-                                        keyword_priority = 3000  # Lower priority for previous line (often avoid keywords)
-                                        
-                                        # SPECIAL CASE: If this amount appears multiple times in the text, 
-                                        # it's likely the correct total (like ¥2040 case)
-                                        amount_count = sum(1 for line in lines if str(amount) in line)
-                                        if amount_count >= 2:
-                                            keyword_priority = 6000  # Nearly as high as next-line priority
-                                            logger.debug(f"Amount ¥{amount} before 合計 appears {amount_count} times - boosting priority")
-                            # HIGH priority for other total keywords
-                            elif keyword in ['総合計', '総 合 計', '税込合計']:
-                                keyword_priority = 4000  # Very high priority
-                                if position == 'current':
-                                    keyword_priority += 800
-                                elif position == 'previous':
-                                    keyword_priority += 400
+                                    keyword_priority = 5000  # Standard high priority
                             else:
-                                # Standard priority for other keywords, but still boosted to beat frequency
-                                base_priority = len(self.total_keywords) - self.total_keywords.index(keyword)
-                                keyword_priority = base_priority * 100  # Boost by 100x to compete with frequency
-                            
-                            # Check for avoid keywords in the specific line and also the line before it (for tax amounts)
-                            line_has_avoid_keyword = any(avoid_kw in search_line for avoid_kw in self.avoid_keywords)
-                            
-                            # Also check the line before the amount for tax keywords (common pattern: "内消費税" followed by "¥204")
-                            prev_line_has_tax_keyword = False
-                            prev_line_has_avoid_keyword = False
-                            if search_idx > 0:
-                                prev_line = lines[search_idx - 1]
-                                prev_line_has_tax_keyword = any(tax_kw in prev_line for tax_kw in ['内消費税', '消費税', '税額', '税金'])
-                                # CRITICAL FIX: Also check for avoid keywords in previous line (like "お預り金額" followed by "¥250")
-                                prev_line_has_avoid_keyword = any(avoid_kw in prev_line for avoid_kw in self.avoid_keywords)
-                            
-                            # IMPORTANT: Also check the line AFTER the amount for avoid keywords (common pattern: "¥200" followed by "お釣り")
-                            next_line_has_avoid_keyword = False
-                            if search_idx < len(lines) - 1:
-                                next_line = lines[search_idx + 1]
-                                # CRITICAL FIX: Don't penalize for "課税" when it's part of "非課税" (non-taxable)
-                                for avoid_kw in self.avoid_keywords:
-                                    if avoid_kw in next_line:
-                                        # Special case: "課税" should not penalize if it's part of "非課税"
-                                        if avoid_kw == '課税' and '非課税' in next_line:
-                                            logger.debug(f"Not penalizing for '課税' in '非課税計' context: {next_line.strip()}")
-                                            continue
-                                        next_line_has_avoid_keyword = True
-                                        break
-                            
-                            if line_has_avoid_keyword or prev_line_has_tax_keyword or prev_line_has_avoid_keyword or next_line_has_avoid_keyword:
-                                # Only penalize if it's not the 合計 line itself (with or without space)
-                                if keyword not in ['合計', '合 計'] or position != 'current':
-                                    # Determine penalty type and amount
-                                    if prev_line_has_tax_keyword:
-                                        penalty = 200  # Extra strong penalty for tax amounts
-                                        reason = 'tax keyword in previous line'
-                                    elif prev_line_has_avoid_keyword:
-                                        penalty = 180  # Very strong penalty for avoid keyword in previous line (like お預り金額)
-                                        reason = 'avoid keyword in previous line'
-                                    elif next_line_has_avoid_keyword:
-                                        penalty = 150  # Strong penalty for avoid keyword in next line (like change)
-                                        reason = 'avoid keyword in next line'
-                                    else:
-                                        penalty = 50  # Standard penalty for avoid keyword
-                                        reason = 'avoid keyword'
+                                # Previous line to 合計 is often avoid keywords like "お預り金額"
+                                # CRITICAL: Check if amount before 合計 could be tax or avoid keyword pattern
+                                prev_line_has_tax = False
+                                if search_idx > 0:
+                                    prev_line = lines[search_idx - 1]
+                                    prev_line_has_tax = any(tax_ind in prev_line for tax_ind in ['消費税', '税額', '10%', '8%'])
+                                
+                                if prev_line_has_tax or self._is_tax_amount(amount, search_line, lines, search_idx):
+                                    keyword_priority = 1000  # Lower priority for potential tax before 合計
+                                    logger.debug(f"合計 previous line amount ¥{amount} might be tax - giving lower priority")
+                                else:
+                                    keyword_priority = 3000  # Lower priority for previous line (often avoid keywords)
                                     
-                                    keyword_priority -= penalty
-                                    logger.debug(f"Penalizing amount {amount} by {penalty} due to {reason}: {search_line.strip()}")
-                            
-                            amount_candidates.append((amount, keyword_priority + confidence, search_line))
-        
+                                    # SPECIAL CASE: If this amount appears multiple times in the text, 
+                                    # it's likely the correct total (like ¥2040 case)
+                                    amount_count = sum(1 for line in lines if str(amount) in line)
+                                    if amount_count >= 2:
+                                        keyword_priority = 6000  # Nearly as high as next-line priority
+                                        logger.debug(f"Amount ¥{amount} before 合計 appears {amount_count} times - boosting priority")
+                        # HIGH priority for other total keywords
+                        elif keyword in ['総合計', '総 合 計', '税込合計']:
+                            keyword_priority = 4000  # Very high priority
+                            if position == 'current':
+                                keyword_priority += 800
+                            elif position == 'previous':
+                                keyword_priority += 400
+                        else:
+                            # Standard priority for other keywords, but still boosted to beat frequency
+                            base_priority = len(self.total_keywords) - self.total_keywords.index(keyword)
+                            keyword_priority = base_priority * 100  # Boost by 100x to compete with frequency
+                        
+                        # Check for avoid keywords in the specific line and also the line before it (for tax amounts)
+                        line_has_avoid_keyword = avoid_flags[search_idx]
+                        
+                        # Also check the line before the amount for tax keywords (common pattern: "内消費税" followed by "¥204")
+                        prev_line_has_tax_keyword = False
+                        prev_line_has_avoid_keyword = False
+                        if search_idx > 0:
+                            prev_line = lines[search_idx - 1]
+                            prev_line_has_tax_keyword = any(tax_kw in prev_line for tax_kw in ['内消費税', '消費税', '税額', '税金'])
+                            # CRITICAL FIX: Also check for avoid keywords in previous line (like "お預り金額" followed by "¥250")
+                            prev_line_has_avoid_keyword = avoid_flags[search_idx - 1]
+                        
+                        # IMPORTANT: Also check the line AFTER the amount for avoid keywords (common pattern: "¥200" followed by "お釣り")
+                        next_line_has_avoid_keyword = False
+                        if search_idx < len(lines) - 1:
+                            next_line = lines[search_idx + 1]
+                            # CRITICAL FIX: Don't penalize for "課税" when it's part of "非課税" (non-taxable)
+                            for avoid_kw in self.avoid_matcher.findall(next_line):
+                                # Special case: "課税" should not penalize if it's part of "非課税"
+                                if avoid_kw == '課税' and '非課税' in next_line:
+                                    logger.debug(f"Not penalizing for '課税' in '非課税計' context: {next_line.strip()}")
+                                    continue
+                                next_line_has_avoid_keyword = True
+                                break
+                        
+                        if line_has_avoid_keyword or prev_line_has_tax_keyword or prev_line_has_avoid_keyword or next_line_has_avoid_keyword:
+                            # Only penalize if it's not the 合計 line itself (with or without space)
+                            if keyword not in ['合計', '合 計'] or position != 'current':
+                                # Determine penalty type and amount
+                                if prev_line_has_tax_keyword:
+                                    penalty = 200  # Extra strong penalty for tax amounts
+                                    reason = 'tax keyword in previous line'
+                                elif prev_line_has_avoid_keyword:
+                                    penalty = 180  # Very strong penalty for avoid keyword in previous line (like お預り金額)
+                                    reason = 'avoid keyword in previous line'
+                                elif next_line_has_avoid_keyword:
+                                    penalty = 150  # Strong penalty for avoid keyword in next line (like change)
+                                    reason = 'avoid keyword in next line'
+                                else:
+                                    penalty = 50  # Standard penalty for avoid keyword
+                                    reason = 'avoid keyword'
+                                
+                                keyword_priority -= penalty
+                                logger.debug(f"Penalizing amount {amount} by {penalty} due to {reason}: {search_line.strip()}")
+                        
+                        amount_candidates.append((amount, keyword_priority + confidence, search_line))
+    
         # Also look for standalone amounts if no keyword-based amounts found
-        if not amount_candidates:
-            for line in lines:
-                amounts = self._extract_amounts_from_line(line)
-                for amount, confidence in amounts:
-                    amount_candidates.append((amount, confidence, line))
-        
         # ENHANCED: Even if we found keyword-based amounts, also add standalone amounts for frequency analysis
         # This helps when the main amount appears multiple times but not always near keywords
         all_standalone_amounts = []
-        for line in lines:
-            amounts = self._extract_amounts_from_line(line)
+        for line, amounts in zip(lines, line_amounts):
             for amount, confidence in amounts:
                 all_standalone_amounts.append((amount, confidence, line))
         
+        if not amount_candidates:
+            amount_candidates.extend(all_standalone_amounts)
+        
+        # First index of each line (exact and stripped) - replaces linear rescans of `lines`
+        first_line_idx: Dict[str, int] = {}
+        first_stripped_idx: Dict[str, int] = {}
+        for i, text_line in enumerate(lines):
+            first_line_idx.setdefault(text_line, i)
+            first_stripped_idx.setdefault(text_line.strip(), i)
+        
         # For each standalone amount, check if it appears frequently and boost its priority
         # But EXCLUDE tax amounts from frequency analysis to prevent tax amounts from winning
-        standalone_frequency = {}
+        standalone_frequency: Counter[int] = Counter()
         non_tax_amounts = []
         
         for amount, confidence, line in all_standalone_amounts:
-            line_idx = None
             # Find the line index for tax detection
-            for i, text_line in enumerate(lines):
-                if text_line.strip() == line.strip():
-                    line_idx = i
-                    break
+            source_idx = first_stripped_idx.get(line.strip())
             
             # Check if this amount is from a tax line - if so, don't count it in frequency
-            if line_idx is not None and not self._is_tax_amount(amount, line, lines, line_idx):
-                standalone_frequency[amount] = standalone_frequency.get(amount, 0) + 1
+            if source_idx is not None and not self._is_tax_amount(amount, line, lines, source_idx):
+                standalone_frequency[amount] += 1
                 non_tax_amounts.append((amount, confidence, line))
             else:
                 logger.debug(f"Excluding tax amount ¥{amount} from frequency analysis: {line.strip()}")
         
         # Add high-frequency NON-TAX amounts to candidates with boosted priority
+        max_frequency = max(standalone_frequency.values(), default=0)
         for amount, confidence, line in non_tax_amounts:
-            frequency = standalone_frequency.get(amount, 0)
+            frequency = standalone_frequency[amount]
             if frequency >= 2:  # Lowered from 3 since we're excluding tax amounts now
                 # Calculate a very high priority based on frequency - this should usually win
                 frequency_priority = confidence + (frequency * 300)  # 300 points per occurrence
                 
                 # SPECIAL BOOST: If the amount appears more than any other amount, give it an extra boost
-                max_frequency = max(standalone_frequency.values()) if standalone_frequency else 0
                 if frequency == max_frequency and frequency >= 2:  # Lowered from 3 to 2
                     frequency_priority += 500  # Extra boost for most frequent amount
                     logger.debug(f"Most frequent amount boost: ¥{amount} appears {frequency} times")
@@ -544,16 +703,13 @@ class JapaneseReceiptParser:
                     logger.debug(f"Major boost for total context: {line.strip()}")
                 
                 # CRITICAL FIX: Check if this amount should be penalized due to avoid keywords
-                line_idx = lines.index(line) if line in lines else None
-                if line_idx is not None:
+                source_idx = first_line_idx.get(line)
+                if source_idx is not None:
                     # Check for avoid keywords in the current line
-                    line_has_avoid_keyword = any(avoid_kw in line for avoid_kw in self.avoid_keywords)
+                    line_has_avoid_keyword = avoid_flags[source_idx]
                     
                     # Check for avoid keywords in previous line (like "お預り金額" before "¥250")
-                    prev_line_has_avoid_keyword = False
-                    if line_idx > 0:
-                        prev_line = lines[line_idx - 1]
-                        prev_line_has_avoid_keyword = any(avoid_kw in prev_line for avoid_kw in self.avoid_keywords)
+                    prev_line_has_avoid_keyword = source_idx > 0 and avoid_flags[source_idx - 1]
                     
                     # Apply penalties to frequency priority too
                     if line_has_avoid_keyword:
@@ -640,14 +796,14 @@ class JapaneseReceiptParser:
         # CRITICAL: Skip pure tax rate lines entirely - they should not generate any amounts
         # Lines like "647 8%" are tax rate indicators, not amounts
         # BUT lines like "10%対象(税込) ¥2,800-" are totals and should be processed
-        if re.match(r'^\s*\d+\s*[8|10]%\s*$', line.strip()):
+        if TAX_RATE_LINE_RE.match(line.strip()):
             logger.debug(f"Skipping pure tax rate line entirely: {line.strip()}")
             return []
         
         # First check if this line contains non-amount patterns
         non_amount_numbers = set()
-        for pattern in self.non_amount_patterns:
-            for match in re.finditer(pattern, line):
+        for pattern in NON_AMOUNT_RES:
+            for match in pattern.finditer(line):
                 try:
                     # Extract the numeric part and convert to int
                     number_str = match.group(1).replace('-', '').replace(',', '')
@@ -656,8 +812,8 @@ class JapaneseReceiptParser:
                 except (ValueError, IndexError):
                     continue
         
-        for pattern_idx, pattern in enumerate(self.amount_patterns):
-            matches = re.finditer(pattern, line)
+        for pattern_idx, pattern in enumerate(AMOUNT_RES):
+            matches = pattern.finditer(line)
             for match in matches:
                 try:
                     amount_str = match.group(1)
@@ -744,23 +900,10 @@ class JapaneseReceiptParser:
         if not lines:
             return None
         
-        # Common Japanese business entity patterns
-        business_patterns = [
-            r'株式会社[^\\n]+',
-            r'有限会社[^\\n]+',
-            r'[^\\n]*店[^\\n]*',
-            r'[^\\n]*支店[^\\n]*',
-            r'[^\\n]*堂[^\\n]*',
-            r'[^\\n]*屋[^\\n]*',
-            r'セブン.*イレブン',
-            r'JR[^\\n]*',
-            r'スターバックス[^\\n]*',
-        ]
-        
         # Look for business entity patterns first
         for line in lines[:5]:  # Check first 5 lines
-            for pattern in business_patterns:
-                match = re.search(pattern, line)
+            for pattern in VENDOR_RES:
+                match = pattern.search(line)
                 if match:
                     vendor = match.group().strip()
                     if len(vendor) > 2:  # Reasonable length
@@ -770,7 +913,7 @@ class JapaneseReceiptParser:
         # Fallback: use first non-empty line that looks like a business name
         for line in lines[:3]:
             # Skip lines that look like dates, amounts, or generic text
-            if not re.search(r'\\d{4}年|\\d{4}/|\\d{4}-|[0-9,]+円|領収|レシート', line):
+            if not NOT_VENDOR_LINE_RE.search(line):
                 if len(line) > 2 and len(line) < 50:
                     logger.info(f"Extracted vendor (fallback): {line}")
                     return line
@@ -778,7 +921,7 @@ class JapaneseReceiptParser:
         logger.warning("No vendor name found")
         return None
     
-    def extract_description_context(self, text: str, vendor: Optional[str], amount: Optional[int], category: str = None) -> str:
+    def extract_description_context(self, text: str, vendor: Optional[str], amount: Optional[int], category: Optional[str] = None) -> str:
         """
         Generate concise business description based on category and context patterns.
         
@@ -1171,9 +1314,7 @@ class JapaneseReceiptParser:
         
         # Check if the amount appears within alphanumeric codes/IDs
         # Pattern: letters/numbers-digits-amount.digits or similar technical formats
-        import re
-        technical_pattern = r'^[A-Za-z0-9\-\.]+$'
-        if re.match(technical_pattern, line.strip()) and len(line.strip()) > 10:
+        if TECHNICAL_ID_RE.match(line.strip()) and len(line.strip()) > 10:
             # This looks like a technical ID/code containing the amount as part of it
             return True
             
@@ -1217,14 +1358,14 @@ class JapaneseReceiptParser:
             return True
         
         # Check for tax context patterns
-        for pattern in self.tax_context_patterns:
-            match = re.search(pattern, line)
+        for pattern in TAX_CONTEXT_RES:
+            match = pattern.search(line)
             if match:
                 # Extract the amount from the pattern and see if it matches our amount
                 try:
                     pattern_amount_str = match.group(1).replace(',', '').replace(' ', '').strip()
                     if pattern_amount_str.isdigit() and int(pattern_amount_str) == amount:
-                        logger.debug(f"Tax amount detected by pattern '{pattern}' in line: {line.strip()}")
+                        logger.debug(f"Tax amount detected by pattern '{pattern.pattern}' in line: {line.strip()}")
                         return True
                 except (ValueError, IndexError):
                     continue
@@ -1249,7 +1390,7 @@ class JapaneseReceiptParser:
                     # So the amount AFTER the tax indicator is usually the total, not tax
                     all_amounts = []
                     for text_line in all_lines:
-                        amounts_in_line = re.findall(r'¥?([0-9,]+)', text_line)
+                        amounts_in_line = YEN_DIGITS_RE.findall(text_line)
                         for amt_str in amounts_in_line:
                             try:
                                 amt = int(amt_str.replace(',', ''))
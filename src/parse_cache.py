@@ -0,0 +1,173 @@
+"""Persistent SQLite cache of parse/classify results keyed on OCR text."""
+
+import os
+import sqlite3
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    from .parse import PARSER_VERSION
+    from .classify import CLASSIFIER_VERSION
+except ImportError:
+    from parse import PARSER_VERSION
+    from classify import CLASSIFIER_VERSION
+
+logger = logging.getLogger(__name__)
+
+PARSE_CACHE_PATH = Path(os.environ.get(
+    'PARSE_CACHE_PATH', Path.home() / '.cache' / 'receipts-ocr' / 'parse.cache.sqlite'
+))
+
+FIELDS = ('date', 'amount', 'vendor', 'description', 'category', 'category_confidence')
+
+
+def cache_version(rules_path: Union[str, Path]) -> str:
+    """
+    Cache version for the current parser, classifier and category rules.
+    
+    Cached categories depend on the classifier code and the rules too, so
+    bumping CLASSIFIER_VERSION or editing the rules misses old entries.
+    
+    Args:
+        rules_path: Path to categories.yml file
+        
+    Returns:
+        Version string to pass to ParseCache
+    """
+    rules_digest = hashlib.sha1(Path(rules_path).read_bytes()).hexdigest()[:12]
+    return f"{PARSER_VERSION}:{CLASSIFIER_VERSION}:{rules_digest}"
+
+
+def parse_fields(text: str, parser, classifier) -> Dict[str, Any]:
+    """
+    Parse and classify an OCR text into the cached FIELDS.
+    
+    The description is only generated when both date and amount were found,
+    matching what the regenerate scripts export.
+    
+    Args:
+        text: Full OCR text
+        parser: JapaneseReceiptParser instance
+        classifier: CategoryClassifier instance
+        
+    Returns:
+        Dict with FIELDS keys
+    """
+    date = parser.parse_date(text)
+    amount = parser.parse_amount(text)
+    vendor = parser.parse_vendor(text)
+    
+    # Classify category first; the description depends on it
+    category, category_confidence = classifier.classify(vendor, "", text)
+    description = parser.extract_description_context(text, vendor, amount, category) if date and amount else None
+    
+    return {
+        'date': date,
+        'amount': amount,
+        'vendor': vendor,
+        'description': description,
+        'category': category,
+        'category_confidence': category_confidence,
+    }
+
+
+class ParseCache:
+    """Key-value store of parsed receipt fields.
+
+    Entries are keyed on ``sha1(text)`` plus a version string, so editing the
+    parser (bump ``PARSER_VERSION``), the classifier (bump
+    ``CLASSIFIER_VERSION``) or the category rules (pass a new ``version``,
+    see cache_version) simply misses the old rows instead of returning stale
+    data.
+    Writes are buffered and committed in batches. Worker processes that only
+    look entries up open the cache with ``read_only=True``.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = PARSE_CACHE_PATH,
+                 version: str = f"{PARSER_VERSION}:{CLASSIFIER_VERSION}", batch_size: int = 500,
+                 read_only: bool = False):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: SQLite file location
+            version: Version string mixed into every key
+            batch_size: Number of pending rows per write transaction
+            read_only: Open an existing cache for lookups only, without creating
+                the table or taking the write lock
+        """
+        self.db_path = Path(db_path)
+        self.version = version
+        self.batch_size = batch_size
+        self._pending: List[Tuple[Any, ...]] = []
+
+        if read_only:
+            self.conn = sqlite3.connect(self.db_path.resolve().as_uri() + '?mode=ro', uri=True)
+            return
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS parsed ('
+            'key TEXT PRIMARY KEY, date TEXT, amount INTEGER, vendor TEXT, '
+            'description TEXT, category TEXT, category_confidence REAL)'
+        )
+        self.conn.commit()
+
+    def make_key(self, text: str) -> str:
+        """Cache key for an OCR text."""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest() + ':' + self.version
+
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up cached fields for an OCR text.
+
+        Args:
+            text: Full OCR text
+
+        Returns:
+            Dict with FIELDS keys, or None on a miss
+        """
+        row = self.conn.execute(
+            f"SELECT {', '.join(FIELDS)} FROM parsed WHERE key = ?", (self.make_key(text),)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(FIELDS, row))
+
+    def put(self, text: str, fields: Dict[str, Any]) -> None:
+        """
+        Queue parsed fields for an OCR text; written on the next flush.
+
+        Args:
+            text: Full OCR text
+            fields: Dict with FIELDS keys (missing ones are stored as NULL)
+        """
+        self._pending.append((self.make_key(text),) + tuple(fields.get(name) for name in FIELDS))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending rows in a single transaction."""
+        if not self._pending:
+            return
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO parsed (key, {', '.join(FIELDS)}) VALUES (?{', ?' * len(FIELDS)})",
+                self._pending
+            )
+        logger.debug(f"Wrote {len(self._pending)} rows to parse cache {self.db_path}")
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Flush pending rows and close the database."""
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self) -> 'ParseCache':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
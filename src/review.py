@@ -1,13 +1,37 @@
 """Review queue generator for uncertain or low-confidence extractions."""
 
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 
+def make_snippet(raw_text: str, length: int = 200) -> str:
+    """
+    Short Excel-safe snippet of raw OCR text for a review item.
+    
+    Only the head of the text is copied: each literal backslash-n collapses
+    two characters into one, so the first `length` output characters come
+    from at most 2 * `length` input characters.
+    
+    Args:
+        raw_text: Raw OCR text
+        length: Maximum snippet length before the "..." marker
+        
+    Returns:
+        Snippet with literal \\n replaced by spaces and control characters removed
+    """
+    snippet = raw_text[:2 * length].replace('\\n', ' ')[:length]
+    # Remove characters that Excel doesn't like
+    snippet = ''.join(char for char in snippet if ord(char) >= 32 or char in '\\t\\n\\r')
+    if len(raw_text) > length:
+        snippet += "..."
+    return snippet
+
+
 @dataclass
 class ReviewItem:
     """Represents an item that needs manual review."""
@@ -31,6 +55,8 @@ class ReviewQueue:
             confidence_thresholds: Minimum confidence scores for each field
         """
         self.items: List[ReviewItem] = []
+        # Guards items when receipts are processed on several threads
+        self._lock = threading.Lock()
         self.thresholds = confidence_thresholds or {
             'date': 0.7,
             'amount': 0.7,
@@ -61,6 +87,35 @@ class ReviewQueue:
         Returns:
             True if item should be reviewed
         """
+        needs_review, _ = self.evaluate(date, amount, category, category_confidence,
+                                        ocr_confidence, file_path, ocr_text, parser)
+        return needs_review
+    
+    def evaluate(self,
+                 date: Optional[str],
+                 amount: Optional[int],
+                 category: str,
+                 category_confidence: float,
+                 ocr_confidence: float,
+                 file_path: str,
+                 ocr_text: str = "",
+                 parser=None) -> Tuple[bool, str]:
+        """
+        Run the review checks once without queueing anything.
+        
+        Args:
+            date: Extracted date
+            amount: Extracted amount
+            category: Assigned category
+            category_confidence: Confidence score for category
+            ocr_confidence: Overall OCR confidence
+            file_path: Path to the file
+            ocr_text: Raw OCR text (used for handwriting hints)
+            parser: Optional parser providing the high-value check
+            
+        Returns:
+            Tuple of (needs_review, short reason summary for the review item)
+        """
         reasons = []
         
         # Check missing critical fields
@@ -99,15 +154,33 @@ class ReviewQueue:
             reasons.append("Category could not be determined")
         
         # CRITICAL: Check for high-value transactions that need review
+        high_value = False
         if parser and hasattr(parser, 'should_flag_for_high_value_review'):
             if parser.should_flag_for_high_value_review(ocr_text, amount, date, category, category_confidence):
+                high_value = True
                 reasons.append("High-value transaction requiring validation")
         
-        if reasons:
-            logger.info(f"Sending {Path(file_path).name} to review: {'; '.join(reasons)}")
-            return True
+        if not reasons:
+            return False, ""
+        
+        logger.info(f"Sending {Path(file_path).name} to review: {'; '.join(reasons)}")
         
-        return False
+        # Generate reason summary
+        summary = []
+        if not date:
+            summary.append("missing date")
+        if not amount:
+            summary.append("missing amount")
+        if category_confidence < self.thresholds['category']:
+            summary.append("low category confidence")
+        if ocr_confidence < self.thresholds['ocr']:
+            summary.append("low OCR quality")
+        if category == "Other":
+            summary.append("unknown category")
+        if high_value:
+            summary.append("high-value transaction")
+        
+        return True, "; ".join(summary)
     
     def add_item(self, 
                 file_path: str,
@@ -129,7 +202,8 @@ class ReviewQueue:
             confidence_scores=confidence_scores
         )
         
-        self.items.append(item)
+        with self._lock:
+            self.items.append(item)
         logger.debug(f"Added to review queue: {Path(file_path).name} - {reason}")
     
     def add_from_extraction(self,
@@ -139,7 +213,8 @@ class ReviewQueue:
                           category: str,
                           category_confidence: float,
                           ocr_confidence: float,
-                          raw_text: str):
+                          raw_text: str,
+                          parser=None) -> bool:
         """
         Add item to review if extraction is uncertain.
         
@@ -151,31 +226,19 @@ class ReviewQueue:
             category_confidence: Category confidence score
             ocr_confidence: OCR confidence score
             raw_text: Raw OCR text for snippet
+            parser: Optional parser; when given, high-value transactions are
+                queued too (same checks as should_review with a parser)
+            
+        Returns:
+            True if the item was queued for review (callers can branch on this
+            instead of calling should_review again)
         """
-        if not self.should_review(date, amount, category, category_confidence, ocr_confidence, file_path):
-            return
-        
-        # Generate reason summary
-        reasons = []
-        if not date:
-            reasons.append("missing date")
-        if not amount:
-            reasons.append("missing amount")
-        if category_confidence < self.thresholds['category']:
-            reasons.append("low category confidence")
-        if ocr_confidence < self.thresholds['ocr']:
-            reasons.append("low OCR quality")
-        if category == "Other":
-            reasons.append("unknown category")
-        
-        reason = "; ".join(reasons)
+        needs_review, reason = self.evaluate(date, amount, category, category_confidence, ocr_confidence,
+                                             file_path, raw_text, parser)
+        if not needs_review:
+            return False
         
-        # Create snippet from raw text (first 200 chars), clean for Excel
-        snippet = raw_text.replace('\\n', ' ')[:200]
-        # Remove characters that Excel doesn't like
-        snippet = ''.join(char for char in snippet if ord(char) >= 32 or char in '\\t\\n\\r')
-        if len(raw_text) > 200:
-            snippet += "..."
+        snippet = make_snippet(raw_text)
         
         confidence_scores = {
             'category': category_confidence,
@@ -191,6 +254,7 @@ class ReviewQueue:
             raw_snippet=snippet,
             confidence_scores=confidence_scores
         )
+        return True
     
     def detect_conflicts(self, extractions: List[Dict[str, Any]]) -> List[ReviewItem]:
         """
@@ -270,5 +334,6 @@ class ReviewQueue:
     
     def clear(self):
         """Clear all items from the review queue."""
-        self.items.clear()
+        with self._lock:
+            self.items.clear()
         logger.info("Review queue cleared")
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""Compact record type for exported transactions."""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(slots=True)
+class Transaction:
+    """A clean (not flagged for review) transaction ready for export.
+    
+    Slotted, so each record stores its values without a per-instance dict
+    (about a third of the memory of the equivalent dict). Read access also
+    works mapping-style (``t['date']``, ``t.get('filename')``), so code written
+    for transaction dicts - ExcelExporter included - accepts either.
+    """
+    date: Optional[str]
+    amount: Optional[int]
+    category: str
+    description: Optional[str]
+    vendor: Optional[str] = None
+    filename: str = ""
+    category_confidence: float = 0.0
+    ocr_confidence: float = 0.0
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Field value by name, or `default` for names that are not fields."""
+        return getattr(self, key, default)
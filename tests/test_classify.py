@@ -0,0 +1,116 @@
+"""Tests for the category classifier helpers."""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from rapidfuzz import fuzz
+
+from src.classify import CategoryClassifier, get_classifier
+
+RULES_PATH = Path(__file__).parent.parent / 'rules' / 'categories.yml'
+
+
+class TestGetClassifier:
+    """Test suite for get_classifier."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.rules_path = RULES_PATH
+
+    def test_shared_per_rules_file(self):
+        """Repeated calls with str or Path reuse one classifier."""
+        assert get_classifier(self.rules_path) is get_classifier(str(self.rules_path))
+
+    def test_reloads_after_rules_edit(self, tmp_path):
+        """A changed modification time builds a fresh classifier."""
+        rules_copy = tmp_path / 'categories.yml'
+        shutil.copy(self.rules_path, rules_copy)
+        first = get_classifier(rules_copy)
+
+        stat = rules_copy.stat()
+        os.utime(rules_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert get_classifier(rules_copy) is not first
+
+
+class TestClassifyCache:
+    """Test suite for the per-classifier result cache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.classifier = CategoryClassifier(RULES_PATH)
+        self.text = 'スターバックス コーヒー\n合計 ¥580'
+
+    def test_repeat_call_is_cached(self):
+        """A repeated call returns the first result from the cache."""
+        first = self.classifier.classify(None, "", self.text)
+
+        assert self.classifier.classify(None, "", self.text) == first
+        assert self.classifier._classify_impl.cache_info().hits == 1
+
+    def test_load_rules_clears_cache(self, tmp_path):
+        """Reloading the rules drops results scored against the old ones."""
+        rules_copy = tmp_path / 'categories.yml'
+        shutil.copy(RULES_PATH, rules_copy)
+        classifier = CategoryClassifier(rules_copy)
+        assert classifier.classify(None, "", self.text)[0] != 'Other'
+
+        rules_copy.write_text('Other:\n  any: []\n', encoding='utf-8')
+        classifier.load_rules()
+
+        assert classifier._classify_impl.cache_info().currsize == 0
+
+
+class TestScoreCategories:
+    """Test suite for the flat keyword table scoring."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.classifier = CategoryClassifier(RULES_PATH)
+
+    @staticmethod
+    def reference_score(text, keywords):
+        """The original per-keyword scoring loop, one category at a time."""
+        score = 0.0
+        for keyword in keywords:
+            keyword_lower = keyword.lower()
+            if keyword_lower in text:
+                score += 5.0
+                continue
+            for word in text.split():
+                similarity = fuzz.ratio(keyword_lower, word)
+                if similarity >= 80:
+                    score += similarity / 100.0 * 3.0
+        return score
+
+    def test_matches_per_category_scores(self):
+        """One pass over all categories gives each category's own score."""
+        texts = ['スターバックス コーヒー 合計 ¥580', 'suica チャージ 運賃', 'amazon ノートパソコン', '']
+        for text in texts:
+            expected = {}
+            for category, rules in self.classifier.categories.items():
+                score = self.reference_score(text, rules.get('any', []))
+                if category != 'Other' and score > 0:
+                    expected[category] = score
+
+            assert self.classifier._score_categories(text) == pytest.approx(expected)
+
+    def test_fuzzy_threshold_is_inclusive(self, tmp_path):
+        """A word at exactly 80% similarity still earns fuzzy points."""
+        rules_path = tmp_path / 'categories.yml'
+        rules_path.write_text('Personal Services:\n  any: [salon]\n', encoding='utf-8')
+        classifier = CategoryClassifier(rules_path)
+
+        # 'spaon' vs 'salon' is one substitution: Indel similarity 8/10
+        assert classifier._score_categories('spaon') == pytest.approx({'Personal Services': 2.4})
+        assert classifier._score_categories('spxon') == {}
+
+    def test_suggestions_use_rule_scores(self):
+        """Suggestions are the top rule scores, highest first."""
+        text = 'suica チャージ 運賃 amazon'
+        scores = self.classifier._score_categories(text)
+        suggestions = self.classifier.get_category_suggestions(text, top_n=2)
+
+        assert suggestions == sorted(scores.items(), key=lambda x: x[1], reverse=True)[:2]
@@ -0,0 +1,51 @@
+"""Tests for embedded PDF text extraction."""
+
+from pathlib import Path
+
+import pdfminer.high_level
+
+from src.embedded_text import good_embedded_text, has_embedded_text
+
+
+class TestEmbeddedText:
+    """Test the embedded-text quality check."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.pdf_path = Path('invoice.pdf')
+        self.good_text = '\n'.join([
+            'INVOICE No. 2024-0815',
+            'Billing date: 2024-08-15',
+            'Cloud hosting (August)      12,000 JPY',
+            'Total amount due            13,200 JPY',
+            'Payment method: credit card ending 4242',
+        ])
+
+    def test_good_text_is_returned(self, monkeypatch):
+        """Readable text is returned from the single quality-check pass."""
+        calls = []
+        monkeypatch.setattr(pdfminer.high_level, 'extract_text',
+                            lambda path: calls.append(path) or self.good_text)
+
+        assert good_embedded_text(self.pdf_path) == self.good_text
+        assert calls == ['invoice.pdf']
+
+    def test_bytes_are_used_instead_of_reopening_the_file(self, monkeypatch):
+        """Already-read PDF bytes are handed to pdfminer as a stream."""
+        seen = []
+        monkeypatch.setattr(pdfminer.high_level, 'extract_text',
+                            lambda source: seen.append(source.read()) or self.good_text)
+
+        assert good_embedded_text(self.pdf_path, b'%PDF-1.4 data') == self.good_text
+        assert seen == [b'%PDF-1.4 data']
+
+    def test_short_text_is_rejected(self, monkeypatch):
+        """A sparse text layer falls back to OCR."""
+        monkeypatch.setattr(pdfminer.high_level, 'extract_text', lambda path: 'Scan 001')
+
+        assert good_embedded_text(self.pdf_path) is None
+        assert not has_embedded_text(self.pdf_path)
+
+    def test_unreadable_file_is_rejected(self, tmp_path):
+        """Extraction errors mean no embedded text rather than an exception."""
+        assert good_embedded_text(tmp_path / 'missing.pdf') is None
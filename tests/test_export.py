@@ -0,0 +1,58 @@
+"""Tests for the Excel exporter."""
+
+from openpyxl import load_workbook
+
+from src.export import ExcelExporter
+from src.review import ReviewItem
+from src.transaction import Transaction
+
+
+class TestExportMany:
+    """Test suite for ExcelExporter.export_many."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.january = [{'file_name': 'a.pdf', 'date': '2025-01-10', 'amount': 230,
+                         'category': 'travel', 'description': 'Train'}]
+        self.march = [{'file_name': 'b.pdf', 'date': '2025-03-21', 'amount': 1200,
+                       'category': 'meetings', 'description': 'Coffee'}]
+        self.review = [ReviewItem(file_path='c.pdf', reason='missing date', suggested_amount=500)]
+
+    def test_one_sheet_per_period(self, tmp_path):
+        """Each batch becomes its own sheet in a single saved workbook."""
+        path = tmp_path / 'transactions_2025.xlsx'
+        ExcelExporter(path).export_many({
+            'January 2025': (self.january, []),
+            'March 2025': (self.march, self.review),
+        })
+
+        workbook = load_workbook(path)
+        assert workbook.sheetnames == ['January 2025', 'March 2025']
+        march_values = [cell for row in workbook['March 2025'].iter_rows(values_only=True) for cell in row]
+        assert 'b.pdf' in march_values and 'c.pdf' in march_values
+        assert 'b.pdf' not in [cell for row in workbook['January 2025'].iter_rows(values_only=True) for cell in row]
+
+    def test_single_sheet_export_unchanged(self, tmp_path):
+        """export_transactions still writes the default consolidated sheet."""
+        path = tmp_path / 'transactions.xlsx'
+        ExcelExporter(path).export_transactions(self.january, [], include_summary=True)
+
+        assert load_workbook(path).sheetnames == ['All Transactions']
+
+
+class TestTransactionRecords:
+    """Test suite for exporting Transaction records."""
+
+    def test_same_sheet_as_dicts(self, tmp_path):
+        """Transaction records export exactly like the equivalent dicts."""
+        fields = dict(date='2025-03-21', amount=1200, category='meetings', description='Coffee',
+                      vendor='Starbucks', filename='b.pdf', category_confidence=0.9, ocr_confidence=0.95)
+        sheets = []
+        for transactions in ([fields], [Transaction(**fields)]):
+            path = tmp_path / f'transactions_{len(sheets)}.xlsx'
+            ExcelExporter(path).export_transactions(transactions, [], include_summary=True)
+            sheets.append(list(load_workbook(path).active.iter_rows(values_only=True)))
+
+        assert sheets[0] == sheets[1]
+        assert Transaction(**fields)['filename'] == 'b.pdf'
+        assert Transaction(**fields).get('file_name', '') == ''
@@ -0,0 +1,99 @@
+"""Tests for the OCR JSON readers."""
+
+import json
+
+from src.ocr_json import has_empty_full_text, iter_ocr_pack, load_ocr_json, pack_ocr_dir, read_full_text
+
+
+class TestReadFullText:
+    """Test suite for read_full_text."""
+
+    def _write(self, tmp_path, data, **kwargs):
+        path = tmp_path / "receipt_0123456789abcdef0123456789abcdef.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, **kwargs)
+        return path
+
+    def test_matches_full_load(self, tmp_path):
+        """Partial read returns exactly what a full load would."""
+        data = {
+            'file_path': 'receipt.pdf',
+            'pages': [{'page_number': 1, 'text': '合計\\n¥230 "quoted"'}],
+            'full_text': '合計\n¥230 "quoted" \\ back\\\\slash',
+            'confidence': 0.9,
+        }
+        path = self._write(tmp_path, data, indent=2)
+
+        assert read_full_text(path) == data['full_text']
+        assert read_full_text(path) == load_ocr_json(path)['full_text']
+
+    def test_missing_key_returns_none(self, tmp_path):
+        """Files without full_text signal the caller to fall back."""
+        path = self._write(tmp_path, {'pages': [{'text': 'abc'}]})
+
+        assert read_full_text(path) is None
+
+    def test_non_string_value_returns_none(self, tmp_path):
+        """A null full_text is not treated as text."""
+        path = self._write(tmp_path, {'full_text': None})
+
+        assert read_full_text(path) is None
+
+    def test_empty_file_returns_none(self, tmp_path):
+        """Empty files do not raise."""
+        path = tmp_path / "empty.json"
+        path.write_bytes(b'')
+
+        assert read_full_text(path) is None
+
+
+class TestHasEmptyFullText:
+    """Test suite for has_empty_full_text."""
+
+    def test_detects_empty_and_missing(self):
+        """Empty or missing full_text is skippable in both separator styles."""
+        assert has_empty_full_text(json.dumps({'full_text': ''}, indent=2).encode())
+        assert has_empty_full_text(json.dumps({'full_text': ''}, separators=(',', ':')).encode())
+        assert has_empty_full_text(json.dumps({'pages': []}).encode())
+
+    def test_escaped_key_in_text_is_ignored(self):
+        """A quoted key inside page text does not count as an empty full_text."""
+        data = {'pages': [{'text': '"full_text": ""'}], 'full_text': '合計 ¥230'}
+        raw = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+        assert not has_empty_full_text(raw)
+
+
+class TestOcrPack:
+    """Test suite for pack_ocr_dir and iter_ocr_pack."""
+
+    def test_round_trip_keeps_only_pack_fields(self, tmp_path):
+        """Records come back sorted by name with pages dropped."""
+        ocr_dir = tmp_path / "ocr_json"
+        ocr_dir.mkdir()
+        for name, text in [('b_1.json', '合計\n¥230'), ('a_2.json', '')]:
+            data = {'file_path': name.replace('.json', '.pdf'), 'pages': [{'text': text}],
+                    'full_text': text, 'confidence': 0.9}
+            (ocr_dir / name).write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+        (ocr_dir / 'broken_3.json').write_bytes(b'{')
+        pack_path = tmp_path / "ocr_pack.jsonl"
+
+        assert pack_ocr_dir(ocr_dir, pack_path) == 2
+        records = list(iter_ocr_pack(pack_path))
+
+        assert [record['name'] for record in records] == ['a_2.json', 'b_1.json']
+        assert records[1] == {'name': 'b_1.json', 'file_path': 'b_1.pdf',
+                              'full_text': '合計\n¥230', 'confidence': 0.9}
+
+    def test_selects_the_same_files_as_a_json_glob(self, tmp_path):
+        """Dot-prefixed JSON files are packed, as the directory scan reads them too."""
+        ocr_dir = tmp_path / "ocr_json"
+        ocr_dir.mkdir()
+        for name in ['._a_1.json', 'a_1.json']:
+            (ocr_dir / name).write_text(json.dumps({'full_text': name}), encoding='utf-8')
+        pack_path = tmp_path / "ocr_pack.jsonl"
+
+        pack_ocr_dir(ocr_dir, pack_path)
+
+        assert [record['name'] for record in iter_ocr_pack(pack_path)] == \
+            sorted(path.name for path in ocr_dir.glob('*.json'))
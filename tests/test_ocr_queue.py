@@ -0,0 +1,63 @@
+"""Tests for serializing OCR inference onto one thread."""
+
+import threading
+
+import pytest
+
+pytest.importorskip('yomitoku')
+
+from src.ocr import OCRQueue
+
+
+class StubProcessor:
+    """Stands in for OCRProcessor.run_pages; 'bad' pages fail."""
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+
+    def run_pages(self, images):
+        self.calls.append(list(images))
+        self.threads.add(threading.current_thread().name)
+        if 'bad' in images:
+            raise ValueError('bad page')
+        return [f'result {img}' for img in images]
+
+
+class TestOCRQueue:
+    """Test suite for OCRQueue."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.processor = StubProcessor()
+
+    def test_bad_page_only_fails_its_own_file(self):
+        """A failing page fails its file; other queued files still get results."""
+        with OCRQueue(self.processor) as ocr_queue:
+            good = ocr_queue.submit(['a1', 'a2'])
+            bad = ocr_queue.submit(['bad'])
+            other = ocr_queue.submit(['c1'])
+
+            assert good.result(timeout=5) == ['result a1', 'result a2']
+            with pytest.raises(ValueError, match='bad page'):
+                bad.result(timeout=5)
+            assert other.result(timeout=5) == ['result c1']
+
+    def test_pages_run_one_at_a_time_on_the_queue_thread(self):
+        """Pages are inferred in submission order on the single consumer thread."""
+        with OCRQueue(self.processor) as ocr_queue:
+            first = ocr_queue.submit(['a1', 'a2'])
+            second = ocr_queue.submit(['b1'])
+            first.result(timeout=5)
+            second.result(timeout=5)
+
+        assert self.processor.calls == [['a1'], ['a2'], ['b1']]
+        assert self.processor.threads == {'ocr-queue'}
+
+    def test_submit_after_close_is_rejected(self):
+        """A closed queue refuses new files instead of leaving them unresolved."""
+        ocr_queue = OCRQueue(self.processor)
+        ocr_queue.close()
+
+        with pytest.raises(RuntimeError):
+            ocr_queue.submit(['a1'])
@@ -0,0 +1,94 @@
+"""Tests for the JapaneseReceiptParser helpers."""
+
+import pytest
+
+from src.parse import JapaneseReceiptParser, KeywordMatcher, get_parser, parse_iso_date
+
+
+class TestKeywordMatcher:
+    """Test suite for KeywordMatcher."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.parser = JapaneseReceiptParser()
+
+    def test_search_matches_any_keyword(self):
+        """search() agrees with any(kw in line) for every keyword list."""
+        lines = ['合計', '¥230', 'お預り金額', '非課税計', '(内消費税等(10%)', '', 'TNo. 250321A3801']
+        for line in lines:
+            assert self.parser.avoid_matcher.search(line) == any(kw in line for kw in self.parser.avoid_keywords)
+            assert self.parser.total_matcher.search(line) == any(kw in line for kw in self.parser.total_keywords)
+
+    def test_findall_reports_overlapping_keywords_in_list_order(self):
+        """findall() keeps nested keywords such as 合 inside 合計."""
+        line = '税込合計 ¥1,500'
+        expected = [kw for kw in self.parser.total_keywords if kw in line]
+
+        assert self.parser.total_matcher.findall(line) == expected
+        assert '合' in expected and '合計' in expected and '税込' in expected
+
+    def test_empty_keyword_list(self):
+        """An empty matcher never matches."""
+        matcher = KeywordMatcher([])
+
+        assert not matcher.search('合計')
+        assert matcher.findall('合計') == []
+
+    def test_finditer_hits_every_keyword_line(self):
+        """One sweep over a document finds each line that contains a keyword."""
+        lines = ['おつり', '¥20', 'お預り金額', '¥250', '合計', '¥230', '非課税計']
+        text = '\n'.join(lines)
+        hit_lines = {text.count('\n', 0, m.start()) for m in self.parser.avoid_matcher.finditer(text)}
+
+        assert hit_lines == {i for i, line in enumerate(lines) if self.parser.avoid_matcher.search(line)}
+        assert list(KeywordMatcher([]).finditer(text)) == []
+
+    def test_present_finds_overlapping_keywords(self):
+        """present() equals the set of keywords contained in the text."""
+        matcher = KeywordMatcher(['ikea', 'ikea渋谷', '渋谷', '谷', 'jr'])
+        for text in ['ikea渋谷店', 'jr渋谷駅', 'ikeaikea', 'レシート', '']:
+            assert matcher.present(text) == {kw for kw in matcher.keywords if kw in text}
+        assert KeywordMatcher([]).present('ikea') == set()
+
+    def test_get_parser_is_shared(self):
+        """get_parser() returns one cached instance."""
+        assert get_parser() is get_parser()
+        assert get_parser().parse_amount('合計\n¥230') == 230
+
+
+class TestParseIsoDate:
+    """Test suite for parse_iso_date."""
+
+    def test_splits_parse_date_output(self):
+        """Components match what strptime would give for parse_date output."""
+        date = JapaneseReceiptParser().parse_date('取扱日時:2025年 3月21日 11:27')
+
+        assert parse_iso_date(date) == (2025, 3, 21)
+
+    def test_rejects_other_layouts(self):
+        """Non YYYY-MM-DD strings raise ValueError like strptime does."""
+        for bad in ['2025/03/21', '2025-3-21', '', 'abcd-ef-gh']:
+            with pytest.raises(ValueError):
+                parse_iso_date(bad)
+
+
+class TestParseAll:
+    """Test suite for JapaneseReceiptParser.parse_all."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.parser = JapaneseReceiptParser()
+
+    def test_matches_individual_parsers(self):
+        """parse_all returns exactly what the separate parse_* calls return."""
+        texts = [
+            'セブンイレブン千代田店\n2024年10月30日 14:30\nお茶 ¥150\n合計 ¥390',
+            '株式会社テスト\n令和6年 8月 1日\n領収金額 12,000円',
+            '',
+        ]
+        for text in texts:
+            assert self.parser.parse_all(text) == {
+                'date': self.parser.parse_date(text),
+                'amount': self.parser.parse_amount(text),
+                'vendor': self.parser.parse_vendor(text),
+            }
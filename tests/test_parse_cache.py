@@ -0,0 +1,113 @@
+"""Tests for the persistent parse cache."""
+
+import sqlite3
+
+import pytest
+
+from src import parse_cache
+from src.parse_cache import FIELDS, ParseCache, cache_version, parse_fields
+
+
+class TestParseCache:
+    """Test suite for ParseCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.text = '合計\n¥230'
+        self.fields = {
+            'date': '2025-03-21',
+            'amount': 230,
+            'vendor': '日本郵便株式会社',
+            'description': 'postage',
+            'category': 'communications (phone, internet, postage)',
+            'category_confidence': 0.85,
+        }
+
+    def test_round_trip_after_reopen(self, tmp_path):
+        """Flushed rows survive closing and reopening the database."""
+        db_path = tmp_path / 'parse.cache.sqlite'
+        with ParseCache(db_path) as cache:
+            assert cache.get(self.text) is None
+            cache.put(self.text, self.fields)
+
+        with ParseCache(db_path) as cache:
+            assert cache.get(self.text) == self.fields
+
+    def test_version_change_misses(self, tmp_path):
+        """Rows written under another version are not returned."""
+        db_path = tmp_path / 'parse.cache.sqlite'
+        with ParseCache(db_path, version='1:rules-a') as cache:
+            cache.put(self.text, self.fields)
+
+        with ParseCache(db_path, version='1:rules-b') as cache:
+            assert cache.get(self.text) is None
+
+    def test_pending_rows_written_in_batches(self, tmp_path):
+        """put() flushes once batch_size rows are pending."""
+        cache = ParseCache(tmp_path / 'parse.cache.sqlite', batch_size=2)
+        cache.put('a', {'amount': 1})
+        assert cache._pending
+        cache.put('b', {'amount': 2})
+
+        assert not cache._pending
+        assert cache.get('b')['amount'] == 2
+        assert cache.get('b')['date'] is None
+        cache.close()
+
+    def test_read_only_lookup_does_not_wait_for_writer(self, tmp_path):
+        """A read-only cache answers lookups while another process holds the write lock."""
+        db_path = tmp_path / 'parse cache #1.sqlite'
+        with ParseCache(db_path) as cache:
+            cache.put(self.text, self.fields)
+
+        writer = sqlite3.connect(str(db_path), timeout=0)
+        writer.execute('BEGIN IMMEDIATE')
+        try:
+            with ParseCache(db_path, read_only=True) as cache:
+                assert cache.get(self.text) == self.fields
+                cache.put('a', {'amount': 1})
+                with pytest.raises(sqlite3.OperationalError):
+                    cache.flush()
+                cache._pending.clear()
+        finally:
+            writer.rollback()
+            writer.close()
+
+
+class TestCacheHelpers:
+    """Test suite for cache_version and parse_fields."""
+
+    def test_cache_version_tracks_rules_contents(self, tmp_path):
+        """Editing the rules file changes the cache version."""
+        rules_path = tmp_path / 'categories.yml'
+        rules_path.write_text('travel:\n  keywords: [JR]\n', encoding='utf-8')
+        before = cache_version(rules_path)
+        rules_path.write_text('travel:\n  keywords: [JR, Suica]\n', encoding='utf-8')
+
+        assert cache_version(rules_path) != before
+
+    def test_cache_version_tracks_classifier_version(self, tmp_path, monkeypatch):
+        """Bumping CLASSIFIER_VERSION changes the cache version."""
+        rules_path = tmp_path / 'categories.yml'
+        rules_path.write_text('travel:\n  keywords: [JR]\n', encoding='utf-8')
+        before = cache_version(rules_path)
+        monkeypatch.setattr(parse_cache, 'CLASSIFIER_VERSION', 'bumped')
+
+        assert cache_version(rules_path) != before
+
+    def test_parse_fields_skips_description_without_amount(self):
+        """Descriptions are only generated for receipts with date and amount."""
+
+        class StubParser:
+            def parse_date(self, text): return '2025-03-21'
+            def parse_amount(self, text): return None
+            def parse_vendor(self, text): return 'Vendor'
+            def extract_description_context(self, *args): raise AssertionError('not expected')
+
+        class StubClassifier:
+            def classify(self, vendor, description, text): return 'travel', 0.9
+
+        fields = parse_fields('text', StubParser(), StubClassifier())
+
+        assert tuple(fields) == FIELDS
+        assert fields['description'] is None and fields['category'] == 'travel'
@@ -0,0 +1,85 @@
+"""Tests for the review queue."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from src.parse import JapaneseReceiptParser
+from src.review import ReviewQueue, make_snippet
+
+
+class TestReviewQueue:
+    """Test suite for ReviewQueue."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.queue = ReviewQueue()
+
+    def test_add_from_extraction_reports_queued_item(self):
+        """Uncertain extractions are queued and reported as such."""
+        queued = self.queue.add_from_extraction(
+            file_path='receipt.pdf', date=None, amount=230, category='Other',
+            category_confidence=0.1, ocr_confidence=0.9, raw_text='合計\n¥230'
+        )
+
+        assert queued is True
+        assert len(self.queue.items) == 1
+        assert 'missing date' in self.queue.items[0].reason
+
+    def test_add_from_extraction_matches_should_review(self):
+        """The returned decision agrees with should_review."""
+        args = dict(date='2025-03-21', amount=230, category='travel',
+                    category_confidence=0.9, ocr_confidence=0.9, file_path='receipt.pdf')
+
+        queued = self.queue.add_from_extraction(raw_text='合計\n¥230', **args)
+
+        assert queued is self.queue.should_review(**args) is False
+        assert self.queue.items == []
+
+    def test_evaluate_does_not_queue(self):
+        """evaluate() returns the decision and reason without touching the queue."""
+        needs_review, reason = self.queue.evaluate(
+            date=None, amount=230, category='Other', category_confidence=0.1,
+            ocr_confidence=0.9, file_path='receipt.pdf'
+        )
+
+        assert needs_review is True
+        assert reason == 'missing date; low category confidence; unknown category'
+        assert self.queue.items == []
+
+    def test_add_from_extraction_with_parser_queues_high_value(self):
+        """High-value receipts are queued when a parser is given."""
+        args = dict(file_path='receipt.pdf', date='2025-03-21', amount=120000, category='travel',
+                    category_confidence=0.9, ocr_confidence=0.9, raw_text='合計\n¥120,000')
+
+        assert self.queue.add_from_extraction(**args) is False
+        assert self.queue.add_from_extraction(parser=JapaneseReceiptParser(), **args) is True
+        assert self.queue.items[0].reason == 'high-value transaction'
+
+    def test_add_from_extraction_from_threads(self):
+        """Concurrent callers each get their own decision and no item is lost."""
+        def add(i):
+            return self.queue.add_from_extraction(
+                file_path=f'receipt{i}.pdf', date=None if i % 2 else '2025-03-21', amount=230,
+                category='travel', category_confidence=0.9, ocr_confidence=0.9, raw_text='合計\n¥230'
+            )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            queued = list(executor.map(add, range(200)))
+
+        assert queued == [bool(i % 2) for i in range(200)]
+        assert len(self.queue.items) == 100
+
+
+class TestMakeSnippet:
+    """Test suite for make_snippet."""
+
+    def test_matches_cleaning_the_whole_text(self):
+        """Slicing first gives the same snippet as cleaning the full text."""
+        def full_clean(raw_text):
+            snippet = raw_text.replace('\\n', ' ')[:200]
+            snippet = ''.join(char for char in snippet if ord(char) >= 32 or char in '\\t\\n\\r')
+            return snippet + "..." if len(raw_text) > 200 else snippet
+
+        texts = ['合計\\n¥230', '\\n' * 300, 'a' + '\\n' * 250, 'x' * 399 + '\\n' + 'y' * 50,
+                 '\x00\x07' * 150 + '領収書', '', 'a' * 200]
+        for text in texts:
+            assert make_snippet(text) == full_clean(text)